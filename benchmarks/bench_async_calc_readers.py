@@ -0,0 +1,63 @@
+"""
+Backend calls made by an async reactive.Calc with many concurrent readers.
+
+An async Calc that stands in for a backend query (it sleeps for `--latency-ms`) is read
+at the same time by many tasks, as it would be by the effects of a concurrent flush or
+by several sessions. In each round, the Calc's input changes, the readers start, and
+then (in half of the rounds) the input changes again while the query is in flight.
+Reports the number of queries started and completed per round, and the number of
+readers that got a result computed from an out-of-date input.
+"""
+
+import argparse
+import asyncio
+import time
+
+from shiny import reactive
+
+
+async def main(n_readers: int, rounds: int, latency: float) -> None:
+    x = reactive.Value(0)
+    started = 0
+    completed = 0
+
+    @reactive.Calc
+    async def query() -> int:
+        nonlocal started, completed
+        val = x()
+        started += 1
+        await asyncio.sleep(latency)
+        completed += 1
+        return val
+
+    async def read() -> int:
+        with reactive.isolate():
+            return await query()
+
+    stale = 0
+    start = time.perf_counter()
+    for i in range(rounds):
+        x.set(2 * i)
+        readers = [asyncio.ensure_future(read()) for _ in range(n_readers)]
+        if i % 2 == 1:
+            await asyncio.sleep(latency / 2)
+            x.set(2 * i + 1)
+        results = await asyncio.gather(*readers)
+        with reactive.isolate():
+            stale += sum(1 for r in results if r != x())
+    elapsed = time.perf_counter() - start
+
+    print(f"{n_readers} concurrent readers, {rounds} rounds")
+    print(f"queries started per round      {started / rounds:8.2f}")
+    print(f"queries completed per round    {completed / rounds:8.2f}")
+    print(f"readers given stale results    {stale:8d}")
+    print(f"time per round                 {elapsed / rounds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--readers", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.readers, args.rounds, args.latency_ms / 1000))
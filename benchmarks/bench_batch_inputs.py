@@ -0,0 +1,91 @@
+"""
+Setting 1,000 inputs at once, with and without `reactive.batch()`.
+
+A session receives 1,000 inputs (as in the init message of a large app, or a restored
+bookmark). Several Calcs each depend on every input, and many effects depend on those
+Calcs. The inputs are set through Session._manage_inputs(), which batches
+invalidation, and through a plain loop over Session._manage_input(), which doesn't.
+Time is reported for setting the inputs alone, and including the flush that follows.
+"""
+
+import argparse
+import asyncio
+import functools
+import time
+from typing import Callable, Dict, List
+
+from shiny import App, reactive, ui
+from shiny._connection import MockConnection
+from shiny.session import Session, session_context
+
+
+def setup(n_inputs: int, n_calcs: int, n_effects: int) -> Session:
+    session = App(ui.TagList(), None)._create_session(MockConnection())
+    keys = [f"x{i}" for i in range(n_inputs)]
+
+    with session_context(session):
+        calcs: List[reactive.Calc_[int]] = []
+        for _i in range(n_calcs):
+
+            @reactive.Calc
+            def total() -> int:
+                return sum(session.input[k]() for k in keys)
+
+            calcs.append(total)
+
+        for i in range(n_effects):
+            calc = calcs[i % n_calcs]
+
+            @reactive.Effect
+            def _(calc: reactive.Calc_[int] = calc):
+                calc()
+
+    return session
+
+
+def set_all(session: Session, data: Dict[str, object], batched: bool) -> None:
+    if batched:
+        session._manage_inputs(data)
+    else:
+        for key, val in data.items():
+            session._manage_input(key, val)
+
+
+async def timeit(label: str, fn: Callable[[], None], session: Session) -> None:
+    start = time.perf_counter()
+    fn()
+    set_elapsed = time.perf_counter() - start
+    await session._reactive_domain.flush()
+    total_elapsed = time.perf_counter() - start
+    print(
+        f"{label:<34} set {set_elapsed * 1000:8.2f} ms, "
+        f"set + flush {total_elapsed * 1000:8.2f} ms"
+    )
+
+
+async def main(n_inputs: int, n_calcs: int, n_effects: int, rounds: int) -> None:
+    print(f"{n_inputs} inputs, {n_calcs} calcs, {n_effects} effects")
+    for batched in (False, True):
+        session = setup(n_inputs, n_calcs, n_effects)
+        label = "batched" if batched else "unbatched"
+        init: Dict[str, object] = {f"x{i}": 0 for i in range(n_inputs)}
+        await timeit(
+            f"{label}: init", functools.partial(set_all, session, init, batched), session
+        )
+        for r in range(1, rounds + 1):
+            data: Dict[str, object] = {f"x{i}": r for i in range(n_inputs)}
+            await timeit(
+                f"{label}: update all (round {r})",
+                functools.partial(set_all, session, data, batched),
+                session,
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--inputs", type=int, default=1000)
+    parser.add_argument("--calcs", type=int, default=10)
+    parser.add_argument("--effects", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.inputs, args.calcs, args.effects, args.rounds))
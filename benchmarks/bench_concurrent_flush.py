@@ -0,0 +1,74 @@
+"""
+Sequential vs. concurrent flush latency.
+
+Each output in a session awaits an independent (simulated) I/O call, like a database
+query. Time is simulated with the MockTime helper from the test suite, so the reported
+latencies are exact simulated seconds rather than noisy wall-clock measurements.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from shiny import reactive  # noqa: E402
+from shiny.reactive._core import _reactive_environment  # noqa: E402
+from tests.mocktime import MockTime  # noqa: E402
+
+
+async def flush_latency(
+    n_outputs: int,
+    io_secs: float,
+    concurrent: bool,
+    max_concurrency: Optional[int],
+) -> float:
+    domain = _reactive_environment.app_domain
+    domain.concurrent = concurrent
+    domain.max_concurrency = max_concurrency
+    mock_time = MockTime()
+    effects: List[reactive.Effect_] = []
+
+    with mock_time():
+        for _ in range(n_outputs):
+
+            @reactive.Effect()
+            async def _():
+                await asyncio.sleep(io_secs)
+
+            effects.append(_)
+
+        start = time.monotonic()
+        flushed = asyncio.ensure_future(reactive.flush())
+        while not flushed.done():
+            await mock_time.advance_time(io_secs / 100)
+        await flushed
+        elapsed = time.monotonic() - start
+
+    for effect in effects:
+        effect.destroy()
+    domain.concurrent = False
+    domain.max_concurrency = None
+    return elapsed
+
+
+async def main(n_outputs: int, io_secs: float) -> None:
+    print(f"{n_outputs} outputs, each awaiting {io_secs * 1000:.0f} ms of I/O")
+    for label, concurrent, cap in (
+        ("sequential", False, None),
+        ("concurrent, max 4", True, 4),
+        ("concurrent, unlimited", True, None),
+    ):
+        elapsed = await flush_latency(n_outputs, io_secs, concurrent, cap)
+        print(f"{label:<25} {elapsed * 1000:9.0f} ms (simulated)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--outputs", type=int, default=10)
+    parser.add_argument("--io-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.outputs, args.io_ms / 1000))
@@ -0,0 +1,74 @@
+"""
+Websocket frames and bytes that a session sends per flush.
+
+Runs a session with `--outputs` text outputs that all depend on one input, then has the
+client change that input `--updates` times. Only the first `--changing` outputs' values
+change with the input (as on a periodically refreshed dashboard, where most outputs
+usually stay the same). For each update, reports the number of frames the server sends,
+the total number of bytes, and the frames by message type.
+"""
+
+import argparse
+import asyncio
+import json
+from collections import Counter
+
+from shiny import App, Inputs, Outputs, Session, render, ui
+from shiny._connection import MockConnection
+
+
+async def main(n_outputs: int, n_updates: int, n_changing: int) -> None:
+    def server(input: Inputs, output: Outputs, session: Session):
+        for i in range(n_outputs):
+
+            def make(j: int):
+                @output(id=f"out{j}")
+                @render.text
+                def _():
+                    x = input.x()
+                    return f"{j}: {x if j < n_changing else 0}"
+
+            make(i)
+
+    conn = MockConnection()
+    session = App(ui.TagList(), server)._create_session(conn)
+    run = asyncio.ensure_future(session._run())
+
+    async def settle() -> None:
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+    init = {f".clientdata_output_out{i}_hidden": False for i in range(n_outputs)}
+    conn.cause_receive(json.dumps({"method": "init", "data": {"x": 0, **init}}))
+    await settle()
+
+    frames = 0
+    size = 0
+    kinds: Counter[str] = Counter()
+    for i in range(n_updates):
+        conn.sent.clear()
+        conn.cause_receive(json.dumps({"method": "update", "data": {"x": i + 1}}))
+        await settle()
+        frames += len(conn.sent)
+        size += sum(len(m) for m in conn.sent)
+        for m in conn.sent:
+            kinds["+".join(json.loads(m).keys())] += 1
+
+    conn.cause_disconnect()
+    await run
+
+    print(f"{n_outputs} outputs ({n_changing} changing), {n_updates} flushes")
+    print(f"frames per flush  {frames / n_updates:8.1f}")
+    print(f"bytes per flush   {size / n_updates:8.0f}")
+    for kind, count in kinds.most_common():
+        print(f"  {kind:<24} {count / n_updates:8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--outputs", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--changing", type=int)
+    args = parser.parse_args()
+    n_changing = args.outputs if args.changing is None else args.changing
+    asyncio.run(main(args.outputs, args.updates, n_changing))
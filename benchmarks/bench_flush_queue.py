@@ -0,0 +1,97 @@
+"""
+Micro-benchmarks for the reactive flush queue (PriorityQueueFIFO).
+
+Measures put/get throughput with 100k pending items (as in apps with thousands of
+outputs across many sessions), and the cost of removing or reprioritising pending items
+(as done by Effect_.destroy() and Effect_.set_priority()). The old implementation, which
+wrapped the thread-safe queue.PriorityQueue, is included for comparison.
+"""
+
+import argparse
+import random
+import time
+from queue import PriorityQueue
+from typing import Callable, List, Tuple, Union
+
+from shiny._datastructures import PriorityQueueFIFO
+
+
+class LockingPriorityQueueFIFO:
+    """The previous implementation, based on queue.PriorityQueue."""
+
+    def __init__(self) -> None:
+        self._pq: "PriorityQueue[Tuple[int, int, object]]" = PriorityQueue()
+        self._counter = 0
+
+    def put(self, priority: int, item: object) -> None:
+        self._counter += 1
+        self._pq.put((-priority, self._counter, item))
+
+    def get(self) -> object:
+        return self._pq.get()[2]
+
+    def empty(self) -> bool:
+        return self._pq.empty()
+
+
+class Item:
+    """Stand-in for a reactive Context (hashable by identity, not orderable)."""
+
+    __slots__ = ()
+
+
+AnyQueue = Union[LockingPriorityQueueFIFO, "PriorityQueueFIFO[Item]"]
+
+
+def timeit(label: str, n: int, fn: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms  {n / elapsed:12,.0f} ops/s")
+
+
+def main(n: int) -> None:
+    items = [Item() for _ in range(n)]
+    priorities = [random.randint(-2, 2) for _ in range(n)]
+
+    queues: List[Tuple[str, Callable[[], AnyQueue]]] = [
+        ("queue.PriorityQueue", LockingPriorityQueueFIFO),
+        ("heapq", PriorityQueueFIFO[Item]),
+    ]
+    for name, cls in queues:
+        q = cls()
+
+        def put_all(q: AnyQueue = q) -> None:
+            for p, item in zip(priorities, items):
+                q.put(p, item)
+
+        def get_all(q: AnyQueue = q) -> None:
+            while not q.empty():
+                q.get()
+
+        timeit(f"{name}: put {n:,}", n, put_all)
+        timeit(f"{name}: get {n:,}", n, get_all)
+
+    q2: PriorityQueueFIFO[Item] = PriorityQueueFIFO()
+    for p, item in zip(priorities, items):
+        q2.put(p, item)
+    half = items[: n // 2]
+
+    def reprioritise_half() -> None:
+        for item in half:
+            q2.set_priority(item, 3)
+
+    def remove_half() -> None:
+        for item in half:
+            q2.remove(item)
+
+    timeit(f"heapq: set_priority {len(half):,}", len(half), reprioritise_half)
+    timeit(f"heapq: remove {len(half):,}", len(half), remove_half)
+    print(f"queue depth after removals: {q2.qsize():,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.n)
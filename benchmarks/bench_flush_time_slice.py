@@ -0,0 +1,97 @@
+"""
+HTTP latency while a session runs a long flush, with and without a flush time slice.
+
+Serves a Shiny app with uvicorn, creates a session with many synchronous effects that
+each take a little CPU time, and flushes it while repeatedly requesting a static page
+from the same server. Without a time slice, the flush never yields to the event loop,
+so requests wait until it's done; with `App(flush_time_slice_ms=...)`, they're served
+between effects.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List, Optional
+
+import uvicorn
+
+from shiny import App, reactive, ui
+from shiny._connection import MockConnection
+from shiny.session import session_context
+
+
+def busy(secs: float) -> None:
+    end = time.perf_counter() + secs
+    while time.perf_counter() < end:
+        pass
+
+
+async def http_get(port: int) -> float:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+    await writer.drain()
+    await reader.read()
+    writer.close()
+    return time.perf_counter() - start
+
+
+async def run(
+    n_effects: int, effect_ms: float, time_slice_ms: Optional[float], port: int
+) -> List[float]:
+    app = App(ui.page_fluid("Hello"), None, flush_time_slice_ms=time_slice_ms)
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level="error", lifespan="off")
+    )
+    serving = asyncio.ensure_future(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    session = app._create_session(MockConnection())
+    with session_context(session):
+        for _ in range(n_effects):
+
+            @reactive.Effect
+            def _():
+                busy(effect_ms / 1000)
+
+    async def flush() -> None:
+        async with session._reactive_domain.lock:
+            await session._reactive_domain.flush()
+
+    flushed = asyncio.ensure_future(flush())
+    latencies: List[float] = []
+    while not flushed.done():
+        latencies.append(await http_get(port))
+    await flushed
+
+    server.should_exit = True
+    await serving
+    return latencies
+
+
+async def main(n_effects: int, effect_ms: float, time_slice_ms: float) -> None:
+    print(
+        f"{n_effects} effects of {effect_ms} ms each "
+        f"({n_effects * effect_ms / 1000:.1f} s flush)"
+    )
+    for label, slice_ms in (
+        ("no time slice", None),
+        (f"time slice {time_slice_ms:g} ms", time_slice_ms),
+    ):
+        latencies = await run(n_effects, effect_ms, slice_ms, 8765)
+        print(
+            f"{label:<20} {len(latencies):5d} requests served during flush, "
+            f"median {statistics.median(latencies) * 1000:8.1f} ms, "
+            f"max {max(latencies) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--effects", type=int, default=500)
+    parser.add_argument("--effect-ms", type=float, default=2)
+    parser.add_argument("--time-slice-ms", type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.effects, args.effect_ms, args.time_slice_ms))
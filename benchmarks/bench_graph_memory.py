@@ -0,0 +1,71 @@
+"""
+Memory used per node of a large reactive graph.
+
+Builds a graph of `reactive.Value`s, `reactive.Calc`s that each read a few of them,
+and `reactive.Effect`s that each read a Calc, flushes it (so that every Calc and Effect
+has a live context, registered with its dependencies), and reports the memory
+allocated per node, as measured by tracemalloc. To compare against another version of
+shiny, run this script in a checkout of that version.
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import Any, List
+
+from shiny import reactive
+
+
+async def build(n_nodes: int, fan_in: int) -> List[Any]:
+    # A third of the nodes each of Values, Calcs, and Effects.
+    n = n_nodes // 3
+    values = [reactive.Value(i) for i in range(n)]
+    calcs: List[reactive.Calc_[int]] = []
+    for i in range(n):
+        deps = [values[(i + j) % n] for j in range(fan_in)]
+
+        @reactive.Calc
+        def calc(deps: List[reactive.Value[int]] = deps) -> int:
+            return sum(d() for d in deps)
+
+        calcs.append(calc)
+
+    effects: List[reactive.Effect_] = []
+    for i in range(n):
+
+        @reactive.Effect
+        def effect(calc: reactive.Calc_[int] = calcs[i]) -> None:
+            calc()
+
+        effects.append(effect)
+
+    await reactive.flush()
+    return [values, calcs, effects]
+
+
+async def main(n_nodes: int, fan_in: int) -> None:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    graph = await build(n_nodes, fan_in)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    n = sum(len(nodes) for nodes in graph)
+    print(f"{n} nodes (Values, Calcs, Effects), each Calc reading {fan_in} Values")
+    print(f"total allocated     {used / 2**20:9.1f} MiB")
+    print(f"bytes per node      {used / n:9.0f}")
+    print(f"build + flush time  {elapsed:9.1f} s (with tracemalloc)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--fan-in", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.nodes, args.fan_in))
@@ -0,0 +1,87 @@
+"""
+Websocket bytes sent for image outputs, as data URIs and as URLs.
+
+Runs a session with `--outputs` `render.image` outputs, each showing one of two `--kb`
+kB images depending on an input, then has the client flip that input `--updates` times.
+Reports the bytes sent over the websocket per flush and the time to encode and send
+them:
+
+- with data URIs (the default), where each flush carries every image, base64 encoded;
+- with `App(image_urls=True)`, where each flush carries only URLs, and the browser
+  fetches the images (as binary, and only those it hasn't already cached) over HTTP.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from shiny import App, Inputs, Outputs, Session, render, ui
+from shiny._connection import MockConnection
+from shiny.types import ImgData
+
+
+async def run(dir: str, n_outputs: int, n_updates: int, image_urls: bool) -> None:
+    def server(input: Inputs, output: Outputs, session: Session):
+        for i in range(n_outputs):
+
+            def make(j: int):
+                @output(id=f"img{j}")
+                @render.image
+                def _() -> ImgData:
+                    return {"src": os.path.join(dir, f"{j}_{input.x() % 2}.png")}
+
+            make(i)
+
+    conn = MockConnection()
+    session = App(ui.TagList(), server, image_urls=image_urls)._create_session(conn)
+    task = asyncio.ensure_future(session._run())
+
+    async def settle() -> None:
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+    init = {f".clientdata_output_img{i}_hidden": False for i in range(n_outputs)}
+    conn.cause_receive(json.dumps({"method": "init", "data": {"x": 0, **init}}))
+    await settle()
+
+    size = 0
+    start = time.perf_counter()
+    for i in range(n_updates):
+        conn.sent.clear()
+        conn.cause_receive(json.dumps({"method": "update", "data": {"x": i + 1}}))
+        await settle()
+        size += sum(len(m) for m in conn.sent)
+    elapsed = time.perf_counter() - start
+
+    conn.cause_disconnect()
+    await task
+
+    label = "urls" if image_urls else "data URIs"
+    print(
+        f"{label:<10} {size / n_updates / 1000:9.1f} kB per flush"
+        f"  {elapsed / n_updates * 1000:7.2f} ms per flush"
+    )
+
+
+def main(n_outputs: int, n_updates: int, kb: int) -> None:
+    with tempfile.TemporaryDirectory() as dir:
+        for i in range(n_outputs):
+            for j in range(2):
+                with open(os.path.join(dir, f"{i}_{j}.png"), "wb") as f:
+                    f.write(b"\x89PNG\r\n\x1a\n" + os.urandom(kb * 1000))
+
+        print(f"{n_outputs} images of {kb} kB, {n_updates} flushes")
+        for image_urls in [False, True]:
+            asyncio.run(run(dir, n_outputs, n_updates, image_urls))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--outputs", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--kb", type=int, default=200)
+    args = parser.parse_args()
+    main(args.outputs, args.updates, args.kb)
@@ -0,0 +1,91 @@
+"""
+Invalidation propagation through a deep chain and a wide fan-out of Calcs.
+
+In the chain, each Calc reads the one before it, and the first reads a Value; in the
+fan-out, every Calc reads the same Value. Each Calc is read by nothing but the next one
+(or, at the end of the chain / for each fanned-out Calc, an Effect), and they have all
+been calculated, so setting the Value has to invalidate every one of them. The time
+reported is for setting the Value, i.e. for propagating the invalidation.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from shiny import reactive
+
+
+async def chain(depth: int) -> float:
+    x = reactive.Value(0)
+
+    @reactive.Calc
+    def first() -> int:
+        return x() + 1
+
+    calcs: List[reactive.Calc_[int]] = [first]
+    for _ in range(depth - 1):
+
+        @reactive.Calc
+        def calc(prev: reactive.Calc_[int] = calcs[-1]) -> int:
+            return prev() + 1
+
+        calcs.append(calc)
+
+    # Calculate from the start of the chain, so that reading each Calc doesn't recurse
+    with reactive.isolate():
+        for calc in calcs:
+            calc()
+
+    @reactive.Effect
+    def effect():
+        calcs[-1]()
+
+    await reactive.flush()
+    start = time.perf_counter()
+    x.set(1)
+    elapsed = time.perf_counter() - start
+    effect.destroy()
+    return elapsed
+
+
+async def fan_out(width: int) -> float:
+    x = reactive.Value(0)
+    effects: List[reactive.Effect_] = []
+    for _ in range(width):
+
+        @reactive.Calc
+        def calc() -> int:
+            return x() + 1
+
+        @reactive.Effect
+        def effect(calc: reactive.Calc_[int] = calc) -> None:
+            calc()
+
+        effects.append(effect)
+
+    await reactive.flush()
+    start = time.perf_counter()
+    x.set(1)
+    elapsed = time.perf_counter() - start
+    for effect in effects:
+        effect.destroy()
+    return elapsed
+
+
+async def main(depth: int, width: int) -> None:
+    try:
+        elapsed = await chain(depth)
+        print(f"chain, {depth} deep       {elapsed * 1000:9.2f} ms")
+    except RecursionError:
+        print(f"chain, {depth} deep       RecursionError")
+    elapsed = await fan_out(width)
+    print(f"fan-out, {width} wide     {elapsed * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=10_000)
+    parser.add_argument("--width", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.depth, args.width))
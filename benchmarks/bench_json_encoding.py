@@ -0,0 +1,94 @@
+"""
+Encoding of flush messages with large output values.
+
+Builds the message that a session sends when it flushes several outputs, each with a
+10k-element payload (as a render function for a custom output or a widget might
+produce), and reports the time to encode it:
+
+- as Session._send_message() used to: `json.dumps()` twice (once for the debug string
+  and once for the websocket), after converting numpy arrays to lists in Python;
+- with shiny._json, once, with each available backend, passing numpy arrays as is.
+"""
+
+import argparse
+import importlib.util
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from shiny import _json
+
+
+def timeit(fn: Callable[[], object], reps: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(reps):
+        fn()
+    return (time.perf_counter() - start) / reps
+
+
+def message(values: Dict[str, Any]) -> Dict[str, object]:
+    return {"errors": {}, "values": values, "inputMessages": []}
+
+
+def main(n_outputs: int, n_elements: int, reps: int) -> None:
+    values: Dict[str, Any] = {
+        f"out{i}": {
+            "x": [random.random() for _ in range(n_elements)],
+            "label": [f"item {j}" for j in range(n_elements // 10)],
+        }
+        for i in range(n_outputs)
+    }
+    np: Any
+    try:
+        import numpy  # pyright: ignore[reportMissingImports]
+
+        np = numpy
+    except ImportError:
+        np = None
+
+    payloads: List[Tuple[str, Dict[str, Any]]] = [("lists", values)]
+    if np is not None:
+        arrays: Dict[str, Any] = {
+            k: {**v, "x": np.array(v["x"])} for k, v in values.items()
+        }
+        payloads.append(("numpy", arrays))
+
+    backends = ["json"]
+    if importlib.util.find_spec("orjson") is not None:
+        backends.append("orjson")
+
+    print(f"{n_outputs} outputs, each with {n_elements} floats")
+    for kind, payload in payloads:
+
+        def before(kind: str = kind, payload: Dict[str, Any] = payload) -> None:
+            if kind == "numpy":
+                converted = {k: {**v, "x": v["x"].tolist()} for k, v in payload.items()}
+            else:
+                converted = payload
+            msg = message(converted)
+            _ = json.dumps(msg) + "\n"
+            json.dumps(msg)
+
+        def after(payload: Dict[str, Any] = payload) -> None:
+            _json.dumps(message(payload))
+
+        elapsed = timeit(before, reps)
+        print(f"{kind:<6} before (json.dumps twice)  {elapsed * 1000:8.2f} ms")
+
+        old_backend = _json.get_backend()
+        for backend in backends:
+            _json.set_backend(backend)
+            elapsed = timeit(after, reps)
+            print(f"{kind:<6} _json.dumps ({backend:<6})      {elapsed * 1000:8.2f} ms")
+        _json.set_backend(old_backend)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--outputs", type=int, default=10)
+    parser.add_argument("--elements", type=int, default=10_000)
+    parser.add_argument("--reps", type=int, default=20)
+    args = parser.parse_args()
+    main(args.outputs, args.elements, args.reps)
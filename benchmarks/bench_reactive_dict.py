@@ -0,0 +1,81 @@
+"""
+Updating one entry of a large keyed state: a reactive.Value holding a dict, versus a
+reactive.Dict.
+
+Creates a state with many keys and an Effect per key that reads just that key (as an
+output per entity would), then repeatedly updates a single key and flushes. With a
+Value, the dict has to be copied for each update, and every Effect re-runs; with a
+reactive.Dict, only the Effect that reads the updated key does.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from shiny import reactive
+
+
+async def run(
+    n_keys: int, updates: int, make_state: Callable[[Dict[int, int]], Any]
+) -> Tuple[float, int]:
+    initial = {i: 0 for i in range(n_keys)}
+    state: Union[reactive.Value[Dict[int, int]], reactive.Dict[int, int]]
+    state = make_state(initial)
+    effects: List[reactive.Effect_] = []
+    for i in range(n_keys):
+        if isinstance(state, reactive.Value):
+
+            @reactive.Effect
+            def effect(i: int = i, state: reactive.Value[Dict[int, int]] = state):
+                state()[i]
+
+        else:
+
+            @reactive.Effect
+            def effect(i: int = i, state: reactive.Dict[int, int] = state):
+                state[i]
+
+        effects.append(effect)
+    await reactive.flush()
+    runs_before = sum(e._exec_count for e in effects)
+
+    start = time.perf_counter()
+    for n in range(updates):
+        key = n % n_keys
+        if isinstance(state, reactive.Value):
+            with reactive.isolate():
+                new = dict(state())
+            new[key] += 1
+            state.set(new)
+        else:
+            with reactive.isolate():
+                state[key] += 1
+        await reactive.flush()
+    elapsed = time.perf_counter() - start
+
+    runs = sum(e._exec_count for e in effects) - runs_before
+    for e in effects:
+        e.destroy()
+    return elapsed / updates, runs // updates
+
+
+async def main(n_keys: int, updates: int) -> None:
+    print(f"{n_keys} keys, an Effect per key, {updates} single-key updates")
+    for label, make_state in (
+        ("reactive.Value(dict)", reactive.Value),
+        ("reactive.Dict", reactive.Dict),
+    ):
+        per_update, runs = await run(n_keys, updates, make_state)
+        print(
+            f"{label:<22} {per_update * 1000:8.2f} ms per update + flush, "
+            f"{runs:5d} Effects re-run per update"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument("--updates", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.keys, args.updates))
@@ -0,0 +1,92 @@
+"""
+Input-to-output latency under N concurrent sessions.
+
+Every session has a text output that depends on `input.x`. A fraction of the sessions
+also have an async effect that awaits slow I/O whenever `input.x` changes. Each client
+sends a stream of updates, and the time from each update until the session sends its
+flush message is recorded. Before reactive domains, one session's slow effect held the
+global reactive lock and delayed every other session; now only the slow sessions
+themselves are delayed.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import List
+
+from shiny import App, Inputs, Outputs, Session, reactive, render, ui
+from shiny._connection import MockConnection
+
+
+class TimingConnection(MockConnection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.flushed = asyncio.Event()
+
+    async def send(self, message: str) -> None:
+        if '"values"' in message:
+            self.flushed.set()
+
+
+def make_app(slow_secs: float) -> App:
+    def server(input: Inputs, output: Outputs, session: Session):
+        @output
+        @render.text
+        def txt():
+            return str(input.x())
+
+        @reactive.Effect
+        async def _():
+            x = input.x()
+            if input.slow() and x > 0:
+                await asyncio.sleep(slow_secs)
+
+    return App(ui.TagList(), server)
+
+
+async def run_client(
+    conn: TimingConnection, slow: bool, n_updates: int, latencies: List[float]
+) -> None:
+    conn.cause_receive(json.dumps({"method": "init", "data": {"x": 0, "slow": slow}}))
+    await conn.flushed.wait()
+    for i in range(1, n_updates + 1):
+        conn.flushed.clear()
+        start = time.perf_counter()
+        conn.cause_receive(json.dumps({"method": "update", "data": {"x": i}}))
+        await conn.flushed.wait()
+        if not slow:
+            latencies.append(time.perf_counter() - start)
+    conn.cause_disconnect()
+
+
+async def main(n_sessions: int, slow_fraction: float, slow_secs: float, n_updates: int):
+    app = make_app(slow_secs)
+    latencies: List[float] = []
+    tasks = []
+    n_slow = int(n_sessions * slow_fraction)
+    for i in range(n_sessions):
+        conn = TimingConnection()
+        session = app._create_session(conn)
+        tasks.append(session._run())
+        tasks.append(run_client(conn, i < n_slow, n_updates, latencies))
+    await asyncio.gather(*tasks)
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"sessions={n_sessions} slow={n_slow} ({slow_secs * 1000:.0f} ms each)")
+    print(f"fast-session latency: p50={p50 * 1000:.2f} ms  p99={p99 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--slow-fraction", type=float, default=0.1)
+    parser.add_argument("--slow-ms", type=float, default=50)
+    parser.add_argument("--updates", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.sessions, args.slow_fraction, args.slow_ms / 1000, args.updates)
+    )
@@ -0,0 +1,91 @@
+"""
+Feeding a fast message stream into an app: a Value set per message, versus
+reactive.stream().
+
+A producer yields messages as fast as it can (pausing briefly every `--burst`
+messages, as a network consumer would). In the hand-rolled version, a task sets a
+reactive.Value and flushes for every message; with reactive.stream(), messages are
+published in windows. In both cases an Effect that does a little work per run reads
+the latest data. Reports the number of Effect runs (i.e., flushes) and the time to get
+through all of the messages.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator, Tuple
+
+from shiny import reactive
+
+
+def busy(secs: float) -> None:
+    end = time.perf_counter() + secs
+    while time.perf_counter() < end:
+        pass
+
+
+async def messages(n: int, burst: int) -> AsyncIterator[int]:
+    for i in range(n):
+        if i % burst == 0:
+            await asyncio.sleep(0.001)
+        yield i
+
+
+async def value_per_message(
+    n: int, burst: int, effect_ms: float
+) -> Tuple[int, float]:
+    latest: reactive.Value[int] = reactive.Value()
+
+    @reactive.Effect
+    def effect():
+        latest()
+        busy(effect_ms / 1000)
+
+    await reactive.flush()
+    start = time.perf_counter()
+    async for msg in messages(n, burst):
+        latest.set(msg)
+        await reactive.flush()
+    elapsed = time.perf_counter() - start
+    runs = effect._exec_count
+    effect.destroy()
+    return runs, elapsed
+
+
+async def stream(
+    n: int, burst: int, effect_ms: float, window: float
+) -> Tuple[int, float]:
+    s = reactive.stream(messages(n, burst), window_secs=window, session=None)
+    done = asyncio.Event()
+
+    @reactive.Effect
+    def effect():
+        if s()[-1] == n - 1:
+            done.set()
+        busy(effect_ms / 1000)
+
+    start = time.perf_counter()
+    await reactive.flush()
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    runs = effect._exec_count
+    effect.destroy()
+    return runs, elapsed
+
+
+async def main(n: int, burst: int, effect_ms: float, window_ms: float) -> None:
+    print(f"{n} messages, an Effect that takes {effect_ms:g} ms")
+    runs, elapsed = await value_per_message(n, burst, effect_ms)
+    print(f"Value.set() per message   {runs:7d} Effect runs  {elapsed:7.2f} s")
+    runs, elapsed = await stream(n, burst, effect_ms, window_ms / 1000)
+    print(f"reactive.stream()         {runs:7d} Effect runs  {elapsed:7.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--burst", type=int, default=100)
+    parser.add_argument("--effect-ms", type=float, default=0.2)
+    parser.add_argument("--window-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.burst, args.effect_ms, args.window_ms))
@@ -0,0 +1,54 @@
+"""
+Cost of many periodic invalidate_later() timers.
+
+Creates many effects that each call `reactive.invalidate_later()` on every run (as
+`reactive.poll()` does), lets them tick a few times, and reports the number of asyncio
+tasks alive while they're waiting, and the CPU time used per tick.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from shiny import reactive
+
+
+async def main(n_timers: int, interval: float, ticks: int) -> None:
+    effects: List[reactive.Effect_] = []
+    for _ in range(n_timers):
+
+        @reactive.Effect
+        def _():
+            reactive.invalidate_later(interval)
+
+        effects.append(_)
+
+    await reactive.flush()
+    await asyncio.sleep(interval / 2)
+    n_tasks = len(asyncio.all_tasks())
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    await asyncio.sleep(interval * ticks)
+    cpu = time.process_time() - start_cpu
+    wall = time.perf_counter() - start_wall
+    runs = sum(e._exec_count for e in effects) - n_timers
+
+    for e in effects:
+        e.destroy()
+
+    print(f"{n_timers} timers, every {interval * 1000:g} ms, for {ticks} ticks")
+    print(f"asyncio tasks while waiting  {n_tasks:9d}")
+    print(f"effect re-runs               {runs:9d}")
+    print(f"CPU time per tick            {cpu / ticks * 1000:9.1f} ms")
+    print(f"wall time                    {wall * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--timers", type=int, default=10_000)
+    parser.add_argument("--interval-ms", type=float, default=500)
+    parser.add_argument("--ticks", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.timers, args.interval_ms / 1000, args.ticks))
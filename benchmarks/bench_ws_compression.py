@@ -0,0 +1,124 @@
+"""
+Websocket compression of typical output messages.
+
+Encodes a mix of messages (a `render.table` of `--rows` rows, a `render.ui` card list,
+a base64 PNG plot, and small status messages) with the permessage-deflate extension:
+
+- not at all (as with `shiny run --no-ws-compression`);
+- compressing every message, as uvicorn's own extension does;
+- with shiny's extension, which skips small messages, at a few compression levels, with
+  and without skipping already-compressed messages.
+
+Reports the bytes sent, the compression ratio, the time spent compressing, and the time
+it would take to send the messages over a `--mbps` link.
+"""
+
+import argparse
+import base64
+import json
+import os
+import random
+import time
+from typing import Callable, Dict, List, Tuple
+
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+from websockets.frames import Frame, Opcode
+
+from shiny import _compression, _ws_compression
+
+
+def messages(rows: int) -> List[str]:
+    random.seed(1)
+    table = "".join(
+        f"<tr><td>{i}</td><td>{random.choice(['setosa', 'versicolor'])}</td>"
+        f"<td>{random.random():.4f}</td><td>{random.random() * 100:.2f}</td></tr>"
+        for i in range(rows)
+    )
+    cards = "".join(
+        f'<div class="card"><div class="card-header">Item {i}</div>'
+        f'<div class="card-body"><p>Value: {random.randint(0, 1000)}</p></div></div>'
+        for i in range(200)
+    )
+    png = base64.b64encode(os.urandom(60_000)).decode()
+    status = [
+        {"busy": "busy"},
+        {"progress": {"type": "binding", "message": {"id": "table"}}},
+        {"recalculating": {"name": "table", "status": "recalculating"}},
+        {"recalculating": {"name": "table", "status": "recalculated"}},
+        {"busy": "idle"},
+    ]
+    values: Dict[str, object] = {
+        "table": {"html": f"<table>{table}</table>", "deps": []},
+        "cards": {"html": cards, "deps": []},
+    }
+    plot = {"plot": {"src": f"data:image/png;base64,{png}", "width": 600}}
+    return [json.dumps(m) for m in status] + [
+        json.dumps({"values": values, "errors": {}, "inputMessages": []}),
+        json.dumps({"values": plot, "errors": {}, "inputMessages": []}),
+    ]
+
+
+def run(
+    msgs: List[str], encode: Callable[[Frame, str], Frame], reps: int
+) -> Tuple[int, float]:
+    size = 0
+    start = time.perf_counter()
+    for _ in range(reps):
+        size = 0
+        for m in msgs:
+            size += len(encode(Frame(Opcode.TEXT, m.encode()), m).data)
+    return size, (time.perf_counter() - start) / reps
+
+
+def deflate(level: int) -> PerMessageDeflate:
+    return PerMessageDeflate(False, False, 12, 12, {"level": level, "memLevel": 5})
+
+
+def main(rows: int, mbps: float, reps: int) -> None:
+    msgs = messages(rows)
+    raw = sum(len(m.encode()) for m in msgs)
+    print(f"{len(msgs)} messages, {raw / 1000:.0f} kB; {mbps:g} Mbit/s link")
+
+    def report(label: str, size: int, secs: float) -> None:
+        transfer = size * 8 / (mbps * 1e6)
+        print(
+            f"{label:<28} {size / 1000:7.1f} kB  {raw / size:5.1f}x"
+            f"  {secs * 1000:6.2f} ms compressing  {transfer * 1000:7.0f} ms to send"
+        )
+
+    report("uncompressed", *run(msgs, lambda f, m: f, reps))
+
+    ext = deflate(6)
+    report("every message (level 6)", *run(msgs, lambda f, m: ext.encode(f), reps))
+
+    for level, skip in [(1, True), (6, True), (9, True), (6, False)]:
+        shiny_ext = _ws_compression._PerMessageDeflate(
+            deflate(level), _compression.DEFAULT_THRESHOLD, skip
+        )
+
+        def encode(
+            f: Frame, m: str, shiny_ext: PerMessageDeflate = shiny_ext
+        ) -> Frame:
+            if _compression.is_precompressed(m):
+                with _compression.precompressed():
+                    return shiny_ext.encode(f)
+            return shiny_ext.encode(f)
+
+        label = f"shiny (level {level}{'' if skip else ', PNG too'})"
+        report(label, *run(msgs, encode, reps))
+
+    stats = _compression.compression_stats()
+    print(
+        f"shiny: {stats.compressed} compressed, {stats.skipped_small} small, "
+        f"{stats.skipped_precompressed} already compressed; {stats.ratio:.1f}x, "
+        f"{stats.us_per_kb:.1f} us/kB"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--mbps", type=float, default=2)
+    parser.add_argument("--reps", type=int, default=20)
+    args = parser.parse_args()
+    main(args.rows, args.mbps, args.reps)
@@ -1,6 +1,8 @@
+import asyncio
 import copy
 import os
 import secrets
+import traceback
 from typing import Any, Callable, Dict, List, Optional, Union, cast
 
 import starlette.applications
@@ -10,12 +12,13 @@ import starlette.routing
 import starlette.websockets
 from htmltools import HTMLDependency, HTMLDocument, RenderedHTML, Tag, TagList
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.responses import HTMLResponse, Response
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ._autoreload import InjectAutoreloadMiddleware, autoreload_url
 from ._connection import Connection, StarletteConnection
 from ._error import ErrorMiddleware
+from ._json import JSONResponse
 from ._shinyenv import is_pyodide
 from ._utils import is_async_callable
 from .html_dependencies import jquery_deps, require_deps, shiny_deps
@@ -47,6 +50,28 @@ class App:
         An absolute directory containing static files to be served by the app.
     debug
         Whether to enable debug mode.
+    concurrent_flush
+        If ``True``, when a session's reactive graph is flushed, effects and outputs
+        with the same priority are run concurrently (so, for example, several outputs
+        that each await an independent database query don't wait for one another).
+        Effects with a higher priority still finish before those with a lower priority
+        start, and effects with the same priority are started in the order they were
+        invalidated. By default, effects are run one at a time.
+    max_flush_concurrency
+        When ``concurrent_flush`` is ``True``, the maximum number of effects to run at
+        the same time in each session. ``None`` means no limit.
+    flush_time_slice_ms
+        If provided, a flush of a session's reactive graph yields to the event loop
+        whenever it has been running effects for this many milliseconds without doing
+        so, so that a long flush (e.g., hundreds of synchronous effects) doesn't keep
+        the server from handling websocket messages and HTTP requests for other
+        sessions. By default, a flush only yields when an effect awaits something.
+    image_urls
+        If ``True``, the images of :func:`~shiny.render.plot` and
+        :func:`~shiny.render.image` outputs are served from session-specific URLs,
+        which the browser fetches separately, instead of being embedded in the messages
+        sent over the websocket as base64 data URIs. This keeps large plots from
+        bloating those messages and holding up other outputs.
 
     Example
     -------
@@ -91,6 +116,10 @@ class App:
         *,
         static_assets: Optional[Union[str, "os.PathLike[str]"]] = None,
         debug: bool = False,
+        concurrent_flush: bool = False,
+        max_flush_concurrency: Optional[int] = None,
+        flush_time_slice_ms: Optional[float] = None,
+        image_urls: bool = False,
     ) -> None:
         if server is None:
 
@@ -102,6 +131,16 @@ class App:
         self.server = server
 
         self._debug: bool = debug
+        self._concurrent_flush: bool = concurrent_flush
+        if max_flush_concurrency is not None and max_flush_concurrency < 1:
+            raise ValueError("max_flush_concurrency must be at least 1")
+        self._max_flush_concurrency: Optional[int] = max_flush_concurrency
+        if flush_time_slice_ms is not None and flush_time_slice_ms <= 0:
+            raise ValueError("flush_time_slice_ms must be positive")
+        self._flush_time_slice: Optional[float] = (
+            flush_time_slice_ms / 1000 if flush_time_slice_ms is not None else None
+        )
+        self._image_urls: bool = image_urls
 
         # Settings that the user can change after creating the App object.
         self.lib_prefix: str = LIB_PREFIX
@@ -120,7 +159,7 @@ class App:
 
         self._sessions: Dict[str, Session] = {}
 
-        self._sessions_needing_flush: Dict[int, Session] = {}
+        self._sessions_needing_flush: Dict[str, Session] = {}
 
         self._registered_dependencies: Dict[str, HTMLDependency] = {}
         self._dependency_handler = starlette.routing.Router()
@@ -313,10 +352,23 @@ class App:
     # Flush
     # ==========================================================================
     def _request_flush(self, session: Session) -> None:
-        # TODO: Until we have reactive domains, because we can't yet keep track
-        # of which sessions need a flush.
-        pass
-        # self._sessions_needing_flush[session.id] = session
+        # Each session's reactive domain is flushed in its own task, so a session that
+        # is busy (e.g. awaiting inside an effect) doesn't hold up the others.
+        if session.id in self._sessions_needing_flush:
+            return
+        self._sessions_needing_flush[session.id] = session
+        asyncio.get_running_loop().create_task(self._flush_session(session))
+
+    async def _flush_session(self, session: Session) -> None:
+        try:
+            # Clear the flag before waiting on the lock, so that work added while we
+            # wait (but after the flush starts) requests another flush.
+            self._sessions_needing_flush.pop(session.id, None)
+            if session.id not in self._sessions:
+                return
+            await session._flush_deferred()
+        except Exception:
+            traceback.print_exc()
 
     # ==========================================================================
     # HTML Dependency stuff
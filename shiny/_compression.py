@@ -0,0 +1,132 @@
+"""
+Compression of the messages sent to the browser over the websocket.
+
+Messages are compressed with the permessage-deflate websocket extension, which the
+browser negotiates and decodes on its own. Compared to the extension as uvicorn sets it
+up, messages smaller than a threshold are sent uncompressed (compressing them costs more
+than it saves), the compression level can be set, and messages that consist mostly of
+data that's already compressed (like a PNG plot) can be sent uncompressed. (Deflate
+still shrinks those by about a quarter, by undoing the base64 encoding, so on a slow
+link it can be worth compressing them anyway.)
+
+The settings are passed from `run_app()` to the server (which, with `--reload`, runs in
+another process) through environment variables. The extension itself is in
+`_ws_compression`, which is only imported by the server (this module doesn't depend on
+websockets, so that sessions can use it under pyodide, too).
+"""
+
+from __future__ import annotations
+
+__all__ = (
+    "CompressionStats",
+    "compression_stats",
+    "precompressed",
+    "is_precompressed",
+    "set_options",
+)
+
+import contextlib
+import contextvars
+import dataclasses
+import os
+import re
+from typing import Generator
+
+_ENV_ENABLED = "SHINY_WS_COMPRESSION"
+_ENV_LEVEL = "SHINY_WS_COMPRESSION_LEVEL"
+_ENV_THRESHOLD = "SHINY_WS_COMPRESSION_THRESHOLD"
+_ENV_SKIP_PRECOMPRESSED = "SHINY_WS_COMPRESSION_SKIP_PRECOMPRESSED"
+
+DEFAULT_LEVEL = 6
+DEFAULT_THRESHOLD = 1024
+
+
+@dataclasses.dataclass
+class CompressionStats:
+    """
+    Counts of the messages sent over websockets with compression enabled, in this
+    process.
+    """
+
+    messages: int = 0
+    """Messages sent."""
+    compressed: int = 0
+    """Messages that were compressed."""
+    skipped_small: int = 0
+    """Messages sent uncompressed because they were smaller than the threshold."""
+    skipped_precompressed: int = 0
+    """Messages sent uncompressed because they were mostly compressed data."""
+    bytes_in: int = 0
+    """Size of the compressed messages, before compression."""
+    bytes_out: int = 0
+    """Size of the compressed messages, after compression."""
+    secs: float = 0
+    """Time spent compressing."""
+
+    @property
+    def ratio(self) -> float:
+        """How many times smaller the compressed messages are."""
+        return self.bytes_in / self.bytes_out if self.bytes_out else 1
+
+    @property
+    def us_per_kb(self) -> float:
+        """Time spent compressing, in microseconds per kB of input."""
+        return self.secs * 1e6 / (self.bytes_in / 1000) if self.bytes_in else 0
+
+
+_stats = CompressionStats()
+
+
+def compression_stats() -> CompressionStats:
+    """Return a copy of the compression counters for this process."""
+    return dataclasses.replace(_stats)
+
+
+_precompressed: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "shiny_ws_precompressed", default=False
+)
+
+
+@contextlib.contextmanager
+def precompressed() -> Generator[None, None, None]:
+    """
+    Mark the messages sent in this block as consisting mostly of data that's already
+    compressed, so that they're sent uncompressed (unless that's been turned off).
+    """
+    token = _precompressed.set(True)
+    try:
+        yield
+    finally:
+        _precompressed.reset(token)
+
+
+_precompressed_data = re.compile(
+    r"data:(?:image/(?:png|jpeg|gif|webp)|application/(?:zip|gzip|pdf));base64,"
+    r"([A-Za-z0-9+/=]+)"
+)
+
+
+def is_precompressed(message: str) -> bool:
+    """
+    Whether most of a message is data URIs of formats that are already compressed
+    (which deflate would only shrink by about the base64 overhead, at a high cost).
+    """
+    if ";base64," not in message:
+        return False
+    size = sum(len(m.group(1)) for m in _precompressed_data.finditer(message))
+    return size > len(message) // 2
+
+
+def set_options(
+    enabled: bool, level: int, threshold: int, skip_precompressed: bool
+) -> None:
+    """Set the compression options for servers started in this process and its
+    children."""
+    if not 0 <= level <= 9:
+        raise ValueError("The compression level must be between 0 and 9.")
+    if threshold < 0:
+        raise ValueError("The compression threshold must not be negative.")
+    os.environ[_ENV_ENABLED] = "1" if enabled else "0"
+    os.environ[_ENV_LEVEL] = str(level)
+    os.environ[_ENV_THRESHOLD] = str(threshold)
+    os.environ[_ENV_SKIP_PRECOMPRESSED] = "1" if skip_precompressed else "0"
@@ -1,6 +1,6 @@
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 
 import starlette.websockets
 from starlette.requests import HTTPConnection
@@ -35,9 +35,11 @@ class MockConnection(Connection):
         # "scheme", "path", and "query_string").
         self._http_conn = HTTPConnection(scope={"type": "websocket", "headers": {}})
         self._queue: asyncio.Queue[str] = asyncio.Queue()
+        # The messages that have been sent to the other side, for tests to inspect
+        self.sent: List[str] = []
 
     async def send(self, message: str) -> None:
-        pass
+        self.sent.append(message)
 
     async def receive(self) -> str:
         msg = await self._queue.get()
@@ -1,5 +1,5 @@
-from queue import PriorityQueue
-from typing import Generic, Tuple, TypeVar
+import heapq
+from typing import Dict, Generic, List, TypeVar
 
 T = TypeVar("T")
 
@@ -10,12 +10,22 @@ class PriorityQueueFIFO(Generic[T]):
     priority, they are returned in the order they were inserted. Also, the item
     is kept separate from the priority value (with PriorityQueue, the priority
     is part of the item).
+
+    Unlike queue.PriorityQueue, this doesn't do any locking (the reactive flush is
+    single-threaded), and items that are still in the queue can be removed or given a
+    new priority in O(log n) time. Items must be hashable, and each item can be in the
+    queue at most once.
     """
 
     def __init__(self) -> None:
-        # Using Tuple instead of tuple because in Python 3.8 and earlier, tuple isn't
-        # generic
-        self._pq: PriorityQueue[Tuple[int, int, T]] = PriorityQueue()
+        # Using List instead of list because in Python 3.8 and earlier, list isn't
+        # generic. Each heap entry is [-priority, order, tiebreak, item], where `order`
+        # is the item's insertion order (kept when the priority changes) and `tiebreak`
+        # is unique per entry, so that items themselves are never compared. Removed
+        # entries are left in the heap (and skipped when popped) but are dropped from
+        # self._entries.
+        self._heap: List[List[object]] = []
+        self._entries: Dict[T, List[object]] = {}
         self._counter: int = 0
 
     def put(self, priority: int, item: T) -> None:
@@ -25,14 +35,81 @@ class PriorityQueueFIFO(Generic[T]):
         Parameters:
            priority (int): The priority of the item. Higher priority items will
                            come out of the queue before lower priority items.
-           item (T): The item to put in the queue.
+           item (T): The item to put in the queue. If the item is already in the
+                     queue, its priority is updated instead.
         """
+        if item in self._entries:
+            self.set_priority(item, priority)
+            return
         self._counter += 1
-        self._pq.put((-priority, self._counter, item))
+        entry: List[object] = [-priority, self._counter, self._counter, item]
+        self._entries[item] = entry
+        heapq.heappush(self._heap, entry)
 
     def get(self) -> T:
-        iteminfo: Tuple[int, int, T] = self._pq.get()
-        return iteminfo[2]
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            item: T = entry[3]  # type: ignore
+            if self._entries.get(item) is entry:
+                del self._entries[item]
+                return item
+        raise IndexError("get from an empty PriorityQueueFIFO")
+
+    def peek_priority(self) -> int:
+        """
+        Return the priority of the item that would be returned by the next ``get()``.
+        """
+        while self._heap:
+            entry = self._heap[0]
+            if self._entries.get(entry[3]) is entry:  # type: ignore
+                return -entry[0]  # type: ignore
+            heapq.heappop(self._heap)
+        raise IndexError("peek from an empty PriorityQueueFIFO")
+
+    def remove(self, item: T) -> bool:
+        """
+        Remove an item from the queue. Returns ``True`` if the item was in the queue.
+        """
+        entry = self._entries.pop(item, None)
+        if entry is None:
+            return False
+        self._maybe_compact()
+        return True
+
+    def set_priority(self, item: T, priority: int) -> bool:
+        """
+        Change the priority of an item that is in the queue. The item keeps its
+        original insertion order relative to other items with the same priority.
+        Returns ``True`` if the item was in the queue.
+        """
+        entry = self._entries.get(item)
+        if entry is None:
+            return False
+        if entry[0] == -priority:
+            return True
+        self._counter += 1
+        new_entry: List[object] = [-priority, entry[1], self._counter, item]
+        self._entries[item] = new_entry
+        heapq.heappush(self._heap, new_entry)
+        self._maybe_compact()
+        return True
+
+    def _maybe_compact(self) -> None:
+        # Stale entries are skipped lazily by get(); rebuild the heap once they make up
+        # more than half of it, so memory stays proportional to the queue size.
+        if len(self._heap) > 2 * len(self._entries) + 16:
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def qsize(self) -> int:
+        """Return the number of items in the queue."""
+        return len(self._entries)
 
     def empty(self) -> bool:
-        return self._pq.empty()
+        return not self._entries
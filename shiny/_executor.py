@@ -0,0 +1,146 @@
+"""Running synchronous functions off of the event loop, from reactive functions."""
+
+from __future__ import annotations
+
+__all__ = ("run_in_executor",)
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import sys
+from typing import Callable, Optional, TypeVar, Union
+
+if sys.version_info >= (3, 8):
+    from typing import Literal
+else:
+    from typing_extensions import Literal
+
+from ._utils import is_async_callable
+from .types import SilentCancelOutputException
+
+T = TypeVar("T")
+
+ExecutorArg = Union[Literal["thread", "process"], concurrent.futures.Executor]
+
+_thread_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def resolve_executor(executor: ExecutorArg) -> concurrent.futures.Executor:
+    """Return the executor for an ``executor`` argument, creating the shared thread or
+    process pool if necessary."""
+    global _thread_pool, _process_pool
+    if executor == "thread":
+        if _thread_pool is None:
+            _thread_pool = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix="shiny"
+            )
+        return _thread_pool
+    if executor == "process":
+        if _process_pool is None:
+            _process_pool = concurrent.futures.ProcessPoolExecutor()
+        return _process_pool
+    if isinstance(executor, concurrent.futures.Executor):
+        return executor
+    raise ValueError(
+        '`executor` must be "thread", "process", or a concurrent.futures.Executor.'
+    )
+
+
+def _run_off_loop(fn: Callable[[], T]) -> T:
+    from .reactive._core import _off_loop, _reactive_environment
+
+    _off_loop.set(True)
+    _reactive_environment._current_context.set(None)
+    return fn()
+
+
+def submit(
+    fn: Callable[[], T], executor: ExecutorArg
+) -> "concurrent.futures.Future[T]":
+    """Submit a synchronous function to `executor`."""
+    pool = resolve_executor(executor)
+    if isinstance(pool, concurrent.futures.ThreadPoolExecutor):
+        # Run with a copy of the current contextvars (so the current session is
+        # available), but with reactive reads disallowed: the reactive graph may only be
+        # used from the event loop's thread.
+        return pool.submit(contextvars.copy_context().run, _run_off_loop, fn)
+    return pool.submit(fn)
+
+
+async def _await_job(fut: "concurrent.futures.Future[T]") -> T:
+    from .reactive._core import get_current_context
+    from .session import get_current_session
+
+    stale = False
+
+    def cancel() -> None:
+        nonlocal stale
+        stale = True
+        fut.cancel()
+        wrapped.cancel()
+
+    wrapped = asyncio.wrap_future(fut)
+    get_current_context().on_invalidate(cancel)
+    session = get_current_session()
+    unsub = session.on_ended(cancel) if session is not None else None
+    try:
+        return await wrapped
+    except asyncio.CancelledError:
+        if not stale:
+            raise
+        raise SilentCancelOutputException() from None
+    finally:
+        if unsub is not None:
+            unsub()
+
+
+async def run_in_executor(
+    fn: Callable[..., T], *args: object, executor: ExecutorArg = "thread"
+) -> T:
+    """
+    Run a synchronous function off of the event loop, from a reactive function.
+
+    Functions that are run in an executor can't read reactive values, so this is the way
+    to run a long computation on reactive inputs: read them in an async reactive
+    calculation (or render function) and pass them to the function.
+
+    Parameters
+    ----------
+    fn
+        The function to run. For a process pool, it must be picklable (i.e., defined at
+        the top level of a module), as must its arguments and result.
+    *args
+        Arguments to pass to ``fn``.
+    executor
+        ``"thread"`` or ``"process"`` (to use a shared thread or process pool), or a
+        :class:`concurrent.futures.Executor`.
+
+    Returns
+    -------
+    The result of ``fn``.
+
+    Note
+    ----
+    If the reactive context that this is called from is invalidated before ``fn``
+    finishes, the job is cancelled if it hasn't started yet, and otherwise its result
+    is discarded; the same happens if the session ends.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @reactive.Calc
+        async def model():
+            return await reactive.run_in_executor(
+                fit_model, data(), input.alpha(), executor="process"
+            )
+
+    See Also
+    --------
+    ~shiny.reactive.Calc
+    """
+    if is_async_callable(fn):
+        raise TypeError("`run_in_executor()` requires a synchronous function.")
+    return await _await_job(submit(functools.partial(fn, *args), executor))
@@ -0,0 +1,131 @@
+"""
+JSON encoding and decoding of the messages exchanged with the browser.
+
+Uses orjson, if it's installed, and otherwise the standard library's json module.
+Either way, numpy and pandas objects (arrays, scalars, timestamps, Series, and so on)
+are encoded directly, without having to convert them to Python objects first.
+"""
+
+from __future__ import annotations
+
+__all__ = ("dumps", "loads", "set_backend", "get_backend", "JSONResponse")
+
+import datetime
+import json
+import sys
+from typing import Any, Callable, Optional, Union
+
+from starlette.responses import JSONResponse as _StarletteJSONResponse
+
+from ._utils import lists_to_tuples
+
+
+def _default(obj: Any) -> Any:
+    # Called by the encoder for objects it doesn't know how to encode. Only checks for
+    # numpy and pandas objects if those packages have been loaded.
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.datetime64):
+            return str(obj)
+        if isinstance(obj, np.generic):
+            return obj.item()
+    pd = sys.modules.get("pandas")
+    if pd is not None:
+        if obj is pd.NaT:
+            return None
+        if isinstance(obj, pd.Timestamp):
+            return obj.isoformat()
+        if isinstance(obj, pd.Timedelta):
+            return obj.total_seconds()
+        if isinstance(obj, (pd.Series, pd.Index)):
+            return obj.tolist()
+        if isinstance(obj, pd.DataFrame):
+            return obj.to_dict(orient="records")  # type: ignore
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)  # type: ignore
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=_default)
+
+
+def _json_loads(s: Union[str, bytes]) -> Any:
+    return json.loads(s)
+
+
+_dumps: Callable[[Any], str] = _json_dumps
+_loads: Callable[[Union[str, bytes]], Any] = _json_loads
+_backend: str = "json"
+
+
+def set_backend(backend: Optional[str] = None) -> None:
+    """
+    Set the JSON library used to encode and decode messages: ``"orjson"``, ``"json"``
+    (the standard library), or ``None`` to use orjson if it's installed.
+    """
+    global _dumps, _loads, _backend
+
+    if backend is None:
+        try:
+            set_backend("orjson")
+        except ImportError:
+            set_backend("json")
+        return
+
+    if backend == "json":
+        _dumps, _loads = _json_dumps, _json_loads
+    elif backend == "orjson":
+        import orjson  # pyright: ignore[reportMissingImports]
+
+        option: int = (
+            orjson.OPT_SERIALIZE_NUMPY  # pyright: ignore
+            | orjson.OPT_NON_STR_KEYS  # pyright: ignore
+        )
+
+        def _orjson_dumps(obj: Any) -> str:
+            try:
+                res = orjson.dumps(obj, default=_default, option=option)  # type: ignore
+            except TypeError:
+                # orjson is stricter than json about some things (like integers that
+                # don't fit in 64 bits); anything that can't be encoded by either
+                # raises an error from json.
+                return _json_dumps(obj)
+            return res.decode()
+
+        _dumps, _loads = _orjson_dumps, orjson.loads  # pyright: ignore
+    else:
+        raise ValueError(f"Unknown JSON backend: {backend!r}")
+    _backend = backend
+
+
+def get_backend() -> str:
+    """Return the name of the JSON library in use."""
+    return _backend
+
+
+def dumps(obj: Any) -> str:
+    """Encode `obj` as a JSON string."""
+    return _dumps(obj)
+
+
+def loads(s: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON string, converting lists to tuples (so that the result can't be
+    modified in place).
+    """
+    return lists_to_tuples(_loads(s))
+
+
+class JSONResponse(_StarletteJSONResponse):
+    """A JSON response, encoded with the same library as messages."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content).encode("utf-8")
+
+
+set_backend()
@@ -16,7 +16,7 @@ import uvicorn.config
 
 import shiny
 
-from . import _autoreload, _hostenv, _static, _utils
+from . import _autoreload, _compression, _hostenv, _static, _utils, _ws_compression
 
 
 @click.group()  # pyright: ignore[reportUnknownMemberType]
@@ -73,6 +73,33 @@ any of the following will work:
     help="WebSocket max size message in bytes",
     show_default=True,
 )
+@click.option(
+    "--ws-compression/--no-ws-compression",
+    default=True,
+    help="Compress WebSocket messages (if the browser supports it).",
+    show_default=True,
+)
+@click.option(
+    "--ws-compression-level",
+    type=click.IntRange(0, 9),
+    default=_compression.DEFAULT_LEVEL,
+    help="Compression level for WebSocket messages, from 0 (none) to 9 (smallest).",
+    show_default=True,
+)
+@click.option(
+    "--ws-compression-threshold",
+    type=click.IntRange(min=0),
+    default=_compression.DEFAULT_THRESHOLD,
+    help="Send WebSocket messages smaller than this many bytes uncompressed.",
+    show_default=True,
+)
+@click.option(
+    "--ws-skip-precompressed/--no-ws-skip-precompressed",
+    default=True,
+    help="Send WebSocket messages that consist mostly of already-compressed data (like"
+    " PNG images) uncompressed.",
+    show_default=True,
+)
 @click.option(
     "--log-level",
     type=click.Choice(list(uvicorn.config.LOG_LEVELS.keys())),
@@ -109,6 +136,10 @@ def run(
     autoreload_port: int,
     reload: bool,
     ws_max_size: int,
+    ws_compression: bool,
+    ws_compression_level: int,
+    ws_compression_threshold: int,
+    ws_skip_precompressed: bool,
     log_level: str,
     app_dir: str,
     factory: bool,
@@ -121,6 +152,10 @@ def run(
         autoreload_port=autoreload_port,
         reload=reload,
         ws_max_size=ws_max_size,
+        ws_compression=ws_compression,
+        ws_compression_level=ws_compression_level,
+        ws_compression_threshold=ws_compression_threshold,
+        ws_skip_precompressed=ws_skip_precompressed,
         log_level=log_level,
         app_dir=app_dir,
         factory=factory,
@@ -135,6 +170,10 @@ def run_app(
     autoreload_port: int = 0,
     reload: bool = False,
     ws_max_size: int = 16777216,
+    ws_compression: bool = True,
+    ws_compression_level: int = _compression.DEFAULT_LEVEL,
+    ws_compression_threshold: int = _compression.DEFAULT_THRESHOLD,
+    ws_skip_precompressed: bool = True,
     log_level: Optional[str] = None,
     app_dir: Optional[str] = ".",
     factory: bool = False,
@@ -165,6 +204,18 @@ def run_app(
         Enable auto-reload.
     ws_max_size
         WebSocket max size message in bytes.
+    ws_compression
+        Compress WebSocket messages (with the permessage-deflate extension, if the
+        browser supports it).
+    ws_compression_level
+        The compression level for WebSocket messages, from 0 (none) to 9 (smallest).
+    ws_compression_threshold
+        WebSocket messages smaller than this many bytes are sent uncompressed.
+    ws_skip_precompressed
+        Send WebSocket messages that consist mostly of data that's already compressed,
+        like PNG images, uncompressed. Compressing them only saves about a quarter of
+        their size (the base64 encoding overhead), which may still be worth it on a
+        slow connection.
     log_level
         Log level.
     app_dir
@@ -236,6 +287,19 @@ def run_app(
 
     maybe_setup_rsw_proxying(log_config)
 
+    _compression.set_options(
+        ws_compression,
+        ws_compression_level,
+        ws_compression_threshold,
+        ws_skip_precompressed,
+    )
+    ws_options: Dict[str, Any] = {}
+    if ws_compression:
+        # Otherwise, leave the choice of websocket implementation to uvicorn.
+        ws_protocol = _ws_compression.ws_protocol()
+        if ws_protocol is not None:
+            ws_options["ws"] = ws_protocol
+
     uvicorn.run(  # pyright: ignore[reportUnknownMemberType]
         app,  # pyright: ignore[reportGeneralTypeIssues]
         host=host,
@@ -245,6 +309,7 @@ def run_app(
         ws_max_size=ws_max_size,
         log_level=log_level,
         log_config=log_config,
+        **ws_options,
         app_dir=app_dir,
         factory=factory,
     )
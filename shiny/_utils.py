@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import contextvars
 import functools
 import importlib
 import inspect
@@ -252,6 +253,11 @@ def run_coro_hybrid(coro: Awaitable[T]) -> "asyncio.Future[T]":
     if not inspect.iscoroutine(coro):
         raise TypeError("run_coro_hybrid requires a Coroutine object.")
 
+    # Like a Task, run every step of the coro in the same (copied) context. Otherwise,
+    # each step scheduled with call_soon() or add_done_callback() would run in a new
+    # copy, and a ContextVar token created in one step couldn't be reset in another.
+    context = contextvars.copy_context()
+
     # Inspired by Task.__step method in cpython/Lib/asyncio/tasks.py
     def _step(fut: Optional["asyncio.Future[None]"] = None):
         assert result_future.cancelled() or not result_future.done()
@@ -292,18 +298,30 @@ def run_coro_hybrid(coro: Awaitable[T]) -> "asyncio.Future[T]":
         else:
             # If we get here, the coro didn't finish. Schedule it for completion.
             if isinstance(res, asyncio.Future):
-                res.add_done_callback(_step)
+                res.add_done_callback(_step, context=context)
             elif res is None:
                 # This case happens with asyncio.sleep(0)
-                asyncio.get_running_loop().call_soon(_step)
+                asyncio.get_running_loop().call_soon(_step, context=context)
             else:
                 raise RuntimeError(f"coroutine yielded unknown value: {res!r}")
 
-    _step()
+    context.run(_step)
 
     return result_future
 
 
+async def yield_event_loop() -> None:
+    """
+    Let the event loop run other tasks (and process I/O) before continuing.
+
+    This is like ``await asyncio.sleep(0)``, but it doesn't call asyncio.sleep(), which
+    may be replaced (e.g., by a mock clock in tests).
+    """
+    fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+    asyncio.get_running_loop().call_soon(fut.set_result, None)
+    await fut
+
+
 # ==============================================================================
 # Callback registry
 # ==============================================================================
@@ -0,0 +1,143 @@
+"""
+The permessage-deflate websocket extension with Shiny's compression settings, and the
+uvicorn websocket protocols that use it. See `_compression` for the settings.
+"""
+
+from __future__ import annotations
+
+__all__ = ("ws_protocol",)
+
+import os
+import time
+from typing import Any, List, Optional, Sequence, Tuple, Type
+
+from websockets.extensions.base import ServerExtensionFactory
+from websockets.extensions.permessage_deflate import (
+    PerMessageDeflate,
+    ServerPerMessageDeflateFactory,
+)
+from websockets.frames import CTRL_OPCODES, Frame, Opcode
+from websockets.typing import ExtensionParameter
+
+from . import _compression
+
+
+class _PerMessageDeflate(PerMessageDeflate):
+    def __init__(
+        self, ext: PerMessageDeflate, threshold: int, skip_precompressed: bool
+    ) -> None:
+        super().__init__(
+            ext.remote_no_context_takeover,
+            ext.local_no_context_takeover,
+            ext.remote_max_window_bits,
+            ext.local_max_window_bits,
+            ext.compress_settings,
+        )
+        self.threshold = threshold
+        self.skip_precompressed = skip_precompressed
+        # Whether the message being sent (which may be in several frames) is
+        # compressed. Uncompressed messages are allowed by RFC 7692; they just don't
+        # have the RSV1 bit set.
+        self.compressing = False
+
+    def encode(self, frame: Frame) -> Frame:
+        if frame.opcode in CTRL_OPCODES:
+            return frame
+        if frame.opcode is not Opcode.CONT:
+            _compression._stats.messages += 1
+            if len(frame.data) < self.threshold:
+                _compression._stats.skipped_small += 1
+                self.compressing = False
+            elif self.skip_precompressed and _compression._precompressed.get():
+                _compression._stats.skipped_precompressed += 1
+                self.compressing = False
+            else:
+                _compression._stats.compressed += 1
+                self.compressing = True
+        if not self.compressing:
+            return frame
+
+        start = time.perf_counter()
+        res = super().encode(frame)
+        _compression._stats.secs += time.perf_counter() - start
+        _compression._stats.bytes_in += len(frame.data)
+        _compression._stats.bytes_out += len(res.data)
+        return res
+
+
+class _PerMessageDeflateFactory(ServerPerMessageDeflateFactory):
+    def __init__(self, level: int, threshold: int, skip_precompressed: bool) -> None:
+        # The same window size and memory level as uvicorn, to keep the memory used per
+        # connection down.
+        super().__init__(
+            server_max_window_bits=12,
+            client_max_window_bits=12,
+            compress_settings={"level": level, "memLevel": 5},
+        )
+        self.threshold = threshold
+        self.skip_precompressed = skip_precompressed
+
+    def process_request_params(
+        self,
+        params: Sequence[ExtensionParameter],
+        accepted_extensions: Sequence[Any],
+    ) -> Tuple[List[ExtensionParameter], PerMessageDeflate]:
+        response_params, ext = super().process_request_params(
+            params, accepted_extensions
+        )
+        return list(response_params), _PerMessageDeflate(
+            ext, self.threshold, self.skip_precompressed
+        )
+
+
+def _extensions() -> List[ServerExtensionFactory]:
+    env = os.environ
+    if env.get(_compression._ENV_ENABLED, "1") == "0":
+        return []
+    level = int(env.get(_compression._ENV_LEVEL, _compression.DEFAULT_LEVEL))
+    threshold = int(
+        env.get(_compression._ENV_THRESHOLD, _compression.DEFAULT_THRESHOLD)
+    )
+    skip_precompressed = env.get(_compression._ENV_SKIP_PRECOMPRESSED, "1") == "1"
+    return [_PerMessageDeflateFactory(level, threshold, skip_precompressed)]
+
+
+# uvicorn's websocket protocols, with Shiny's compression settings. These are defined at
+# the top level so that they can be pickled (which uvicorn does when reloading).
+_protocol: Optional[Type[Any]] = None
+
+try:
+    from uvicorn.protocols.websockets.websockets_sansio_impl import (
+        WebSocketsSansIOProtocol as _WebSocketsSansIOProtocol,
+    )
+
+    class WebSocketsSansIOProtocol(_WebSocketsSansIOProtocol):  # type: ignore
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self.conn.available_extensions = _extensions()
+
+    _protocol = WebSocketsSansIOProtocol
+
+except ImportError:
+    try:
+        from uvicorn.protocols.websockets.websockets_impl import (
+            WebSocketProtocol as _WebSocketProtocol,
+        )
+
+        class WebSocketsProtocol(_WebSocketProtocol):  # type: ignore
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                super().__init__(*args, **kwargs)
+                self.available_extensions = _extensions()
+
+        _protocol = WebSocketsProtocol
+
+    except ImportError:
+        pass
+
+
+def ws_protocol() -> Optional[Type[Any]]:
+    """
+    The uvicorn websocket protocol class that applies the compression settings, or
+    None if uvicorn's websockets implementation isn't available.
+    """
+    return _protocol
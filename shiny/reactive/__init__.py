@@ -1,19 +1,40 @@
 from ._core import (  # noqa: F401
     isolate,
+    batch,
     invalidate_later,
     flush,
     on_flushed,
     get_current_context,  # pyright: ignore[reportUnusedImport]
 )
+from .._executor import run_in_executor
 from ._poll import poll, file_reader
+from ._cache import cache
+from ._ratelimit import debounce, throttle
+from ._stream import (  # noqa: F401
+    stream,
+    Stream_,  # pyright: ignore[reportUnusedImport]
+)
+from ._collections import (  # noqa: F401
+    # Not in __all__, so that `from shiny.reactive import *` doesn't shadow
+    # typing.Dict and typing.List; use them as reactive.Dict and reactive.List.
+    Dict,  # pyright: ignore[reportUnusedImport]
+    List,  # pyright: ignore[reportUnusedImport]
+)
+from ._trace import Tracer, enable_tracing, disable_tracing, get_tracer
 from ._reactives import (  # noqa: F401
     Value,
     Calc,
     Calc_,  # pyright: ignore[reportUnusedImport]
     CalcAsync_,  # pyright: ignore[reportUnusedImport]
+    SharedCalc,
+    SharedCalc_,  # pyright: ignore[reportUnusedImport]
+    SharedCalcAsync_,  # pyright: ignore[reportUnusedImport]
+    Reduce_,  # pyright: ignore[reportUnusedImport]
+    reduce,
     Effect,
     Effect_,  # pyright: ignore[reportUnusedImport]
     event,
+    select,
 )
 
 
@@ -22,10 +43,23 @@ __all__ = (
     "on_flushed",
     "Value",
     "Calc",
+    "SharedCalc",
+    "reduce",
     "Effect",
     "event",
+    "select",
     "isolate",
+    "batch",
     "invalidate_later",
     "poll",
     "file_reader",
+    "stream",
+    "cache",
+    "run_in_executor",
+    "debounce",
+    "throttle",
+    "Tracer",
+    "enable_tracing",
+    "disable_tracing",
+    "get_tracer",
 )
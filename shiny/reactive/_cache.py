@@ -0,0 +1,347 @@
+"""Keyed result caches for reactive calculations and render functions."""
+
+from __future__ import annotations
+
+__all__ = ("cache",)
+
+import asyncio
+import collections
+import sys
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+    TypeVar,
+    cast,
+)
+
+from .._utils import is_async_callable
+from ..render import RenderFunction
+from ..types import MISSING, MISSING_TYPE
+from ._reactives import Calc_
+
+if TYPE_CHECKING:
+    from ..session import Session
+
+if sys.version_info >= (3, 8):
+    from typing import Literal
+else:
+    from typing_extensions import Literal
+
+T = TypeVar("T")
+CacheableT = TypeVar("CacheableT", Calc_[Any], RenderFunction[Any, Any])
+
+
+class _LRUCache:
+    """
+    A least-recently-used cache, bounded by number of items and (estimated) total size,
+    with optional expiry. Concurrent misses on the same key are computed only once.
+    """
+
+    def __init__(
+        self,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.max_items: Optional[int] = max_items
+        self.max_bytes: Optional[int] = max_bytes
+        self.ttl: Optional[float] = ttl
+        # key -> (value, size, expiry time)
+        self._entries: "collections.OrderedDict[Hashable, Tuple[Any, int, float]]" = (
+            collections.OrderedDict()
+        )
+        self._bytes: int = 0
+        # Keys that are currently being computed
+        self._pending: Dict[Hashable, asyncio.Event] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Any:
+        """Return the value for `key`, or MISSING if it isn't in the cache."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        if entry[2] < time.monotonic():
+            self._remove(key)
+            return MISSING
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = _estimate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Caching this would evict everything else, and still not fit
+            self._remove(key)
+            return
+        if key in self._entries:
+            self._remove(key)
+        expiry = float("inf") if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = (value, size, expiry)
+        self._bytes += size
+        while (self.max_items is not None and len(self._entries) > self.max_items) or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, (_, old_size, _) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[T]]
+    ) -> T:
+        while True:
+            value = self.get(key)
+            if not isinstance(value, MISSING_TYPE):
+                return value
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            # Someone else is already computing this value; wait for them and check
+            # the cache again. (If their computation failed, we'll compute it here.)
+            await pending.wait()
+
+        done = self._pending[key] = asyncio.Event()
+        try:
+            value = await compute()
+            self.set(key, value)
+            return value
+        finally:
+            del self._pending[key]
+            done.set()
+
+
+# Caches for `scope="app"`, by id, so that the same function created in different
+# sessions shares a cache.
+_app_caches: Dict[str, _LRUCache] = {}
+
+
+def cache(
+    key: Callable[[], object],
+    *,
+    max_items: Optional[int] = 1000,
+    max_bytes: Optional[int] = None,
+    ttl: Optional[float] = None,
+    scope: Literal["app", "session"] = "session",
+    id: Optional[str] = None,
+) -> Callable[[CacheableT], CacheableT]:
+    """
+    Cache the results of a reactive calculation or render function by key.
+
+    A :func:`~shiny.reactive.Calc` only remembers its most recent value. With
+    ``@reactive.cache()``, results are remembered for each distinct value of ``key``,
+    so going back to a previously seen combination of inputs returns the cached result
+    right away instead of re-running the calculation (or re-rendering the output).
+
+    Parameters
+    ----------
+    key
+        A function that returns the cache key, such as ``lambda: (input.x(),
+        input.y())``. This is run reactively: the cached object is invalidated when
+        anything ``key`` reads changes. The key must capture everything that the result
+        depends on; when the result comes from the cache, the calculation isn't run, so
+        it doesn't take any other reactive dependencies. Lists, dicts, sets, and numpy
+        arrays are allowed in keys, in addition to hashable values.
+    max_items
+        The maximum number of results to keep. ``None`` means no limit.
+    max_bytes
+        The maximum (estimated) total size of the results to keep. ``None`` means no
+        limit. Results larger than this are not cached.
+    ttl
+        The number of seconds after which a cached result expires. ``None`` means
+        results don't expire.
+    scope
+        If ``"session"``, each session has its own cache, which is discarded when the
+        session ends. If ``"app"``, the cache is shared by all sessions that use the
+        same ``id``.
+    id
+        The name of the cache, which is required with ``scope="app"``. Every function
+        cached with the same ``id`` shares results, so the key must capture everything
+        the result depends on, including anything that differs between sessions (such
+        as the user) or between functions made from the same code (such as variables
+        captured by a closure).
+
+    Returns
+    -------
+    A decorator that should be applied to a :class:`~shiny.reactive.Calc` or a
+    ``@render.xx`` function.
+
+    Tip
+    ----
+    This decorator must be applied after the relevant reactivity decorator, i.e.,
+    ``@reactive.cache()`` goes above ``@reactive.Calc`` or ``@render.xx`` (and below
+    ``@output``).
+
+    Note
+    ----
+    Errors (including those raised by :func:`~shiny.req`) are not cached. When several
+    sessions miss the cache with the same key at the same time, the result is computed
+    once, and the other sessions wait for it.
+
+    For ``@render.plot``, the size and pixel ratio of the plot are automatically added
+    to the key.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @output
+        @reactive.cache(key=lambda: (input.dataset(), input.bins()))
+        @render.plot
+        def hist():
+            ...
+
+        # Shared by all sessions
+        @reactive.cache(key=lambda: input.dataset(), scope="app", id="dataset")
+        @reactive.Calc
+        def data():
+            ...
+
+    See Also
+    --------
+    ~shiny.reactive.Calc
+    """
+
+    if scope not in ("app", "session"):
+        raise ValueError('`scope` must be "app" or "session".')
+    if scope == "app" and id is None:
+        raise ValueError('`scope="app"` requires an `id` for the cache.')
+
+    # For scope="session"
+    session_caches: Dict[Optional[str], _LRUCache] = {}
+
+    def new_cache() -> _LRUCache:
+        return _LRUCache(max_items=max_items, max_bytes=max_bytes, ttl=ttl)
+
+    def get_store(obj: object) -> _LRUCache:
+        if id is not None and scope == "app":
+            if id not in _app_caches:
+                _app_caches[id] = new_cache()
+            return _app_caches[id]
+
+        session: Optional[Session] = getattr(obj, "_session", None)
+        session_id = session.id if session is not None else None
+        if session_id not in session_caches:
+            session_caches[session_id] = new_cache()
+            if session is not None:
+
+                def drop_cache() -> None:
+                    session_caches.pop(session_id, None)
+
+                session.on_ended(drop_cache)
+        return session_caches[session_id]
+
+    def decorator(obj: CacheableT) -> CacheableT:
+        if isinstance(obj, Calc_):
+            calc: Calc_[Any] = obj
+            calc_fn = calc._fn
+
+            async def cached_calc_fn() -> Any:
+                k = _hashable_key(key())
+                return await get_store(calc).get_or_compute(k, calc_fn)
+
+            calc._fn = cached_calc_fn
+            return obj
+
+        if isinstance(obj, RenderFunction):
+            render_fn: RenderFunction[Any, Any] = obj
+            orig_run: Optional[Callable[[], Awaitable[Any]]] = getattr(
+                render_fn, "_run", None
+            )
+            if orig_run is None or not is_async_callable(orig_run):
+                raise TypeError(
+                    f"`@reactive.cache()` doesn't support {type(obj).__name__} objects."
+                )
+
+            async def cached_run() -> Any:
+                k = _hashable_key(
+                    (render_fn._name, render_fn._cache_key_extra(), key())
+                )
+                return await get_store(render_fn).get_or_compute(k, orig_run)
+
+            render_fn._run = cached_run  # type: ignore
+            return obj
+
+        raise TypeError(
+            "`@reactive.cache()` must be applied to a `@reactive.Calc` or `@render.xx` "
+            + "function.\n"
+            + "In other words, `@reactive.cache()` must be above `@reactive.Calc` or "
+            + "`@render.xx`."
+        )
+
+    return decorator
+
+
+def _hashable_key(x: object) -> Hashable:
+    if isinstance(x, (list, tuple)):
+        items = cast(Iterable[object], x)
+        return (type(items).__name__,) + tuple(_hashable_key(y) for y in items)
+    if isinstance(x, dict):
+        d = cast(Dict[Hashable, object], x)
+        return ("dict", frozenset((k, _hashable_key(v)) for k, v in d.items()))
+    if isinstance(x, (set, frozenset)):
+        items = cast(Iterable[object], x)
+        return ("set", frozenset(_hashable_key(y) for y in items))
+
+    # numpy and pandas are optional, and untyped here.
+    np: Any = sys.modules.get("numpy")
+    if np is not None and isinstance(x, np.ndarray):
+        arr: Any = x
+        return ("ndarray", arr.shape, str(arr.dtype), arr.tobytes())
+
+    try:
+        hash(x)
+    except TypeError:
+        raise TypeError(
+            f"`@reactive.cache()` key contains an unhashable object of type "
+            f"{type(x).__name__}."
+        ) from None
+    return x  # type: ignore
+
+
+def _estimate_size(x: object, depth: int = 0) -> int:
+    np: Any = sys.modules.get("numpy")
+    if np is not None and isinstance(x, np.ndarray):
+        arr: Any = x
+        return int(arr.nbytes)
+    pd: Any = sys.modules.get("pandas")
+    if pd is not None:
+        frame: Any = x
+        if isinstance(x, pd.DataFrame):
+            return int(frame.memory_usage(deep=True).sum())
+        if isinstance(x, (pd.Series, pd.Index)):
+            return int(frame.memory_usage(deep=True))
+
+    size = sys.getsizeof(x)
+    # Don't walk deeply-nested (or self-referential) structures; this is only an
+    # estimate.
+    if depth < 4:
+        if isinstance(x, dict):
+            d = cast(Dict[object, object], x)
+            size += sum(
+                _estimate_size(k, depth + 1) + _estimate_size(v, depth + 1)
+                for k, v in d.items()
+            )
+        elif isinstance(x, (list, tuple, set, frozenset)):
+            items = cast(Iterable[object], x)
+            size += sum(_estimate_size(y, depth + 1) for y in items)
+    return size
@@ -0,0 +1,469 @@
+"""Reactive collections, with dependencies on individual items."""
+
+from __future__ import annotations
+
+__all__ = ("Dict", "List")
+
+import contextlib
+import functools
+import typing
+from typing import (
+    Any,
+    Callable,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+from ..types import MISSING, MISSING_TYPE
+from . import _trace
+from ._core import Dependents, batch, get_current_context
+from ._reactives import _values_equal
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+
+@contextlib.contextmanager
+def _changing(obj: object, bulk: bool = False) -> Generator[None, None, None]:
+    # When tracing, `obj` is the source of the invalidations (as for Value.set()).
+    # Changes to several items are batched, so that each dependent is invalidated once.
+    tracer = _trace._tracer
+    traced = tracer is not None and not tracer.has_source()
+    if traced:
+        tracer.push_source(obj)  # pyright: ignore
+    try:
+        if bulk:
+            with batch():
+                yield
+        else:
+            yield
+    finally:
+        if traced:
+            tracer.pop_source()  # pyright: ignore
+
+
+class Dict(MutableMapping[K, V]):
+    """
+    A reactive dictionary.
+
+    Unlike a :class:`~shiny.reactive.Value` that holds a ``dict``, reading an item of a
+    reactive dictionary takes a dependency on just that key: setting ``d["a"]``
+    invalidates the reactive functions that read ``d["a"]`` (or that read all of the
+    items, e.g. by iterating over ``d.items()``), but not those that only read
+    ``d["b"]``. Reading the keys, the length, or whether there is a key takes a
+    dependency on the set of keys, which is invalidated only when a key is added or
+    removed.
+
+    Parameters
+    ----------
+    data
+        The initial items, as a mapping or an iterable of key-value pairs.
+    equals
+        A function that takes the old and new values of an item and returns ``True`` if
+        they are equal, in which case setting the item does not invalidate dependents.
+        Defaults to the same comparison as :class:`~shiny.reactive.Value`.
+
+    Note
+    ----
+    As with :class:`~shiny.reactive.Value`, items may only be read from within a
+    reactive function (or :func:`~shiny.reactive.isolate`). Setting and removing items
+    (including with ``update()``, ``set()``, ``pop()``, and ``clear()``) can be done
+    anywhere. Bulk operations invalidate each affected dependent just once, after all
+    of the changes have been made (see :func:`~shiny.reactive.batch`).
+
+    See Also
+    --------
+    List
+    Value
+    """
+
+    __slots__ = ("_data", "_equals", "_item_dependents", "_keys_dependents")
+
+    def __init__(
+        self,
+        data: Union[Mapping[K, V], Iterable[Tuple[K, V]], None] = None,
+        *,
+        equals: Optional[Callable[[V, V], bool]] = None,
+    ) -> None:
+        self._data: typing.Dict[K, V] = dict(data) if data is not None else {}
+        self._equals: Callable[[Any, Any], bool] = equals or _values_equal
+        # Created when an item is first read, so that items nobody reads are cheap.
+        self._item_dependents: typing.Dict[K, Dependents] = {}
+        self._keys_dependents: Dependents = Dependents()
+
+    def _register_item(self, key: K) -> None:
+        dependents = self._item_dependents.get(key)
+        if dependents is None:
+            dependents = self._item_dependents[key] = Dependents()
+        dependents.register()
+
+    def _drop_if_unused(self, key: K) -> None:
+        dependents = self._item_dependents.get(key)
+        if dependents is not None and not dependents._dependents:
+            if key not in self._data:
+                del self._item_dependents[key]
+
+    def _invalidate_item(self, key: K, removed: bool = False) -> None:
+        if removed:
+            dependents = self._item_dependents.pop(key, None)
+        else:
+            dependents = self._item_dependents.get(key)
+        if dependents is not None:
+            dependents.invalidate()
+
+    # Reading --------------------------------------------------------------------
+    def __getitem__(self, key: K) -> V:
+        self._register_item(key)
+        if key not in self._data:
+            # Reading a missing key (which raises KeyError) depends on it being added.
+            # That's only kept track of while the reader is using it, so that probing
+            # many missing keys doesn't leave entries behind.
+            get_current_context().on_invalidate(
+                functools.partial(self._drop_if_unused, key)
+            )
+        return self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        self._keys_dependents.register()
+        return key in self._data
+
+    def __iter__(self) -> Iterator[K]:
+        self._keys_dependents.register()
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        self._keys_dependents.register()
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    # Writing --------------------------------------------------------------------
+    def __setitem__(self, key: K, value: V) -> None:
+        with _changing(self):
+            self._set_item(key, value)
+
+    def _set_item(self, key: K, value: V) -> None:
+        data = self._data
+        if key in data:
+            old = data[key]
+            if old is value or self._equals(old, value):
+                return
+            data[key] = value
+        else:
+            data[key] = value
+            self._keys_dependents.invalidate()
+        self._invalidate_item(key)
+
+    def __delitem__(self, key: K) -> None:
+        with _changing(self):
+            self._del_item(key)
+
+    def _del_item(self, key: K) -> None:
+        del self._data[key]
+        self._keys_dependents.invalidate()
+        self._invalidate_item(key, removed=True)
+
+    def update(self, *args: Any, **kwargs: V) -> None:
+        """
+        Add or replace several items, with the same arguments as ``dict.update()``.
+        Only the items that are actually changed are invalidated.
+        """
+        new = typing.cast(typing.Dict[K, V], dict(*args, **kwargs))
+        with _changing(self, bulk=True):
+            for key, value in new.items():
+                self._set_item(key, value)
+
+    def set(self, data: Union[Mapping[K, V], Iterable[Tuple[K, V]]]) -> None:
+        """
+        Replace the contents of the dictionary. Only the items that are actually added,
+        changed, or removed are invalidated.
+        """
+        new = dict(data)
+        with _changing(self, bulk=True):
+            for key in [key for key in self._data if key not in new]:
+                self._del_item(key)
+            for key, value in new.items():
+                self._set_item(key, value)
+
+    @overload
+    def pop(self, key: K) -> V:
+        ...
+
+    @overload
+    def pop(self, key: K, default: Union[V, T]) -> Union[V, T]:
+        ...
+
+    def pop(self, key: K, default: Any = MISSING) -> Any:
+        if key not in self._data:
+            if isinstance(default, MISSING_TYPE):
+                raise KeyError(key)
+            return default
+        value = self._data[key]
+        with _changing(self):
+            self._del_item(key)
+        return value
+
+    def popitem(self) -> Tuple[K, V]:
+        if not self._data:
+            raise KeyError("popitem(): dictionary is empty")
+        key = next(reversed(self._data.keys()))
+        return key, self.pop(key)
+
+    def setdefault(self, key: K, default: V = None) -> V:  # type: ignore
+        if key not in self._data:
+            self[key] = default
+        return self._data[key]
+
+    def clear(self) -> None:
+        self.set({})
+
+
+class List(MutableSequence[T]):
+    """
+    A reactive list.
+
+    Unlike a :class:`~shiny.reactive.Value` that holds a ``list``, reading an item of a
+    reactive list takes a dependency on just that index: setting ``lst[3]`` invalidates
+    the reactive functions that read ``lst[3]`` (or that read all of the items, e.g. by
+    iterating over ``lst``), but not those that only read ``lst[0]``. Reading the length
+    takes a dependency on the length, which is invalidated only when it changes.
+
+    Inserting or removing an item moves the items after it, so it invalidates the
+    dependents of all of those indices; appending only invalidates the length.
+
+    Parameters
+    ----------
+    data
+        The initial items.
+    equals
+        A function that takes the old and new values of an item and returns ``True`` if
+        they are equal, in which case setting the item does not invalidate dependents.
+        Defaults to the same comparison as :class:`~shiny.reactive.Value`.
+
+    Note
+    ----
+    As with :class:`~shiny.reactive.Value`, items may only be read from within a
+    reactive function (or :func:`~shiny.reactive.isolate`). Changing the list can be
+    done anywhere. Bulk operations invalidate each affected dependent just once, after
+    all of the changes have been made (see :func:`~shiny.reactive.batch`).
+
+    See Also
+    --------
+    Dict
+    Value
+    """
+
+    __slots__ = ("_data", "_equals", "_item_dependents", "_len_dependents")
+
+    def __init__(
+        self,
+        data: Optional[Iterable[T]] = None,
+        *,
+        equals: Optional[Callable[[T, T], bool]] = None,
+    ) -> None:
+        self._data: typing.List[T] = list(data) if data is not None else []
+        self._equals: Callable[[Any, Any], bool] = equals or _values_equal
+        # Created when an index is first read, so that items nobody reads are cheap.
+        self._item_dependents: typing.Dict[int, Dependents] = {}
+        self._len_dependents: Dependents = Dependents()
+
+    def _register_item(self, i: int) -> None:
+        dependents = self._item_dependents.get(i)
+        if dependents is None:
+            dependents = self._item_dependents[i] = Dependents()
+        dependents.register()
+
+    def _drop_if_unused(self, i: int) -> None:
+        dependents = self._item_dependents.get(i)
+        if dependents is not None and not dependents._dependents:
+            if i >= len(self._data):
+                del self._item_dependents[i]
+
+    def _invalidate_items(self, start: int, stop: int) -> None:
+        # Invalidate the dependents of indices start <= i < stop. Looks at whichever of
+        # the range and the read indices is smaller.
+        item_dependents = self._item_dependents
+        if stop - start <= len(item_dependents):
+            indices: Iterable[int] = range(start, stop)
+        else:
+            indices = [i for i in item_dependents if start <= i < stop]
+        for i in indices:
+            dependents = item_dependents.get(i)
+            if dependents is not None:
+                dependents.invalidate()
+
+    def _resized(self, old_len: int) -> None:
+        new_len = len(self._data)
+        if new_len == old_len:
+            return
+        self._len_dependents.invalidate()
+        if new_len < old_len:
+            # Indices past the end (which can have been read, raising IndexError) are
+            # only kept while they're in use.
+            for i in [i for i in self._item_dependents if i >= new_len]:
+                if not self._item_dependents[i]._dependents:
+                    del self._item_dependents[i]
+
+    # Reading --------------------------------------------------------------------
+    @overload
+    def __getitem__(self, i: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> typing.List[T]:
+        ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[T, typing.List[T]]:
+        n = len(self._data)
+        if isinstance(i, slice):
+            # Which items are in the slice depends on the length.
+            self._len_dependents.register()
+            indices = range(*i.indices(n))
+            for j in indices:
+                self._register_item(j)
+            return [self._data[j] for j in indices]
+
+        if i < 0:
+            # Which item this is depends on the length.
+            self._len_dependents.register()
+            i += n
+        if i < 0:
+            raise IndexError("list index out of range")
+        # Reading an index past the end depends on it being added (while the reader is
+        # using it, as for a missing key of a Dict).
+        self._register_item(i)
+        if i >= n:
+            get_current_context().on_invalidate(
+                functools.partial(self._drop_if_unused, i)
+            )
+        return self._data[i]
+
+    def __iter__(self) -> Iterator[T]:
+        self._len_dependents.register()
+        data = list(self._data)
+        for i in range(len(data)):
+            self._register_item(i)
+        return iter(data)
+
+    def __len__(self) -> int:
+        self._len_dependents.register()
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+    # Writing --------------------------------------------------------------------
+    @overload
+    def __setitem__(self, i: int, value: T) -> None:
+        ...
+
+    @overload
+    def __setitem__(self, i: slice, value: Iterable[T]) -> None:
+        ...
+
+    def __setitem__(self, i: Union[int, slice], value: Any) -> None:
+        if isinstance(i, slice):
+            new = list(self._data)
+            new[i] = value
+            self.set(new)
+            return
+
+        data = self._data
+        if i < 0:
+            i += len(data)
+        old = data[i]
+        if old is value or self._equals(old, value):
+            return
+        data[i] = value
+        with _changing(self):
+            self._invalidate_items(i, i + 1)
+
+    def __delitem__(self, i: Union[int, slice]) -> None:
+        if isinstance(i, slice):
+            new = list(self._data)
+            del new[i]
+            self.set(new)
+            return
+
+        data = self._data
+        old_len = len(data)
+        if i < 0:
+            i += old_len
+        del data[i]
+        with _changing(self, bulk=True):
+            self._invalidate_items(i, old_len)
+            self._resized(old_len)
+
+    def insert(self, index: int, value: T) -> None:
+        data = self._data
+        old_len = len(data)
+        data.insert(index, value)
+        # Same as list.insert()
+        index = min(max(index + old_len if index < 0 else index, 0), old_len)
+        with _changing(self, bulk=True):
+            self._invalidate_items(index, old_len + 1)
+            self._resized(old_len)
+
+    def append(self, value: T) -> None:
+        self.extend((value,))
+
+    def extend(self, values: Iterable[T]) -> None:
+        data = self._data
+        old_len = len(data)
+        data.extend(values)
+        with _changing(self, bulk=True):
+            self._invalidate_items(old_len, len(data))
+            self._resized(old_len)
+
+    def __iadd__(self, values: Iterable[T]) -> "List[T]":
+        self.extend(values)
+        return self
+
+    def pop(self, index: int = -1) -> T:
+        value = self._data[index]
+        del self[index]
+        return value
+
+    def set(self, data: Iterable[T]) -> None:
+        """
+        Replace the contents of the list. Only the indices whose items actually change
+        (and the length, if it changes) are invalidated.
+        """
+        new = list(data)
+        old = self._data
+        old_len = len(old)
+        self._data = new
+        with _changing(self, bulk=True):
+            for i, dependents in list(self._item_dependents.items()):
+                in_old = i < old_len
+                in_new = i < len(new)
+                if in_old != in_new or (
+                    in_old
+                    and not (old[i] is new[i] or self._equals(old[i], new[i]))
+                ):
+                    dependents.invalidate()
+            self._resized(old_len)
+
+    def clear(self) -> None:
+        self.set([])
+
+    def reverse(self) -> None:
+        self.set(reversed(self._data))
+
+    def sort(
+        self, *, key: Optional[Callable[[T], Any]] = None, reverse: bool = False
+    ) -> None:
+        """Sort the list in place, as ``list.sort()``."""
+        self.set(sorted(self._data, key=key, reverse=reverse))  # type: ignore
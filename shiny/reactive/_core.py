@@ -1,20 +1,37 @@
 """Low-level reactive components."""
 
-__all__ = ("isolate", "invalidate_later", "flush", "on_flushed", "get_current_context")
+__all__ = (
+    "isolate",
+    "batch",
+    "invalidate_later",
+    "flush",
+    "on_flushed",
+    "get_current_context",
+)
 
 import asyncio
 import contextlib
 import time
-import traceback
 import typing
 import warnings
 from contextvars import ContextVar
-from typing import TYPE_CHECKING, Awaitable, Callable, Optional, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 from .. import _utils
 from .._datastructures import PriorityQueueFIFO
 from .._docstring import add_example
 from ..types import MISSING, MISSING_TYPE
+from . import _trace
+from ._timers import get_timer_scheduler
 
 if TYPE_CHECKING:
     from ..session import Session
@@ -29,15 +46,44 @@ class ReactiveWarning(RuntimeWarning):
 # By default warnings are shown once; we want to always show them.
 warnings.simplefilter("always", ReactiveWarning)
 
+# Set in threads that run functions for `run_in_executor()` and `poll()`. The reactive
+# graph isn't thread-safe, so reactive values can't be read there.
+_off_loop: ContextVar[bool] = ContextVar("shiny_off_loop", default=False)
+
 
 class Context:
     """A reactive context"""
 
-    def __init__(self) -> None:
+    # Apps can have many thousands of contexts alive at once (one per Calc and Effect,
+    # per session), so they are kept small: slots instead of a __dict__, and lists that
+    # are only allocated when something is added to them.
+    __slots__ = (
+        "id",
+        "_owner",
+        "_domain",
+        "_invalidated",
+        "_invalidate_callbacks",
+        "_flush_callbacks",
+        "_dependencies",
+    )
+
+    def __init__(
+        self, domain: Optional["ReactiveDomain"] = None, owner: object = None
+    ) -> None:
         self.id: int = _reactive_environment.next_id()
+        # The Calc or Effect that this context belongs to (used for tracing).
+        self._owner: object = owner
+        # The domain whose flush queue this context is added to when it needs to be
+        # flushed. Contexts that don't belong to a session use the app-level domain.
+        self._domain: ReactiveDomain = (
+            domain if domain is not None else _reactive_environment.app_domain
+        )
         self._invalidated: bool = False
-        self._invalidate_callbacks: list[Callable[[], None]] = []
-        self._flush_callbacks: list[Callable[[], Awaitable[None]]] = []
+        self._invalidate_callbacks: Optional[List[Callable[[], None]]] = None
+        self._flush_callbacks: Optional[List[Callable[[], Awaitable[None]]]] = None
+        # The Dependents that this context is registered with; it removes itself from
+        # them when it's invalidated.
+        self._dependencies: Optional[List[Dependents]] = None
 
     def __call__(self) -> typing.ContextManager[None]:
         return _reactive_environment.use_context(self)
@@ -51,36 +97,65 @@ class Context:
 
         self._invalidated = True
 
-        for cb in self._invalidate_callbacks:
-            cb()
+        dependencies = self._dependencies
+        if dependencies is not None:
+            self._dependencies = None
+            for dependents in dependencies:
+                dependents._dependents.pop(self.id, None)
 
-        self._invalidate_callbacks.clear()
+        tracer = _trace._tracer
+        if tracer is not None:
+            tracer.record_invalidation(self)
+
+        callbacks = self._invalidate_callbacks
+        if callbacks is None:
+            return
+        self._invalidate_callbacks = None
+
+        if tracer is not None:
+            tracer.push_source(self._owner)
+        try:
+            for cb in callbacks:
+                cb()
+        finally:
+            if tracer is not None:
+                tracer.pop_source()
 
     def on_invalidate(self, func: Callable[[], None]) -> None:
         """Register a function to be called when this context is invalidated"""
         if self._invalidated:
             func()
+        elif self._invalidate_callbacks is None:
+            self._invalidate_callbacks = [func]
         else:
             self._invalidate_callbacks.append(func)
 
     def add_pending_flush(self, priority: int) -> None:
         """Tell the reactive environment that this context should be flushed the
-        next time flushReact() called."""
-        _reactive_environment.add_pending_flush(self, priority)
+        next time its reactive domain is flushed."""
+        self._domain.add_pending_flush(self, priority)
 
     def on_flush(self, func: Callable[[], Awaitable[None]]) -> None:
         """Register a function to be called when this context is flushed."""
-        self._flush_callbacks.append(func)
+        if self._flush_callbacks is None:
+            self._flush_callbacks = [func]
+        else:
+            self._flush_callbacks.append(func)
 
     async def execute_flush_callbacks(self) -> None:
         """Execute all flush callbacks"""
-        for cb in self._flush_callbacks:
+        callbacks = self._flush_callbacks
+        if callbacks is None:
+            return
+        for cb in callbacks:
             await cb()
 
-        self._flush_callbacks.clear()
+        callbacks.clear()
 
 
 class Dependents:
+    __slots__ = ("_dependents",)
+
     def __init__(self) -> None:
         self._dependents: dict[int, Context] = {}
 
@@ -91,42 +166,88 @@ class Dependents:
             # This context is already registered; no need to register it.
             return
 
+        if ctx._invalidated:
+            # Same as registering and then being removed right away.
+            return
+
         self._dependents[ctx.id] = ctx
+        # Rather than adding an invalidation callback (a new closure for every
+        # registration), the context keeps track of what it's registered with and
+        # removes itself when it's invalidated.
+        if ctx._dependencies is None:
+            ctx._dependencies = [self]
+        else:
+            ctx._dependencies.append(self)
 
-        def on_invalidate_cb() -> None:
-            if ctx.id in self._dependents:
-                del self._dependents[ctx.id]
+    def invalidate(self) -> None:
+        dependents = self._dependents
+        if not dependents:
+            return
 
-        ctx.on_invalidate(on_invalidate_cb)
+        deferred = _reactive_environment._batch.get()
+        if deferred is not None:
+            # Inside of `with batch()`; the dependents are invalidated when the batch
+            # ends.
+            _reactive_environment._defer_invalidation(deferred, self)
+            return
 
-    def invalidate(self) -> None:
         # TODO: Check sort order
         # Invalidate all dependents. This gets all the dependents as list, then iterates
         # over the list. It's done this way instead of iterating over keys because it's
         # possible that a dependent is removed from the dict while iterating over it.
         # https://github.com/rstudio/py-shiny/issues/26
-        ids = sorted(self._dependents.keys())
-        for dep_ctx in [self._dependents[id] for id in ids]:
-            dep_ctx.invalidate()
+        if len(dependents) == 1:
+            contexts = list(dependents.values())
+        else:
+            contexts = [dependents[id] for id in sorted(dependents.keys())]
+        _reactive_environment._invalidate_contexts(contexts)
 
 
-class ReactiveEnvironment:
-    """The reactive environment"""
+class ReactiveDomain:
+    """
+    A reactive domain: the unit of locking and flushing in the reactive graph.
 
-    def __init__(self) -> None:
-        self._current_context: ContextVar[Optional[Context]] = ContextVar(
-            "current_context", default=None
-        )
-        self._next_id: int = 0
+    Each session owns a domain, and there is one app-level domain for reactive objects
+    that don't belong to any session. Effects are queued on the domain they belong to,
+    so flushing one session's domain (and awaiting inside its effects) doesn't block
+    input handling for other sessions.
+    """
+
+    def __init__(
+        self,
+        request_flush: Optional[Callable[[], None]] = None,
+        name: Optional[str] = None,
+        *,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        time_slice: Optional[float] = None,
+    ) -> None:
+        # The id of the session that owns this domain (None for the app domain)
+        self.name: Optional[str] = name
+        # If True, pending contexts with the same priority are flushed concurrently,
+        # at most `max_concurrency` at a time.
+        self.concurrent: bool = concurrent
+        self.max_concurrency: Optional[int] = max_concurrency
+        # If not None, a flush yields to the event loop whenever it has run for this
+        # many seconds without doing so, so that a long flush doesn't keep the server
+        # from handling other requests.
+        self.time_slice: Optional[float] = time_slice
+        self._time_slice_end: float = 0
+        # Set when the owner of the domain has gone away.
+        self.closed: bool = False
         self._pending_flush_queue: PriorityQueueFIFO[Context] = PriorityQueueFIFO()
         self._lock: Optional[asyncio.Lock] = None
         self._flushed_callbacks = _utils.AsyncCallbacks()
+        # Called when work is added to this domain by someone who doesn't hold its
+        # lock (e.g., an app-level Value invalidating one of this session's effects),
+        # so that the owner of the domain can schedule a flush.
+        self._request_flush: Optional[Callable[[], None]] = request_flush
 
     @property
     def lock(self) -> asyncio.Lock:
         """
-        Lock that protects this ReactiveEnvironment. It must be lazily created, because
-        at the time the module is loaded, there generally isn't a running asyncio loop
+        Lock that protects this ReactiveDomain. It must be lazily created, because at
+        the time the module is loaded, there generally isn't a running asyncio loop
         yet. This causes the asyncio.Lock to be created with a different loop than it
         will be invoked from later; when that happens, acquire() will succeed if there's
         no contention, but throw a "hey you're on the wrong loop" error if there is.
@@ -137,6 +258,166 @@ class ReactiveEnvironment:
             self._lock = asyncio.Lock()
         return self._lock
 
+    def is_locked(self) -> bool:
+        return self._lock is not None and self._lock.locked()
+
+    def has_pending_flush(self) -> bool:
+        return not self._pending_flush_queue.empty()
+
+    def pending_flush_count(self) -> int:
+        """Return the number of contexts waiting to be flushed (the queue depth)."""
+        return self._pending_flush_queue.qsize()
+
+    def on_flushed(
+        self, func: Callable[[], Awaitable[None]], once: bool = False
+    ) -> Callable[[], None]:
+        return self._flushed_callbacks.register(func, once=once)
+
+    async def flush(self) -> None:
+        """Flush all pending operations in this domain"""
+        while True:
+            await self._flush_once()
+            # Work that was added while the flushed callbacks ran (e.g. by another
+            # session while this one was sending its values) didn't request a flush,
+            # since the lock was held, so it has to be picked up before returning.
+            if self._pending_flush_queue.empty():
+                break
+
+    async def _flush_once(self) -> None:
+        tracer = _trace._tracer
+        if tracer is not None:
+            trace_started = tracer.flush_started(self)
+        self._start_time_slice()
+        while True:
+            # Work in the app-level domain (e.g. a top-level Effect invalidated by this
+            # session setting a shared Value) is run along with the session's flush.
+            await self._flush_app_domain()
+            if self._pending_flush_queue.empty():
+                break
+            if self.concurrent:
+                await self._flush_concurrent()
+            else:
+                await self._flush_sequential()
+        _reactive_environment._domains_needing_flush.pop(id(self), None)
+        if tracer is not None:
+            tracer.flush_finished(self, trace_started)  # pyright: ignore
+        await self._flushed_callbacks.invoke()
+
+    async def _flush_sequential(self) -> None:
+        # Sequential flush: instead of storing the tasks in a list and calling gather()
+        # on them later, just run each effect in sequence.
+        while not self._pending_flush_queue.empty():
+            await self._yield_if_time_slice_used()
+            ctx = self._pending_flush_queue.get()
+            await ctx.execute_flush_callbacks()
+
+    async def _flush_concurrent(self) -> None:
+        # Concurrent flush: run all of the pending contexts with the highest priority
+        # at the same time, and wait for all of them to finish before moving on to the
+        # next priority level. Contexts are started in the order they were queued.
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency)
+            if self.max_concurrency is not None
+            else None
+        )
+
+        async def run(ctx: Context) -> None:
+            await self._yield_if_time_slice_used()
+            if semaphore is None:
+                await ctx.execute_flush_callbacks()
+            else:
+                async with semaphore:
+                    await ctx.execute_flush_callbacks()
+
+        queue = self._pending_flush_queue
+        while not queue.empty():
+            priority = queue.peek_priority()
+            level: List[Context] = []
+            while not queue.empty() and queue.peek_priority() == priority:
+                level.append(queue.get())
+
+            # An error in one context doesn't stop the others from running (Effects
+            # handle their own errors, so this is just a safeguard); the first one is
+            # raised once they have all finished, as with a sequential flush.
+            results = await asyncio.gather(
+                *(run(ctx) for ctx in level), return_exceptions=True
+            )
+            for res in results:
+                if isinstance(res, BaseException):
+                    raise res
+
+    def _start_time_slice(self) -> None:
+        if self.time_slice is not None:
+            self._time_slice_end = time.perf_counter() + self.time_slice
+
+    async def _yield_if_time_slice_used(self) -> None:
+        # The lock is still held while yielding, so this session's inputs wait until the
+        # flush is done (as they would if an effect awaited something); other sessions,
+        # and HTTP requests, can be handled in the meantime.
+        if self.time_slice is None or time.perf_counter() < self._time_slice_end:
+            return
+        await _utils.yield_event_loop()
+        self._start_time_slice()
+
+    async def _flush_app_domain(self) -> None:
+        app_domain = _reactive_environment.app_domain
+        if self is app_domain or not app_domain.has_pending_flush():
+            return
+        async with app_domain.lock:
+            await app_domain.flush()
+
+    def add_pending_flush(self, ctx: Context, priority: int) -> None:
+        self._pending_flush_queue.put(priority, ctx)
+        _reactive_environment._domains_needing_flush[id(self)] = self
+        if _trace._tracer is not None:
+            _trace._tracer.record_schedule(self)
+        if self._request_flush is not None and not self.is_locked():
+            self._request_flush()
+
+    def remove_pending_flush(self, ctx: Context) -> bool:
+        """Remove a context from the flush queue. Returns ``True`` if it was queued."""
+        return self._pending_flush_queue.remove(ctx)
+
+    def set_pending_flush_priority(self, ctx: Context, priority: int) -> bool:
+        """Change the priority of a queued context. Returns ``True`` if it was
+        queued."""
+        return self._pending_flush_queue.set_priority(ctx, priority)
+
+    def close(self) -> None:
+        """Drop any pending work; called when the owner of the domain goes away."""
+        self.closed = True
+        _reactive_environment._domains_needing_flush.pop(id(self), None)
+        self._pending_flush_queue = PriorityQueueFIFO()
+
+
+_Deferred = Dict[int, typing.Tuple[Dependents, Optional[_trace.Node]]]
+
+
+class ReactiveEnvironment:
+    """The reactive environment"""
+
+    def __init__(self) -> None:
+        self._current_context: ContextVar[Optional[Context]] = ContextVar(
+            "current_context", default=None
+        )
+        self._next_id: int = 0
+        self.app_domain: ReactiveDomain = ReactiveDomain()
+        # Domains that have pending work; used by the top-level flush() so that tests
+        # and interactive use can run everything that's pending.
+        self._domains_needing_flush: Dict[int, ReactiveDomain] = {}
+        # Inside of `with batch()`, the Dependents whose invalidation has been deferred
+        # until the outermost batch ends (along with the node that caused it, when
+        # tracing). This is a ContextVar so that a batch that awaits in one session
+        # doesn't defer the invalidations of other sessions.
+        self._batch: ContextVar[Optional[_Deferred]] = ContextVar(
+            "batch", default=None
+        )
+        # While invalidation is being propagated, the contexts that are waiting to be
+        # invalidated and, when tracing, the nodes that caused it; see
+        # _invalidate_contexts().
+        self._invalidation_stack: Optional[List[Context]] = None
+        self._invalidation_sources: Optional[List[Optional[_trace.Node]]] = None
+
     def next_id(self) -> int:
         """Return the next available id"""
         id = self._next_id
@@ -155,28 +436,109 @@ class ReactiveEnvironment:
         """Return the current Context object"""
         ctx = self._current_context.get()
         if ctx is None:
+            if _off_loop.get():
+                raise RuntimeError(
+                    "Reactive values can't be read from a function that's run in an "
+                    "executor. Read them in a reactive function, and pass them in with "
+                    "`reactive.run_in_executor()`."
+                )
             raise RuntimeError("No current reactive context")
         return ctx
 
-    def on_flushed(
-        self, func: Callable[[], Awaitable[None]], once: bool = False
-    ) -> Callable[[], None]:
-        return self._flushed_callbacks.register(func, once=once)
+    def current_domain(self) -> ReactiveDomain:
+        """Return the reactive domain of the current session, or the app domain"""
+        from ..session import get_current_session
+
+        return session_domain(get_current_session())
 
     async def flush(self) -> None:
-        """Flush all pending operations"""
-        await self._flush_sequential()
-        await self._flushed_callbacks.invoke()
+        """Flush the app domain and every domain with pending operations"""
+        await self.app_domain.flush()
+        while self._domains_needing_flush:
+            _, domain = self._domains_needing_flush.popitem()
+            await domain.flush()
+
+    def _invalidate_contexts(self, contexts: List[Context]) -> None:
+        # Invalidating a Calc's context invalidates the Calc's dependents, and so on
+        # down the graph. Rather than doing that recursively (which, for a long chain of
+        # Calcs, can exceed the recursion limit), the contexts are pushed onto a stack
+        # which is drained by the outermost call. Since the most recently pushed
+        # contexts are invalidated first, the order is the same as it would be if this
+        # were recursive (depth-first, each context's dependents in order of id).
+        # Contexts that are reachable by more than one path are only invalidated once,
+        # since invalidating a context a second time does nothing.
+        contexts.reverse()
+        tracer = _trace._tracer
+
+        stack = self._invalidation_stack
+        if stack is not None:
+            stack.extend(contexts)
+            sources = self._invalidation_sources
+            if sources is not None:
+                source = tracer.current_source() if tracer is not None else None
+                sources.extend([source] * len(contexts))
+            return
 
-    async def _flush_sequential(self) -> None:
-        # Sequential flush: instead of storing the tasks in a list and calling gather()
-        # on them later, just run each effect in sequence.
-        while not self._pending_flush_queue.empty():
-            ctx = self._pending_flush_queue.get()
-            await ctx.execute_flush_callbacks()
+        self._invalidation_stack = stack = contexts
+        try:
+            if tracer is None:
+                while stack:
+                    stack.pop().invalidate()
+                return
 
-    def add_pending_flush(self, ctx: Context, priority: int) -> None:
-        self._pending_flush_queue.put(priority, ctx)
+            self._invalidation_sources = sources = [tracer.current_source()] * len(
+                contexts
+            )
+            while stack:
+                ctx = stack.pop()
+                source = sources.pop()
+                if source is None:
+                    ctx.invalidate()
+                    continue
+                tracer.push_node(source)
+                try:
+                    ctx.invalidate()
+                finally:
+                    tracer.pop_source()
+        finally:
+            self._invalidation_stack = None
+            self._invalidation_sources = None
+
+    def _defer_invalidation(self, deferred: _Deferred, dependents: Dependents) -> None:
+        if id(dependents) in deferred:
+            return
+        tracer = _trace._tracer
+        source = tracer.current_source() if tracer is not None else None
+        deferred[id(dependents)] = (dependents, source)
+
+    @contextlib.contextmanager
+    def batch(self) -> typing.Generator[None, None, None]:
+        if self._batch.get() is not None:
+            # Nested batch; invalidation happens when the outermost one exits.
+            yield
+            return
+        deferred: _Deferred = {}
+        token = self._batch.set(deferred)
+        try:
+            yield
+        finally:
+            self._batch.reset(token)
+            self._run_deferred_invalidations(deferred)
+
+    def _run_deferred_invalidations(self, deferred: _Deferred) -> None:
+        # Invalidating a context removes it from all of the Dependents it is registered
+        # with, so a context that depends on several of the values that were set is
+        # only visited once here.
+        tracer = _trace._tracer
+        for dependents, source in deferred.values():
+            if tracer is None or source is None:
+                dependents.invalidate()
+                continue
+            tracer.push_node(source)
+            try:
+                dependents.invalidate()
+            finally:
+                tracer.pop_source()
 
     @contextlib.contextmanager
     def isolate(self):
@@ -190,6 +552,14 @@ class ReactiveEnvironment:
 _reactive_environment = ReactiveEnvironment()
 
 
+def session_domain(session: Optional["Session"]) -> ReactiveDomain:
+    """Return the reactive domain owned by `session`, or the app-level domain if
+    `session` is ``None``."""
+    if session is None:
+        return _reactive_environment.app_domain
+    return session._reactive_domain
+
+
 @add_example()
 @contextlib.contextmanager
 def isolate():
@@ -220,6 +590,41 @@ def isolate():
         yield
 
 
+@contextlib.contextmanager
+def batch() -> typing.Generator[None, None, None]:
+    """
+    Batch changes to reactive values.
+
+    Normally, setting a :class:`~shiny.reactive.Value` immediately invalidates
+    everything that depends on it. Inside of ``with batch():``, invalidation is deferred
+    until the block exits, and then all of the dependents of the values that were set
+    are invalidated together, each just once. This way, invalidation callbacks never
+    observe a partially applied set of changes.
+
+    Batches can be nested; invalidation happens when the outermost batch exits.
+
+    Returns
+    -------
+    A context manager.
+
+    Note
+    ----
+    Because invalidation is deferred, reading a :func:`~shiny.reactive.Calc` inside of
+    the batch may return a value calculated from the values as they were before the
+    batch.
+
+    Example
+    -------
+    .. code-block:: python
+
+        with reactive.batch():
+            x.set(1)
+            y.set(2)
+    """
+    with _reactive_environment.batch():
+        yield
+
+
 def get_current_context() -> Context:
     """
     Get the current reactive context.
@@ -240,6 +645,9 @@ async def flush() -> None:
     """
     Run any pending invalidations (i.e., flush the reactive environment).
 
+    This flushes the app-level reactive domain, as well as the domain of every session
+    that has pending invalidations.
+
     Warning
     -------
     This function shouldn't ever need to be called inside a Shiny app. It's only
@@ -254,6 +662,9 @@ def on_flushed(
     """
     Register a function to be called when the reactive environment is flushed
 
+    The function is registered with the current session's reactive domain (or with the
+    app-level domain, if there is no current session).
+
     Parameters
     ----------
     func
@@ -270,12 +681,17 @@ def on_flushed(
     flush
     """
 
-    return _reactive_environment.on_flushed(func, once)
+    return _reactive_environment.current_domain().on_flushed(func, once)
 
 
 def lock() -> asyncio.Lock:
-    """A lock that should be held whenever manipulating the reactive graph."""
-    return _reactive_environment.lock
+    """
+    A lock that should be held whenever manipulating the reactive graph.
+
+    This is the lock of the current session's reactive domain (or of the app-level
+    domain, if there is no current session).
+    """
+    return _reactive_environment.current_domain().lock
 
 
 @add_example()
@@ -310,53 +726,11 @@ def invalidate_later(
         # could be None if outside of a session).
         session = get_current_session()
 
-    ctx = get_current_context()
-    # Pass an absolute time to our subtask, rather than passing the delay directly, in
-    # case the subtask doesn't get a chance to start sleeping until a significant amount
-    # of time has passed.
-    deadline = time.monotonic() + delay
-
-    cancellable = True
-    # unsub is used to unsubscribe from session.on_ended when time expires. We don't
-    # want a ton of event handler registrations sitting there uselessly, keeping object
-    # graphs from being gc'd.
-    unsub: Optional[Callable[[], None]] = None
-
-    async def _task(ctx: Context, deadline: float):
-        nonlocal cancellable
-        try:
-            delay = deadline - time.monotonic()
-            try:
-                await asyncio.sleep(delay)
-            except asyncio.CancelledError:
-                # This happens when cancel_task is called due to the session ending, or
-                # the context being invalidated due to some other reason. There's no
-                # reason for us to keep waiting at that point, as ctx.invalidate() can
-                # only be a no-op.
-                return
-
-            async with lock():
-                # Prevent the ctx.invalidate() from killing our own task. (Another way
-                # to accomplish this is to unregister our ctx.on_invalidate handler, but
-                # ctx.on_invalidate doesn't currently allow unregistration.)
-                cancellable = False
-
-                ctx.invalidate()
-                await flush()
-
-        except BaseException:
-            traceback.print_exc()
-            raise
-        finally:
-            if unsub:
-                unsub()
-
-    task = asyncio.create_task(_task(ctx, deadline))
-
-    def cancel_task():
-        if cancellable and not task.cancelled():
-            task.cancel()
-
-    ctx.on_invalidate(cancel_task)
-    if session:
-        unsub = session.on_ended(cancel_task)
+    # Rather than each call creating a task that sleeps until the deadline, timers are
+    # kept by a shared scheduler, which also takes care of not firing them if the
+    # context has already been invalidated or the session has ended.
+    get_timer_scheduler().schedule(
+        get_current_context(),
+        delay,
+        session._reactive_domain if session is not None else None,
+    )
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import functools
+import glob
 import os
-from operator import eq
+import warnings
+from abc import ABC, abstractmethod
+from operator import eq, is_
 from typing import (
     TYPE_CHECKING,
     Any,
     Awaitable,
     Callable,
+    Dict,
+    Hashable,
+    List,
     Optional,
+    Set,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -16,7 +25,9 @@ from typing import (
 
 from .. import _utils, reactive
 from .._docstring import add_example
+from .._executor import ExecutorArg, resolve_executor, submit
 from ..types import MISSING, MISSING_TYPE
+from ._core import ReactiveWarning, session_domain
 
 if TYPE_CHECKING:
     from ..session import Session
@@ -25,6 +36,12 @@ __all__ = ("poll", "file_reader")
 
 T = TypeVar("T")
 
+# The values holding the latest result of poll_func (or error), and the effect that
+# updates them.
+_Poller = Tuple[
+    "reactive.Value[Any]", "reactive.Value[Optional[Exception]]", "reactive.Effect_"
+]
+
 
 @add_example()
 def poll(
@@ -34,6 +51,9 @@ def poll(
     equals: Callable[[Any, Any], bool] = eq,
     priority: int = 0,
     session: Union[MISSING_TYPE, "Session", None] = MISSING,
+    share_key: Optional[Hashable] = None,
+    executor: Optional[ExecutorArg] = None,
+    timeout_secs: Optional[float] = None,
 ) -> Callable[[Callable[[], T]], Callable[[], T]]:
     """
     Create a reactive polling object.
@@ -89,6 +109,23 @@ def poll(
         :func:`~shiny.session.get_current_session`. If there is no current session (i.e.
         `poll` is being created outside of the server function), the lifetime of this
         reactive poll object will not be tied to any specific session.
+    share_key
+        If provided, all of the polling objects created with the same `share_key` (for
+        example, one per session, when `poll` is used in the server function) share a
+        single polling loop, so `poll_func` is called once per interval for the whole
+        process rather than once per session. The first polling object created with a
+        given key determines `poll_func`, `interval_secs`, and the other polling
+        options. The loop stops once all of the sessions that use it have ended.
+    executor
+        If provided, a synchronous `poll_func` is run off of the event loop, so that a
+        slow data source doesn't block other sessions. This can be ``"thread"`` or
+        ``"process"`` (to use a shared thread or process pool), or a
+        :class:`concurrent.futures.Executor`.
+    timeout_secs
+        The maximum number of seconds to wait for `poll_func`. If it takes longer, the
+        data source is treated as unchanged for this interval; the call isn't cancelled,
+        and the next poll waits for it to finish (rather than starting another one).
+        Requires `executor` or an async `poll_func`.
 
     Returns
     -------
@@ -103,66 +140,37 @@ def poll(
     ~shiny.reactive.file_reader
     """
 
-    with reactive.isolate():
-        last_value: reactive.Value[Any] = reactive.Value(poll_func())
-        last_error: reactive.Value[Optional[Exception]] = reactive.Value(None)
-
-    @reactive.Effect(priority=priority, session=session)
-    async def _():
-        try:
-            if _utils.is_async_callable(poll_func):
-                new = await poll_func()
-            else:
-                new = poll_func()
-
-            with reactive.isolate():
-                old = last_value.get()
-
-            try:
-                is_equal = equals(old, new)
-            except Exception as e:
-                # For example, pandas DataFrame throws if you try to compare it to a
-                # non-comparable object
-                raise TypeError(
-                    "The reactive.poll polling function returned an object that "
-                    "couldn't be compared with a previously returned object. Try "
-                    "modifying your polling function to return a simpler type, like a "
-                    "str, float, list, or dict."
-                ) from e
-            if not isinstance(is_equal, bool):
-                # Comparison succeeded, but we don't understand the result
-                if equals is eq:
-                    # We used == but it didn't work
-                    raise TypeError(
-                        "The reactive.poll polling function returned an object "
-                        "that doesn't implement a simple == operator. Try "
-                        "modifying your polling function to return a simpler type, "
-                        "like a str, float, list, or dict."
-                    )
-                else:
-                    # The caller passed in a custom function
-                    raise TypeError(
-                        "The reactive.poll `equals` function returned a non-bool "
-                        "value"
-                    )
-
-            # If we got here, the comparison succeeded. Need to make sure the error is
-            # cleared, but don't unnecessarily call last_error.set(); at the time of
-            # this writing, we haven't made a final decision on whether reactive.Value
-            # will ignore sets if the new value is identical to the existing one.
-            with reactive.isolate():
-                if last_error.get() is not None:
-                    last_error.set(None)
-
-            if not is_equal:
-                last_value.set(new)
-        except Exception as e:
-            # Either the polling function threw an error, or we failed to compare its
-            # result with a previous result. Either way, we failed; save the error so
-            # that it can be exposed to whoever's trying to use the poll object.
-            last_error.set(e)
-        finally:
-            reactive.invalidate_later(interval_secs)
+    if executor is not None:
+        if _utils.is_async_callable(poll_func):
+            raise TypeError("`executor` can only be used with a synchronous poll_func.")
+        resolve_executor(executor)
+    if (
+        timeout_secs is not None
+        and executor is None
+        and not _utils.is_async_callable(poll_func)
+    ):
+        raise ValueError(
+            "`timeout_secs` requires `executor` or an async `poll_func`; a synchronous "
+            "poll_func that runs on the event loop can't be interrupted."
+        )
+
+    def create_poller(session: Union[MISSING_TYPE, "Session", None]) -> _Poller:
+        return _create_poller(
+            poll_func,
+            interval_secs,
+            equals=equals,
+            priority=priority,
+            session=session,
+            executor=executor,
+            timeout_secs=timeout_secs,
+        )
+
+    if share_key is None:
+        last_value, last_error, _ = create_poller(session)
+    else:
+        last_value, last_error = _subscribe_shared_poller(
+            share_key, create_poller, session
+        )
 
     def wrapper(fn: Callable[[], T]) -> Callable[[], T]:
         if _utils.is_async_callable(fn):
@@ -209,6 +217,200 @@ def poll(
     return wrapper
 
 
+def _create_poller(
+    poll_func: Union[Callable[[], Any], Callable[[], Awaitable[Any]]],
+    interval_secs: float,
+    *,
+    equals: Callable[[Any, Any], bool],
+    priority: int,
+    session: Union[MISSING_TYPE, "Session", None],
+    executor: Optional[ExecutorArg],
+    timeout_secs: Optional[float],
+) -> _Poller:
+    # Creates the values that hold the most recent poll_func result (or error), and
+    # the effect that updates them.
+
+    with reactive.isolate():
+        # poll_func results are compared with `equals` below, so the Value itself
+        # should only compare by identity. When poll_func is async or run in an
+        # executor, it isn't run here (since it can't be awaited, or would block); the
+        # value is set by the first poll.
+        sync = executor is None and not _utils.is_async_callable(poll_func)
+        last_value: reactive.Value[Any] = reactive.Value(
+            poll_func() if sync else MISSING, equals=is_
+        )
+        last_error: reactive.Value[Optional[Exception]] = reactive.Value(None)
+
+    # A call to poll_func (in the executor, or as a task) that timed out, and hasn't
+    # finished yet.
+    in_flight: Optional[asyncio.Future[Any]] = None
+
+    async def call_poll_func() -> Any:
+        nonlocal in_flight
+        if executor is None and timeout_secs is None:
+            if not _utils.is_async_callable(poll_func):
+                return poll_func()
+            return await poll_func()
+
+        if in_flight is None:
+            if executor is None:
+                in_flight = asyncio.ensure_future(poll_func())
+            else:
+                in_flight = asyncio.wrap_future(
+                    submit(cast(Callable[[], Any], poll_func), executor)
+                )
+        # Shield the call so that timing out doesn't cancel it; the next poll waits for
+        # it some more, instead of starting another one.
+        try:
+            res = await asyncio.wait_for(asyncio.shield(in_flight), timeout_secs)
+        except asyncio.TimeoutError:
+            raise
+        except BaseException:
+            in_flight = None
+            raise
+        in_flight = None
+        return res
+
+    @reactive.Effect(priority=priority, session=session)
+    async def effect():
+        try:
+            try:
+                new = await call_poll_func()
+            except asyncio.TimeoutError:
+                # Treat the data source as unchanged
+                return
+
+            with reactive.isolate():
+                old = last_value.get() if last_value.is_set() else MISSING
+
+            if isinstance(old, MISSING_TYPE):
+                # The first poll, when poll_func is async or run in an executor
+                is_equal = False
+            else:
+                try:
+                    is_equal = equals(old, new)
+                except Exception as e:
+                    # For example, pandas DataFrame throws if you try to compare it to a
+                    # non-comparable object
+                    raise TypeError(
+                        "The reactive.poll polling function returned an object "
+                        "that couldn't be compared with a previously returned object. "
+                        "Try modifying your polling function to return a simpler "
+                        "type, like a str, float, list, or dict."
+                    ) from e
+                if not isinstance(is_equal, bool):
+                    # Comparison succeeded, but we don't understand the result
+                    if equals is eq:
+                        # We used == but it didn't work
+                        raise TypeError(
+                            "The reactive.poll polling function returned an object "
+                            "that doesn't implement a simple == operator. Try "
+                            "modifying your polling function to return a simpler type, "
+                            "like a str, float, list, or dict."
+                        )
+                    else:
+                        # The caller passed in a custom function
+                        raise TypeError(
+                            "The reactive.poll `equals` function returned a non-bool "
+                            "value"
+                        )
+
+            # If we got here, the comparison succeeded. Need to make sure the error is
+            # cleared, but don't unnecessarily call last_error.set(); at the time of
+            # this writing, we haven't made a final decision on whether reactive.Value
+            # will ignore sets if the new value is identical to the existing one.
+            with reactive.isolate():
+                if last_error.get() is not None:
+                    last_error.set(None)
+
+            if not is_equal:
+                last_value.set(new)
+        except Exception as e:
+            # Either the polling function threw an error, or we failed to compare its
+            # result with a previous result. Either way, we failed; save the error so
+            # that it can be exposed to whoever's trying to use the poll object.
+            last_error.set(e)
+        finally:
+            reactive.invalidate_later(interval_secs)
+
+    return last_value, last_error, effect
+
+
+class _SessionShared(ABC):
+    """
+    Something that is shared by sessions, and stopped once all of them have ended.
+    """
+
+    def __init__(self) -> None:
+        # Ids of the sessions that use this object. An object that was created or used
+        # outside of a session is never stopped.
+        self.session_ids: Set[str] = set()
+        self.permanent: bool = False
+
+    def subscribe(self, session: Optional["Session"]) -> None:
+        if session is None:
+            self.permanent = True
+            return
+        if session.id in self.session_ids:
+            return
+        self.session_ids.add(session.id)
+        session.on_ended(functools.partial(self._unsubscribe, session.id))
+
+    def _unsubscribe(self, session_id: str) -> None:
+        self.session_ids.discard(session_id)
+        if not self.session_ids and not self.permanent:
+            self._stop()
+
+    @abstractmethod
+    def _stop(self) -> None:
+        ...
+
+
+class _SharedPoller(_SessionShared):
+    def __init__(
+        self,
+        key: Hashable,
+        last_value: reactive.Value[Any],
+        last_error: reactive.Value[Optional[Exception]],
+        effect: reactive.Effect_,
+    ) -> None:
+        self.key = key
+        self.last_value = last_value
+        self.last_error = last_error
+        self.effect = effect
+        super().__init__()
+
+    def _stop(self) -> None:
+        self.effect.destroy()
+        if _shared_pollers.get(self.key) is self:
+            del _shared_pollers[self.key]
+
+
+_shared_pollers: Dict[Hashable, _SharedPoller] = {}
+
+
+def _subscribe_shared_poller(
+    key: Hashable,
+    create_poller: Callable[[Union[MISSING_TYPE, "Session", None]], _Poller],
+    session: Union[MISSING_TYPE, "Session", None],
+) -> Tuple[reactive.Value[Any], reactive.Value[Optional[Exception]]]:
+    if isinstance(session, MISSING_TYPE):
+        from ..session import get_current_session
+
+        session = get_current_session()
+
+    poller = _shared_pollers.get(key)
+    if poller is None:
+        # The polling effect doesn't belong to any session, since it outlives the
+        # session that happens to create it.
+        last_value, last_error, effect = create_poller(None)
+        poller = _SharedPoller(key, last_value, last_error, effect)
+        _shared_pollers[key] = poller
+
+    poller.subscribe(session)
+    return poller.last_value, poller.last_error
+
+
 @add_example()
 def file_reader(
     filepath: Union[
@@ -218,6 +420,8 @@ def file_reader(
     *,
     priority: int = 1,
     session: Union[MISSING_TYPE, "Session", None] = MISSING,
+    share_key: Optional[Hashable] = None,
+    watch: bool = False,
 ) -> Callable[[Callable[[], T]], Callable[[], T]]:
     """
     Create a reactive file reader.
@@ -228,7 +432,10 @@ def file_reader(
     This makes it incredibly easy to write apps that automatically update all of their
     outputs as soon as files on disk change.
 
-    Note that `file_reader` works only on single files, not directories of files.
+    Instead of a single file, `filepath` can also be a directory (in which case a change
+    to any file in it, or in its subdirectories, counts) or a glob pattern like
+    ``"data/*.csv"`` (in which case a change to, or the addition or removal of, any
+    matching file counts).
 
     Both the `filepath` function and the decorated (file reading) function can read
     reactive values and ~shiny.reactive.Calc objects. Any invalidations triggered by
@@ -246,7 +453,8 @@ def file_reader(
         error and close the session.
 
         If a function is used, make sure it is high performance (or is cached, i.e. use
-        a ~shiny.reactive.Calc), as it will be called very frequently.
+        a ~shiny.reactive.Calc), as it will be called very frequently. (A function
+        can't be used with ``watch=True``.)
     interval_secs
         The number of seconds to wait after each time the file metadata is checked.
         Note: depending on what other tasks are executing, the actual wait time may far
@@ -264,6 +472,19 @@ def file_reader(
         :func:`~shiny.session.get_current_session`. If there is no current session (i.e.
         `poll` is being created outside of the server function), the lifetime of this
         reactive poll object will not be tied to any specific session.
+    share_key
+        If provided, all of the file readers created with the same `share_key` (for
+        example, one per session) share a single polling loop, so the file is checked
+        once per interval for the whole process rather than once per session. See
+        :func:`~shiny.reactive.poll`.
+    watch
+        If ``True``, use the operating system's file change notifications (via the
+        `watchfiles` package) instead of checking the file every `interval_secs`, so
+        that changes are picked up right away without constantly calling ``stat()``.
+        All of the file readers that watch the same path share a single watcher, which
+        stops once all of the sessions that use it have ended. If `watchfiles` isn't
+        installed, or notifications can't be used for the path, the watcher checks the
+        file every `interval_secs` instead (with a warning).
 
     Returns
     -------
@@ -278,6 +499,9 @@ def file_reader(
     ~shiny.reactive.poll
     """
 
+    if watch and isinstance(filepath, (str, os.PathLike)):
+        return _watched_file_reader(os.fspath(filepath), interval_secs, session)
+
     if isinstance(filepath, str):
         # Normalize filepath so it's always a function
 
@@ -296,8 +520,7 @@ def file_reader(
         filepath = filepath_func_pathlike
 
     def check_timestamp():
-        path = filepath()
-        return (path, os.path.getmtime(path), os.path.getsize(path))
+        return _file_signature(os.fspath(filepath()))
 
     def wrapper(fn: Callable[[], T]) -> Callable[[], T]:
         if _utils.is_async_callable(fn):
@@ -307,6 +530,7 @@ def file_reader(
                 interval_secs=interval_secs,
                 priority=priority,
                 session=session,
+                share_key=share_key,
             )
             @functools.wraps(fn)
             async def reader_async():
@@ -321,6 +545,7 @@ def file_reader(
                 interval_secs=interval_secs,
                 priority=priority,
                 session=session,
+                share_key=share_key,
             )
             @functools.wraps(fn)
             def reader():
@@ -329,3 +554,186 @@ def file_reader(
             return reader
 
     return wrapper
+
+
+def _file_signature(path: str) -> Tuple[object, ...]:
+    # Something that changes whenever the file at `path` (or any file in the directory,
+    # or matching the glob pattern, at `path`) changes.
+    if os.path.isdir(path):
+        paths = sorted(
+            os.path.join(dirpath, filename)
+            for dirpath, _, filenames in os.walk(path)
+            for filename in filenames
+        )
+    elif glob.has_magic(path):  # pyright: ignore[reportGeneralTypeIssues]
+        paths = sorted(glob.glob(path, recursive=True))
+    else:
+        # A single file; raises an error if it doesn't exist
+        return (path, os.path.getmtime(path), os.path.getsize(path))
+
+    sig: List[Tuple[str, float, int]] = []
+    for p in paths:
+        try:
+            sig.append((p, os.path.getmtime(p), os.path.getsize(p)))
+        except OSError:
+            # Removed since it was listed
+            pass
+    return tuple(sig)
+
+
+def _watchfiles() -> Any:
+    try:
+        import watchfiles  # pyright: ignore[reportMissingImports]
+    except ImportError:
+        return None
+    return watchfiles  # pyright: ignore[reportUnknownVariableType]
+
+
+def _watched_file_reader(
+    path: str,
+    interval_secs: float,
+    session: Union[MISSING_TYPE, "Session", None],
+) -> Callable[[Callable[[], T]], Callable[[], T]]:
+    if isinstance(session, MISSING_TYPE):
+        from ..session import get_current_session
+
+        session = get_current_session()
+
+    path = os.path.abspath(path)
+    watcher = _file_watchers.get(path)
+    if watcher is None:
+        watcher = _file_watchers[path] = _FileWatcher(path, interval_secs)
+    watcher.subscribe(session)
+
+    def wrapper(fn: Callable[[], T]) -> Callable[[], T]:
+        if _utils.is_async_callable(fn):
+            fn_async = cast(Callable[[], Awaitable[T]], fn)
+
+            @reactive.Calc(session=session)
+            @functools.wraps(fn)
+            async def reader_async() -> T:
+                watcher.start()
+                watcher.version.get()
+                return await fn_async()
+
+            # See poll() for explanation of why this cast is needed.
+            return cast(Callable[[], T], reader_async)
+
+        @reactive.Calc(session=session)
+        @functools.wraps(fn)
+        def reader() -> T:
+            watcher.start()
+            watcher.version.get()
+            return fn()
+
+        return reader
+
+    return wrapper
+
+
+class _FileWatcher(_SessionShared):
+    """
+    Watches a file, directory, or glob pattern for changes, and increments `version`
+    when there is one.
+    """
+
+    def __init__(self, path: str, interval_secs: float) -> None:
+        self.path = path
+        self.interval_secs = interval_secs
+        with reactive.isolate():
+            self.version: reactive.Value[int] = reactive.Value(0)
+        self._task: Optional[asyncio.Task[None]] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._signature: Optional[Tuple[object, ...]] = None
+        super().__init__()
+
+    def _stop(self) -> None:
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+        if _file_watchers.get(self.path) is self:
+            del _file_watchers[self.path]
+
+    def start(self) -> None:
+        # Started by the first reader, rather than when created, since that may happen
+        # before there is an event loop (at the top level of an app).
+        if self._task is None:
+            self._signature = self._check_signature()
+            self._stop_event = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run())
+
+    def _check_signature(self) -> Optional[Tuple[object, ...]]:
+        try:
+            return _file_signature(self.path)
+        except OSError:
+            return None
+
+    def _watch_args(self) -> Tuple[str, bool]:
+        # The directory to watch, and whether to watch it recursively. For a single
+        # file, its directory is watched, so that files that are replaced (rather than
+        # modified in place) when saved are still tracked.
+        if os.path.isdir(self.path):
+            return self.path, True
+        if glob.has_magic(self.path):  # pyright: ignore[reportGeneralTypeIssues]
+            parts = self.path.split(os.sep)
+            i = next(
+                i
+                for i, part in enumerate(parts)
+                if glob.has_magic(part)  # pyright: ignore[reportGeneralTypeIssues]
+            )
+            return os.sep.join(parts[:i]) or os.sep, i < len(parts) - 1
+        return os.path.dirname(self.path), False
+
+    async def _run(self) -> None:
+        watchfiles = _watchfiles()
+        if watchfiles is None:
+            warnings.warn(
+                "Watching files for changes requires the watchfiles package. Install "
+                f"it with `pip install watchfiles`. Checking {self.path} every "
+                f"{self.interval_secs} seconds instead.",
+                ReactiveWarning,
+                stacklevel=2,
+            )
+        else:
+            root, recursive = self._watch_args()
+            try:
+                async for _ in watchfiles.awatch(
+                    root, stop_event=self._stop_event, recursive=recursive
+                ):
+                    # Only changes to the watched paths count, and only if they actually
+                    # changed something.
+                    await self._check()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # E.g., the directory doesn't exist, or the OS has run out of watches.
+                warnings.warn(
+                    f"Unable to watch {self.path} for changes ({e}); checking it every "
+                    f"{self.interval_secs} seconds instead.",
+                    ReactiveWarning,
+                    stacklevel=2,
+                )
+
+        while True:
+            await asyncio.sleep(self.interval_secs)
+            await self._check()
+
+    async def _check(self) -> None:
+        signature = self._check_signature()
+        if signature == self._signature:
+            return
+        self._signature = signature
+
+        # Same as when an app-level reactive object is invalidated by a timer: lock and
+        # flush the app-level domain. Sessions with readers that are invalidated
+        # request their own flushes.
+        app_domain = session_domain(None)
+        async with app_domain.lock:
+            with reactive.isolate():
+                self.version.set(self.version.get() + 1)
+            await app_domain.flush()
+
+
+_file_watchers: Dict[str, _FileWatcher] = {}
@@ -0,0 +1,293 @@
+"""Rate-limiting reactive expressions."""
+
+from __future__ import annotations
+
+__all__ = ("debounce", "throttle")
+
+import time
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from .. import _utils
+from ..types import MISSING, MISSING_TYPE
+from ._core import Dependents, invalidate_later, isolate
+from ._reactives import Calc, Calc_, Effect, Value
+
+if TYPE_CHECKING:
+    from ..session import Session
+
+T = TypeVar("T")
+
+
+def debounce(
+    delay_secs: float,
+    *,
+    priority: int = 100,
+    session: Union[MISSING_TYPE, "Session", None] = MISSING,
+) -> Callable[[Callable[[], T]], Calc_[T]]:
+    """
+    Debounce a reactive expression.
+
+    Returns a reactive calculation that follows the value of a reactive expression
+    (such as an input, a :class:`~shiny.reactive.Value`, or a
+    :func:`~shiny.reactive.Calc`), but only once it has stopped changing for
+    ``delay_secs`` seconds. This is useful for inputs that change rapidly, like a
+    slider being dragged or text being typed, when reacting to every intermediate
+    value would be expensive.
+
+    Parameters
+    ----------
+    delay_secs
+        The number of seconds that the expression must be unchanged (i.e., not
+        invalidated) before the debounced value is updated.
+    priority
+        Debouncing is implemented using :class:`~shiny.reactive.Effect` objects; use
+        this to control their priority. It should usually be higher than that of the
+        effects and outputs that use the debounced value.
+    session
+        A :class:`~shiny.Session` instance. If not provided, it is inferred via
+        :func:`~shiny.session.get_current_session`. The timers are cancelled when the
+        session ends.
+
+    Returns
+    -------
+    A decorator (or wrapper function) that takes a reactive expression and returns a
+    debounced reactive :class:`~shiny.reactive.Calc`.
+
+    Example
+    -------
+    .. code-block:: python
+
+        # Only re-filtered once the user stops typing
+        @reactive.debounce(0.5)
+        @reactive.Calc
+        def filtered():
+            return data[data.name.str.contains(input.pattern())]
+
+    Note
+    ----
+    A debounced :func:`~shiny.reactive.Calc` isn't run to find out when it changes, so
+    an expensive calculation is only run once changes stop. Changes are followed through
+    the reactive values that the calculation read directly; if it reads another
+    calculation, changes behind that one only delay the update the first time.
+
+    See Also
+    --------
+    ~shiny.reactive.throttle
+    ~shiny.reactive.invalidate_later
+    """
+
+    def decorator(r: Callable[[], T]) -> Calc_[T]:
+        trigger: Value[int] = Value(0)
+        # When the debounced value should next be updated
+        when: Value[Optional[float]] = Value(None)
+        first_run = True
+        tracker = _Tracker(r)
+
+        @Effect(priority=priority, session=session)
+        async def _():
+            await tracker.track()
+            nonlocal first_run
+            if first_run:
+                first_run = False
+                return
+            # Each time r is invalidated, push back the update
+            when.set(time.monotonic() + delay_secs)
+
+        @Effect(priority=priority, session=session)
+        def _():
+            deadline = when()
+            if deadline is None:
+                return
+            now = time.monotonic()
+            if now >= deadline:
+                when.set(None)
+                with isolate():
+                    trigger.set(trigger() + 1)
+            else:
+                invalidate_later(deadline - now)
+
+        return _rate_limited(tracker, trigger, session)
+
+    return decorator
+
+
+def throttle(
+    delay_secs: float,
+    *,
+    priority: int = 100,
+    session: Union[MISSING_TYPE, "Session", None] = MISSING,
+) -> Callable[[Callable[[], T]], Calc_[T]]:
+    """
+    Throttle a reactive expression.
+
+    Returns a reactive calculation that follows the value of a reactive expression
+    (such as an input, a :class:`~shiny.reactive.Value`, or a
+    :func:`~shiny.reactive.Calc`), but is updated at most once every ``delay_secs``
+    seconds. Unlike :func:`~shiny.reactive.debounce`, which waits for changes to stop,
+    a throttled value keeps updating (at a limited rate) while changes continue.
+
+    Parameters
+    ----------
+    delay_secs
+        The minimum number of seconds between updates of the throttled value.
+    priority
+        Throttling is implemented using :class:`~shiny.reactive.Effect` objects; use
+        this to control their priority. It should usually be higher than that of the
+        effects and outputs that use the throttled value.
+    session
+        A :class:`~shiny.Session` instance. If not provided, it is inferred via
+        :func:`~shiny.session.get_current_session`. The timers are cancelled when the
+        session ends.
+
+    Returns
+    -------
+    A decorator (or wrapper function) that takes a reactive expression and returns a
+    throttled reactive :class:`~shiny.reactive.Calc`.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @reactive.throttle(0.25)
+        @reactive.Calc
+        def preview():
+            return render_preview(input.slider())
+
+    Note
+    ----
+    As with :func:`~shiny.reactive.debounce`, a throttled
+    :func:`~shiny.reactive.Calc` isn't run to find out when it changes, so an expensive
+    calculation is only run when the throttled value is updated.
+
+    See Also
+    --------
+    ~shiny.reactive.debounce
+    ~shiny.reactive.invalidate_later
+    """
+
+    def decorator(r: Callable[[], T]) -> Calc_[T]:
+        trigger: Value[int] = Value(0)
+        # Whether r has been invalidated during the current blackout period
+        pending: Value[bool] = Value(False)
+        last_triggered: Optional[float] = None
+        tracker = _Tracker(r)
+
+        def blackout_left() -> float:
+            if last_triggered is None:
+                return 0
+            return max(0, last_triggered + delay_secs - time.monotonic())
+
+        def fire() -> None:
+            nonlocal last_triggered
+            last_triggered = time.monotonic()
+            with isolate():
+                trigger.set(trigger() + 1)
+            pending.set(False)
+
+        @Effect(priority=priority, session=session)
+        async def _():
+            await tracker.track()
+            with isolate():
+                if pending():
+                    return
+                if blackout_left() > 0:
+                    pending.set(True)
+                else:
+                    fire()
+
+        @Effect(priority=priority, session=session)
+        def _():
+            if not pending():
+                return
+            timeout = blackout_left()
+            if timeout > 0:
+                invalidate_later(timeout)
+            else:
+                fire()
+
+        return _rate_limited(tracker, trigger, session)
+
+    return decorator
+
+
+class _Tracker(Generic[T]):
+    """
+    Follows the changes of a reactive expression for a rate limiter.
+
+    A Calc isn't run to find out when it changes (that would defeat the purpose of
+    rate-limiting an expensive calculation): the tracking context depends on the Calc,
+    and on what the Calc read the last time it was run, so that changes that happen
+    while it's out of date (and isn't re-run) are seen too. Other expressions, like
+    inputs, are cheap to read, so they are simply read.
+    """
+
+    def __init__(self, r: Callable[[], T]) -> None:
+        self.r = r
+        # What the Calc read (directly) the last time it was run
+        self.upstream: List[Dependents] = []
+
+    async def track(self) -> None:
+        r = self.r
+        if isinstance(r, Calc_):
+            r._dependents.register()
+            for dependents in self.upstream:
+                dependents.register()
+            return
+        # Errors are ignored here; they'll be raised when the rate-limited calculation
+        # reads r.
+        try:
+            if _utils.is_async_callable(r):
+                await r()
+            else:
+                r()
+        except Exception:
+            pass
+
+    def read_done(self) -> None:
+        # Called after the rate-limited calculation has read r.
+        r = self.r
+        if isinstance(r, Calc_) and r._ctx is not None:
+            self.upstream = list(r._ctx._dependencies or ())
+
+
+def _rate_limited(
+    tracker: _Tracker[T],
+    trigger: Value[int],
+    session: Union[MISSING_TYPE, "Session", None],
+) -> Calc_[T]:
+    if _utils.is_async_callable(tracker.r):
+        r_async = cast(Callable[[], Awaitable[T]], tracker.r)
+
+        @Calc(session=session)
+        async def result_async() -> T:
+            trigger()
+            with isolate():
+                try:
+                    return await r_async()
+                finally:
+                    tracker.read_done()
+
+        return cast(Calc_[T], result_async)
+
+    r = tracker.r
+
+    @Calc(session=session)
+    def result() -> T:
+        trigger()
+        with isolate():
+            try:
+                return r()
+            finally:
+                tracker.read_done()
+
+    return result
@@ -1,14 +1,33 @@
 """Reactive components"""
 
-__all__ = ("Value", "Calc", "Calc_", "CalcAsync_", "Effect", "Effect_", "event")
+__all__ = (
+    "Value",
+    "Calc",
+    "Calc_",
+    "CalcAsync_",
+    "SharedCalc",
+    "SharedCalc_",
+    "SharedCalcAsync_",
+    "Reduce_",
+    "reduce",
+    "Effect",
+    "Effect_",
+    "event",
+    "select",
+)
 
+import asyncio
 import functools
+import math
+import sys
 import traceback
 import warnings
 from typing import (
     TYPE_CHECKING,
+    Any,
     Awaitable,
     Callable,
+    Dict,
     Generic,
     List,
     Optional,
@@ -23,13 +42,28 @@ from .._docstring import add_example
 from .._utils import is_async_callable, run_coro_sync
 from .._validation import req
 from ..render import RenderFunction
-from ..types import MISSING, MISSING_TYPE, ActionButtonValue, SilentException
-from ._core import Context, Dependents, ReactiveWarning, isolate
+from ..types import (
+    MISSING,
+    MISSING_TYPE,
+    ActionButtonValue,
+    SilentCancelOutputException,
+    SilentException,
+)
+from . import _trace
+from ._core import (
+    Context,
+    Dependents,
+    ReactiveDomain,
+    ReactiveWarning,
+    isolate,
+    session_domain,
+)
 
 if TYPE_CHECKING:
     from ..session import Session
 
 T = TypeVar("T")
+U = TypeVar("U")
 
 # ==============================================================================
 # Value
@@ -45,6 +79,18 @@ class Value(Generic[T]):
         An optional initial value.
     read_only
         If ``True``, then the reactive value cannot be `set()`.
+    equals
+        A function that takes the old and new values and returns ``True`` if they are
+        equal, in which case setting the new value does not invalidate dependents. The
+        default compares primitives, tuples, lists, dicts, numpy arrays, and pandas
+        objects by value (treating NaN as equal to NaN), and other objects by identity
+        unless their ``==`` returns a ``bool``. Pass ``operator.is_`` to only compare by
+        identity.
+    hash
+        A function that computes a hash (or other comparable key) of a value. If
+        provided, values are considered equal when their hashes are equal, and
+        ``equals`` is not used. This is useful for large values that are expensive to
+        compare, since only the hash of the current value is kept.
 
     Returns
     -------
@@ -69,6 +115,18 @@ class Value(Generic[T]):
     Effect
     """
 
+    # Apps can have a great many Values (every input of every session is one), so they
+    # don't have a __dict__.
+    __slots__ = (
+        "_value",
+        "_read_only",
+        "_equals",
+        "_hash_fn",
+        "_hash",
+        "_value_dependents",
+        "_is_set_dependents",
+    )
+
     # These overloads are necessary so that the following hold:
     # - Value() is marked by the type checker as an error, because the type T is
     #   unknown. (It is not a run-time error.)
@@ -77,21 +135,45 @@ class Value(Generic[T]):
     # - Value(1) works, with T is inferred to be int.
     @overload
     def __init__(
-        self, value: MISSING_TYPE = MISSING, *, read_only: bool = False
+        self,
+        value: MISSING_TYPE = MISSING,
+        *,
+        read_only: bool = False,
+        equals: Optional[Callable[[T, T], bool]] = None,
+        hash: Optional[Callable[[T], object]] = None,
     ) -> None:
         ...
 
     @overload
-    def __init__(self, value: T, *, read_only: bool = False) -> None:
+    def __init__(
+        self,
+        value: T,
+        *,
+        read_only: bool = False,
+        equals: Optional[Callable[[T, T], bool]] = None,
+        hash: Optional[Callable[[T], object]] = None,
+    ) -> None:
         ...
 
     # If `value` is MISSING, then `get()` will raise a SilentException, until a new
     # value is set. Calling `unset()` will set the value to MISSING.
     def __init__(
-        self, value: Union[T, MISSING_TYPE] = MISSING, *, read_only: bool = False
+        self,
+        value: Union[T, MISSING_TYPE] = MISSING,
+        *,
+        read_only: bool = False,
+        equals: Optional[Callable[[T, T], bool]] = None,
+        hash: Optional[Callable[[T], object]] = None,
     ) -> None:
+        if equals is not None and hash is not None:
+            raise ValueError("Only one of `equals` and `hash` may be provided.")
         self._value: Union[T, MISSING_TYPE] = value
         self._read_only: bool = read_only
+        self._equals: Callable[[Any, Any], bool] = equals or _values_equal
+        self._hash_fn: Optional[Callable[[T], object]] = hash
+        self._hash: object = None
+        if hash is not None and not isinstance(value, MISSING_TYPE):
+            self._hash = hash(value)
         self._value_dependents: Dependents = Dependents()
         self._is_set_dependents: Dependents = Dependents()
 
@@ -151,11 +233,34 @@ class Value(Generic[T]):
         if self._value is value:
             return False
 
-        if isinstance(self._value, MISSING_TYPE) != isinstance(value, MISSING_TYPE):
-            self._is_set_dependents.invalidate()
-
-        self._value = value
-        self._value_dependents.invalidate()
+        old_missing = isinstance(self._value, MISSING_TYPE)
+        new_missing = isinstance(value, MISSING_TYPE)
+        if not old_missing and not new_missing:
+            if self._hash_fn is not None:
+                new_hash = self._hash_fn(value)
+                if new_hash == self._hash:
+                    return False
+                self._hash = new_hash
+            elif self._equals(self._value, value):
+                return False
+        elif self._hash_fn is not None:
+            self._hash = None if new_missing else self._hash_fn(value)
+
+        # When tracing, this value is the source of the invalidations, unless the set
+        # is itself part of something already being traced (like an input message).
+        tracer = _trace._tracer
+        traced = tracer is not None and not tracer.has_source()
+        if traced:
+            tracer.push_source(self)  # pyright: ignore
+        try:
+            if old_missing != new_missing:
+                self._is_set_dependents.invalidate()
+
+            self._value = value
+            self._value_dependents.invalidate()
+        finally:
+            if traced:
+                tracer.pop_source()  # pyright: ignore
         return True
 
     def unset(self) -> None:
@@ -190,6 +295,50 @@ class Value(Generic[T]):
         self._value = MISSING
 
 
+def _values_equal(old: object, new: object) -> bool:
+    # The default `equals` for Value. Errs on the side of reporting a change: values of
+    # different types, and objects without a meaningful `==`, are never equal.
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        return False
+    if isinstance(old, float):
+        return old == new or (math.isnan(old) and math.isnan(new))  # type: ignore
+    if isinstance(old, (str, bytes, int, complex)):
+        return old == new
+
+    # Only check for numpy and pandas objects if those packages have been loaded.
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(old, np.ndarray):
+        try:
+            return bool(np.array_equal(old, new, equal_nan=True))
+        except TypeError:
+            # equal_nan isn't supported for non-numeric arrays
+            return bool(np.array_equal(old, new))
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(old, (pd.DataFrame, pd.Series, pd.Index)):
+        return bool(old.equals(new))  # type: ignore
+
+    try:
+        res = old == new
+    except Exception:
+        # E.g., lists containing numpy arrays raise on `==`
+        res = False
+    if res is True:
+        return True
+    # `==` can be False for containers whose elements are equal by our rules (like NaN
+    # or numpy arrays), so compare element-wise.
+    if isinstance(old, (list, tuple)):
+        return len(old) == len(new) and all(  # type: ignore
+            _values_equal(a, b) for a, b in zip(old, new)  # type: ignore
+        )
+    if isinstance(old, dict):
+        return old.keys() == new.keys() and all(  # type: ignore
+            _values_equal(v, new[k]) for k, v in old.items()  # type: ignore
+        )
+    return False
+
+
 # ==============================================================================
 # Calc
 # ==============================================================================
@@ -229,6 +378,9 @@ class Calc_(Generic[T]):
         self._most_recent_ctx_id: int = -1
         self._ctx: Optional[Context] = None
         self._exec_count: int = 0
+        # The task running the current execution of an async calculation, which all of
+        # its readers await.
+        self._update_task: Optional[asyncio.Task[T]] = None
 
         self._session: Optional[Session]
         # Use `isinstance(x, MISSING_TYPE)`` instead of `x is MISSING` because
@@ -242,13 +394,10 @@ class Calc_(Generic[T]):
             session = get_current_session()
         self._session = session
 
-        # Use lists to hold (optional) value and error, instead of Optional[T],
-        # because it makes typing more straightforward. For example if
-        # .get_value() simply returned self._value, self._value had type
-        # Optional[T], then the return type for get_value() would have to be
-        # Optional[T].
-        self._value: list[T] = []
-        self._error: list[Exception] = []
+        # The most recent value (MISSING if there isn't one, or it has been discarded)
+        # or error.
+        self._value: Union[T, MISSING_TYPE] = MISSING
+        self._error: Optional[Exception] = None
 
     def __call__(self) -> T:
         # Run the Coroutine (synchronously), and then return the value.
@@ -259,17 +408,19 @@ class Calc_(Generic[T]):
     async def get_value(self) -> T:
         self._dependents.register()
 
-        if self._invalidated or self._running:
+        if self._is_async:
+            return await self._update_value_shared()
+        elif self._invalidated or self._running:
             await self.update_value()
 
-        if self._error:
-            raise self._error[0]
+        if self._error is not None:
+            raise self._error
 
-        return self._value[0]
+        return cast(T, self._value)
 
     # TODO: should this be private?
     async def update_value(self) -> None:
-        self._ctx = Context()
+        self._ctx = Context(owner=self)
         self._most_recent_ctx_id = self._ctx.id
 
         self._ctx.on_invalidate(self._on_invalidate_cb)
@@ -289,18 +440,61 @@ class Calc_(Generic[T]):
             finally:
                 self._running = was_running
 
+    async def _update_value_shared(self) -> T:
+        # An async calculation can be read by several tasks at once (other sessions, or
+        # effects run by a concurrent flush). Each execution is run in a task of its
+        # own, which all of the readers await; that way it's run just once, and a reader
+        # that is cancelled doesn't cancel it for the others. If the calculation is
+        # invalidated while it's running, that run is cancelled, since its result would
+        # be out of date, and the readers that are still waiting start (or join) a new
+        # one. The readers get the result from the task rather than from `_value`, since
+        # the calculation may have been invalidated again by the time they resume.
+        while True:
+            task = self._update_task
+            if task is None:
+                if not self._invalidated:
+                    if self._error is not None:
+                        raise self._error
+                    return cast(T, self._value)
+                task = self._update_task = asyncio.ensure_future(self._run_update())
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                if not task.cancelled() or task is self._update_task:
+                    # This reader was cancelled, not the run
+                    raise
+
+    async def _run_update(self) -> T:
+        try:
+            await self.update_value()
+            if self._error is not None:
+                raise self._error
+            return cast(T, self._value)
+        finally:
+            if self._update_task is _current_task():
+                self._update_task = None
+
     def _on_invalidate_cb(self) -> None:
         self._invalidated = True
-        self._value.clear()  # Allow old value to be GC'd
+        self._value = MISSING  # Allow old value to be GC'd
+        task = self._update_task
+        if task is not None:
+            # Invalidated while running; the result would be out of date.
+            self._update_task = None
+            task.cancel()
         self._dependents.invalidate()
         self._ctx = None  # Allow context to be GC'd
 
     async def _run_func(self) -> None:
-        self._error.clear()
+        self._error = None
         try:
-            self._value.append(await self._fn())
+            tracer = _trace._tracer
+            if tracer is None:
+                self._value = await self._fn()
+            else:
+                self._value = await tracer.time_execution(self, self._fn())
         except Exception as err:
-            self._error.append(err)
+            self._error = err
 
 
 class CalcAsync_(Calc_[T]):
@@ -397,12 +591,19 @@ def Calc(
     Reactive calculations should not produce any side effects; to reactively produce
     side effects, use :func:`~shiny.reactive.Effect` instead.
 
+    Note
+    ----
+    A long-running calculation blocks the event loop (and so every session in the
+    process). To run it off of the event loop, read its reactive inputs in an async
+    calculation and pass them to :func:`~shiny.reactive.run_in_executor`.
+
     See Also
     --------
     ~shiny.Inputs
     ~shiny.reactive.Value
     ~shiny.reactive.Effect
     ~shiny.reactive.invalidate_later
+    ~shiny.reactive.run_in_executor
     ~shiny.event
     """
 
@@ -419,6 +620,289 @@ def Calc(
         return create_calc(fn)
 
 
+# ==============================================================================
+# SharedCalc
+# ==============================================================================
+class SharedCalc_(Calc_[T]):
+    """
+    Mark a function as a reactive calculation that is shared by all sessions.
+
+    Warning
+    -------
+    Most users shouldn't use this class directly to initialize a shared reactive
+    calculation (instead, use the :func:`SharedCalc` decorator).
+    """
+
+    def __init__(self, fn: CalcFunction[T]) -> None:
+        super().__init__(fn, session=None)
+        # Sessions that have read this calculation and haven't ended yet
+        self._reader_sessions: Dict[str, Session] = {}
+        # Whether the last reader session ended while the calculation was running
+        self._release_pending: bool = False
+
+    async def get_value(self) -> T:
+        self._track_reader()
+        return await super().get_value()
+
+    async def update_value(self) -> None:
+        try:
+            await super().update_value()
+        finally:
+            if self._release_pending and not self._running:
+                # Release once the readers still waiting on this run have its result.
+                asyncio.get_running_loop().call_soon(self._release_if_unread)
+
+    def _track_reader(self) -> None:
+        from ..session import get_current_session
+
+        session = get_current_session()
+        if session is None or session.id in self._reader_sessions:
+            return
+        self._reader_sessions[session.id] = session
+        session.on_ended(functools.partial(self._on_reader_ended, session.id))
+
+    def _on_reader_ended(self, session_id: str) -> None:
+        self._reader_sessions.pop(session_id, None)
+        if self._running:
+            self._release_pending = not self._reader_sessions
+        else:
+            self._release_if_unread()
+
+    def _release_if_unread(self) -> None:
+        self._release_pending = False
+        if not self._reader_sessions and not self._running:
+            self._release()
+
+    def _release(self) -> None:
+        # Free the cached value (and the references to upstream reactive objects held
+        # by the context); it'll be recalculated the next time it's read.
+        self._value = MISSING
+        self._error = None
+        self._invalidated = True
+        if self._ctx is not None:
+            self._ctx.invalidate()
+
+
+class SharedCalcAsync_(SharedCalc_[T]):
+    """
+    Mark an async function as a reactive calculation that is shared by all sessions.
+
+    Warning
+    -------
+    Most users shouldn't use this class directly to initialize a shared reactive
+    calculation (instead, use the :func:`SharedCalc` decorator).
+    """
+
+    def __init__(self, fn: CalcFunctionAsync[T]) -> None:
+        if not _utils.is_async_callable(fn):
+            raise TypeError(self.__class__.__name__ + " requires an async function")
+
+        super().__init__(cast(CalcFunction[T], fn))
+
+    async def __call__(self) -> T:  # pyright: ignore[reportIncompatibleMethodOverride]
+        return await self.get_value()
+
+
+@overload
+def SharedCalc(fn: CalcFunctionAsync[T]) -> SharedCalcAsync_[T]:
+    ...
+
+
+@overload
+def SharedCalc(fn: CalcFunction[T]) -> SharedCalc_[T]:
+    ...
+
+
+def SharedCalc(
+    fn: Union[CalcFunction[T], CalcFunctionAsync[T]]
+) -> Union[SharedCalc_[T], SharedCalcAsync_[T]]:
+    """
+    Mark a function as a reactive calculation that is shared by all sessions.
+
+    A shared reactive calculation should be created at the top level of an app (outside
+    of the server function). It works like :func:`~shiny.reactive.Calc`, but it is
+    calculated at most once per invalidation no matter how many sessions read it, even
+    if several sessions read it at the same time while it is (asynchronously) being
+    calculated. When it is invalidated, every session that depends on it is scheduled to
+    flush.
+
+    Once all of the sessions that have read the shared calculation have ended, its
+    value is discarded, so that large results don't stay in memory while no one is using
+    them; it will be recalculated the next time it's read.
+
+    Returns
+    -------
+    A shared reactive calculation.
+
+    Note
+    ----
+    A shared calculation runs outside of any session, so it should only read app-level
+    reactive objects (like a :class:`~shiny.reactive.Value` or
+    :func:`~shiny.reactive.poll` created at the top level), not session inputs.
+
+    See Also
+    --------
+    ~shiny.reactive.Calc
+    ~shiny.reactive.poll
+    """
+    if _utils.is_async_callable(fn):
+        return SharedCalcAsync_(fn)
+    else:
+        fn = cast(CalcFunction[T], fn)
+        return SharedCalc_(fn)
+
+
+# ==============================================================================
+# Reduce
+# ==============================================================================
+class Reduce_(Calc_[T]):
+    """
+    Mark a function as an incremental reactive calculation.
+
+    Warning
+    -------
+    Most users shouldn't use this class directly to initialize an incremental reactive
+    calculation (instead, use the :func:`reduce` decorator).
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[T, U], T],
+        source: Callable[[], U],
+        init: Callable[[], T],
+        *,
+        session: Union[MISSING_TYPE, "Session", None] = MISSING,
+    ) -> None:
+        if _utils.is_async_callable(fn) or _utils.is_async_callable(source):
+            raise TypeError(self.__class__.__name__ + " requires synchronous functions")
+
+        self._reduce_fn = fn
+        self._source = source
+        self._init = init
+        # The accumulated value; MISSING when it needs to be (re)started from init().
+        # Unlike `_value`, it's kept when the calculation is invalidated.
+        self._acc: Union[T, MISSING_TYPE] = MISSING
+        # The context in which `source` was last read, or None if the source has
+        # changed since (or hasn't been read yet).
+        self._source_ctx: Optional[Context] = None
+        self._source_invalidating: bool = False
+
+        super().__init__(self._step, session=session)
+        self.__name__ = fn.__name__
+        self.__doc__ = fn.__doc__
+
+    def _step(self) -> T:
+        acc = self._acc
+        reset = isinstance(acc, MISSING_TYPE)
+        if reset:
+            acc = self._init()
+
+        # When starting over, the current value of the source is folded in again (which
+        # also has the function take its other dependencies again).
+        if self._source_ctx is None or reset:
+            ctx = self._source_ctx
+            if ctx is None:
+                # The source is read in a context of its own, so that a change to the
+                # source can be told apart from a change to anything else that was read.
+                self._source_ctx = ctx = Context(owner=self)
+                ctx.on_invalidate(self._on_source_invalidate_cb)
+            with ctx():
+                delta = self._source()
+            acc = self._reduce_fn(cast(T, acc), delta)
+
+        self._acc = acc
+        return acc
+
+    def _on_source_invalidate_cb(self) -> None:
+        self._source_ctx = None
+        if self._ctx is not None:
+            self._source_invalidating = True
+            try:
+                self._ctx.invalidate()
+            finally:
+                self._source_invalidating = False
+
+    def _on_invalidate_cb(self) -> None:
+        if not self._source_invalidating:
+            # Something other than the source changed, so start over.
+            self._acc = MISSING
+        super()._on_invalidate_cb()
+
+
+def reduce(
+    source: Callable[[], U],
+    init: Callable[[], T],
+    *,
+    session: Union[MISSING_TYPE, "Session", None] = MISSING,
+) -> Callable[[Callable[[T, U], T]], Reduce_[T]]:
+    """
+    Mark a function as an incremental reactive calculation.
+
+    Where a :func:`~shiny.reactive.Calc` recomputes its value from scratch whenever it
+    is invalidated, an incremental calculation folds each new value of `source` into its
+    previous value. The decorated function is called with the previous value and the new
+    value of `source` (the "delta"), and returns the updated value, so that, for
+    example, appending a sample to a history takes time proportional to the sample, not
+    to the history.
+
+    If anything other than `source` that the function reads changes (for example, an
+    input that controls how the history is summarized, or a "reset" button), the value
+    is reset: it is started over from ``init()``, with the current value of `source`
+    folded into it.
+
+    Parameters
+    ----------
+    source
+        A reactive function (e.g., a :class:`~shiny.reactive.Value`, an input, or a
+        :func:`~shiny.reactive.Calc`) whose value is the change to fold in.
+    init
+        A function that returns the initial value, which is used the first time the
+        calculation runs and whenever it is reset.
+    session
+        A :class:`~shiny.Session` instance. If not provided, it is inferred via
+        :func:`~shiny.session.get_current_session`.
+
+    Returns
+    -------
+    A decorator that marks a function as an incremental reactive calculation.
+
+    Note
+    ----
+    The function may modify the previous value in place and return it, but, since
+    dependents are only invalidated (not given the old value), nothing should hold on to
+    a value that it has read and expect it not to change. Only synchronous functions are
+    supported.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @reactive.reduce(cpu_current, init=list)
+        def cpu_history(history, sample):
+            input.reset()  # Start over when the button is clicked
+            history.append(sample)
+            del history[:-1000]
+            return history
+
+    See Also
+    --------
+    ~shiny.reactive.Calc
+    """
+
+    def create_reduce(fn: Callable[[T, U], T]) -> Reduce_[T]:
+        return Reduce_(fn, source, init, session=session)
+
+    return create_reduce
+
+
+def _current_task() -> "Optional[asyncio.Task[object]]":
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        # No running event loop
+        return None
+
+
 # ==============================================================================
 # Effect
 # ==============================================================================
@@ -462,6 +946,8 @@ class Effect_:
         self._invalidate_callbacks: list[Callable[[], None]] = []
         self._destroyed: bool = False
         self._ctx: Optional[Context] = None
+        # The invalidated context that is waiting in the domain's flush queue, if any.
+        self._pending_ctx: Optional[Context] = None
         self._exec_count: int = 0
 
         self._session: Optional[Session]
@@ -475,6 +961,7 @@ class Effect_:
             # could be None if outside of a session).
             session = get_current_session()
         self._session = session
+        self._domain: ReactiveDomain = session_domain(self._session)
 
         if self._session is not None:
             self._session.on_ended(self._on_session_ended_cb)
@@ -483,43 +970,52 @@ class Effect_:
         self._create_context().invalidate()
 
     def _create_context(self) -> Context:
-        ctx = Context()
+        ctx = Context(self._domain, owner=self)
 
         # Store the context explicitly in Effect object
         # TODO: More explanation here
         self._ctx = ctx
 
-        def on_invalidate_cb() -> None:
-            # Context is invalidated, so we don't need to store a reference to it
-            # anymore.
-            self._ctx = None
+        # An effect only has one live context at a time (a new one is created when it
+        # re-runs, after the old one has been invalidated and flushed), so the
+        # callbacks are bound methods rather than closures over `ctx`.
+        ctx.on_invalidate(self._on_invalidate_cb)
+        ctx.on_flush(self._on_flush_cb)
+
+        return ctx
 
-            for cb in self._invalidate_callbacks:
-                cb()
+    def _on_invalidate_cb(self) -> None:
+        ctx = self._ctx
+        # Context is invalidated, so we don't need to store a reference to it anymore.
+        self._ctx = None
 
-            if self._destroyed:
-                return
+        for cb in self._invalidate_callbacks:
+            cb()
 
-            def _continue() -> None:
-                ctx.add_pending_flush(self._priority)
-                if self._session:
-                    self._session._send_message_sync({"busy": "busy"})
+        if self._destroyed or ctx is None:
+            return
 
-            if self._suspended:
-                self._on_resume = _continue
-            else:
-                _continue()
+        if self._suspended:
+            self._on_resume = functools.partial(self._schedule, ctx)
+        else:
+            self._schedule(ctx)
+
+    def _schedule(self, ctx: Context) -> None:
+        ctx.add_pending_flush(self._priority)
+        self._pending_ctx = ctx
+        if self._session:
+            self._session._increment_busy_count()
 
-        async def on_flush_cb() -> None:
+    async def _on_flush_cb(self) -> None:
+        self._pending_ctx = None
+        try:
             if not self._destroyed:
                 await self._run()
+        finally:
+            # A missed decrement would leave the client showing "busy" for the rest of
+            # the session.
             if self._session:
-                self._session._send_message_sync({"busy": "idle"})
-
-        ctx.on_invalidate(on_invalidate_cb)
-        ctx.on_flush(on_flush_cb)
-
-        return ctx
+                self._session._decrement_busy_count()
 
     async def _run(self) -> None:
         ctx = self._create_context()
@@ -530,8 +1026,12 @@ class Effect_:
         with session_context(self._session):
             try:
                 with ctx():
-                    await self._fn()
-            except SilentException:
+                    tracer = _trace._tracer
+                    if tracer is None:
+                        await self._fn()
+                    else:
+                        await tracer.time_execution(self, self._fn())
+            except (SilentException, SilentCancelOutputException):
                 # It's OK for SilentException to cause an Effect to stop running
                 pass
             except Exception as e:
@@ -565,6 +1065,14 @@ class Effect_:
         if self._ctx is not None:
             self._ctx.invalidate()
 
+        # If a re-execution is already scheduled, take it out of the flush queue now
+        # rather than leaving it there until it's popped.
+        ctx = self._pending_ctx
+        if ctx is not None:
+            self._pending_ctx = None
+            if self._domain.remove_pending_flush(ctx) and self._session:
+                self._session._decrement_busy_count()
+
     def suspend(self) -> None:
         """
         Suspend the effect.
@@ -602,11 +1110,12 @@ class Effect_:
 
         Note
         ----
-        If the observer is currently invalidated, then the change in priority will not
-        take effect until the next invalidation--unless the observer is also currently
-        suspended, in which case the priority change will be effective upon resume.
+        If the observer is currently invalidated and waiting to re-execute, it is moved
+        to its new position in the flush queue immediately.
         """
         self._priority = priority
+        if self._pending_ctx is not None:
+            self._domain.set_pending_flush_priority(self._pending_ctx, priority)
 
     def _on_session_ended_cb(self) -> None:
         self.destroy()
@@ -823,6 +1332,89 @@ def _is_none_event(val: object) -> bool:
     return val is None or (isinstance(val, ActionButtonValue) and val == 0)
 
 
+# ==============================================================================
+# select
+# ==============================================================================
+def select(
+    source: Callable[[], T],
+    projection: Callable[[T], U],
+    *,
+    equals: Optional[Callable[[U, U], bool]] = None,
+    priority: int = 0,
+    session: Union[MISSING_TYPE, "Session", None] = MISSING,
+) -> Value[U]:
+    """
+    Create a reactive value that tracks a projection of another reactive.
+
+    A :class:`~shiny.reactive.Calc` invalidates its dependents whenever any of its own
+    dependencies change, even if it would return the same result. ``select()`` instead
+    recomputes ``projection(source())`` eagerly whenever ``source`` changes, and only
+    invalidates its dependents when the result is different. This is useful when many
+    outputs each depend on a small part of a large, frequently-changing value.
+
+    Parameters
+    ----------
+    source
+        A reactive value, :class:`~shiny.reactive.Calc`, or input (or any other
+        synchronous function that reads reactive values).
+    projection
+        A function that takes the value of ``source`` and returns the part of it that
+        dependents care about. This should be fast, since it is run every time
+        ``source`` changes.
+    equals
+        A function used to compare successive projections. See
+        :class:`~shiny.reactive.Value` for the default.
+    priority
+        The priority of the :class:`~shiny.reactive.Effect` that recomputes the
+        projection.
+    session
+        A :class:`~shiny.Session` instance. If not provided, it is inferred via
+        :func:`~shiny.session.get_current_session`. If there is no current session,
+        the lifetime of the selection will not be tied to any specific session.
+
+    Returns
+    -------
+    A read-only :class:`~shiny.reactive.Value` holding the projection.
+
+    Example
+    -------
+    .. code-block:: python
+
+        @reactive.Calc
+        def settings() -> Dict[str, Any]:
+            ...
+
+        theme = reactive.select(settings, lambda s: s["theme"])
+
+        @output
+        @render.text
+        def theme_name():
+            # Only re-renders when the theme changes, not when other settings do.
+            return theme()
+
+    See Also
+    --------
+    ~shiny.reactive.Value
+    ~shiny.reactive.Calc
+    """
+
+    selected: Value[U] = Value(read_only=True, equals=equals)
+
+    # Compute the initial projection right away, so that dependents that run in the
+    # first flush don't see a missing value.
+    with isolate():
+        try:
+            selected._set(projection(source()))
+        except SilentException:
+            pass
+
+    @Effect(priority=priority, session=session)
+    def _():
+        selected._set(projection(source()))
+
+    return selected
+
+
 # The code below is a test that the type checker is correctly inferring types. It should
 # have some type errors as indicated. There doesn't seem to be a good way to run pyright
 # and expect errors. Until that's supported, the best thing to do is uncomment the code
@@ -0,0 +1,276 @@
+"""Reactive sources fed by async iterators."""
+
+from __future__ import annotations
+
+__all__ = ("Stream_", "stream")
+
+import asyncio
+import collections
+import operator
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    Deque,
+    Generic,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from ..types import MISSING, MISSING_TYPE
+from ._core import isolate, session_domain
+from ._reactives import Value
+
+if TYPE_CHECKING:
+    from ..session import Session
+
+T = TypeVar("T")
+
+
+class Stream_(Generic[T]):
+    """
+    A reactive source fed by an async iterator.
+
+    Warning
+    -------
+    Most users shouldn't use this class directly (instead, use the :func:`stream`
+    function).
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[T],
+        *,
+        window_secs: float,
+        max_batch: int,
+        max_buffer: Optional[int],
+        keep: Optional[int],
+        session: Union[MISSING_TYPE, "Session", None],
+    ) -> None:
+        if window_secs < 0:
+            raise ValueError("`window_secs` must not be negative.")
+        if max_batch < 1:
+            raise ValueError("`max_batch` must be at least 1.")
+        if max_buffer is None:
+            max_buffer = 10 * max_batch
+        elif max_buffer < max_batch:
+            raise ValueError("`max_buffer` must be at least `max_batch`.")
+        if keep is not None and keep < 1:
+            raise ValueError("`keep` must be at least 1.")
+
+        if isinstance(session, MISSING_TYPE):
+            from ..session import get_current_session
+
+            session = get_current_session()
+        self._session: Optional[Session] = session
+
+        self._source = source
+        self._window_secs = window_secs
+        self._max_batch = max_batch
+        self._max_buffer = max_buffer
+
+        # Items that have been read from the source but not published yet
+        self._buffer: Deque[T] = collections.deque()
+        # The most recent items, if keeping them
+        self._recent: Optional[Deque[T]] = (
+            collections.deque(maxlen=keep) if keep is not None else None
+        )
+
+        with isolate():
+            # Every batch is new, even if it's equal to the previous one.
+            self._value: Value[Tuple[T, ...]] = Value(equals=operator.is_)
+            self._error: Value[Optional[Exception]] = Value(None)
+
+        self._reader: Optional[asyncio.Task[None]] = None
+        self._publisher: Optional[asyncio.Task[None]] = None
+        # Set when there are items in the buffer (or the source is finished)
+        self._ready: Optional[asyncio.Event] = None
+        # Set when there is room in the buffer
+        self._space: Optional[asyncio.Event] = None
+        # The current window, which is cut short when a full batch is ready
+        self._window: Optional[asyncio.Future[None]] = None
+        self._finished: bool = False
+        self._source_error: Optional[Exception] = None
+        self._stopped: bool = False
+
+        if session is not None:
+            session.on_ended(self._stop)
+
+    def __call__(self) -> Tuple[T, ...]:
+        self._start()
+        error = self._error()
+        if error is not None:
+            raise error
+        return self._value()
+
+    def _start(self) -> None:
+        # Started by the first reader, rather than when created, since that may happen
+        # before there is an event loop (at the top level of an app).
+        if self._reader is not None or self._stopped:
+            return
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._reader = asyncio.ensure_future(self._read())
+        self._publisher = asyncio.ensure_future(self._publish_batches())
+
+    def _stop(self) -> None:
+        self._stopped = True
+        for task in (self._reader, self._publisher, self._window):
+            if task is not None:
+                task.cancel()
+
+    async def _read(self) -> None:
+        assert self._ready is not None and self._space is not None
+        buffer = self._buffer
+        iterator = self._source.__aiter__()
+        try:
+            async for item in iterator:
+                while len(buffer) >= self._max_buffer:
+                    # Backpressure: stop pulling items from the source until the
+                    # publisher (which waits for each flush) catches up.
+                    self._space.clear()
+                    await self._space.wait()
+                buffer.append(item)
+                self._ready.set()
+                if len(buffer) >= self._max_batch and self._window is not None:
+                    self._window.cancel()
+        except Exception as e:
+            self._source_error = e
+        finally:
+            self._finished = True
+            self._ready.set()
+            if self._window is not None:
+                self._window.cancel()
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def _publish_batches(self) -> None:
+        assert self._ready is not None and self._space is not None
+        buffer = self._buffer
+        while True:
+            await self._ready.wait()
+            if not self._finished and len(buffer) < self._max_batch:
+                # Collect the items that arrive within the window (asyncio.sleep() is
+                # looked up each time, so that it can be mocked).
+                self._window = asyncio.ensure_future(asyncio.sleep(self._window_secs))
+                await asyncio.wait((self._window,))
+                self._window = None
+
+            if buffer:
+                n = min(len(buffer), self._max_batch)
+                batch = tuple(buffer.popleft() for _ in range(n))
+                self._space.set()
+                await self._publish(batch)
+
+            if not buffer:
+                if self._finished:
+                    break
+                self._ready.clear()
+
+        if self._source_error is not None:
+            await self._publish(None, self._source_error)
+
+    async def _publish(
+        self, batch: Optional[Tuple[T, ...]], error: Optional[Exception] = None
+    ) -> None:
+        # Waiting for the flush is what applies backpressure: while the session is busy,
+        # items pile up in the buffer, and once it's full, the source isn't read.
+        domain = session_domain(self._session)
+        async with domain.lock:
+            if batch is not None:
+                if self._recent is not None:
+                    self._recent.extend(batch)
+                    batch = tuple(self._recent)
+                self._value.set(batch)
+            if error is not None:
+                self._error.set(error)
+            await domain.flush()
+
+
+def stream(
+    source: AsyncIterable[T],
+    *,
+    window_secs: float = 0.1,
+    max_batch: int = 1000,
+    max_buffer: Optional[int] = None,
+    keep: Optional[int] = None,
+    session: Union[MISSING_TYPE, "Session", None] = MISSING,
+) -> Stream_[T]:
+    """
+    Create a reactive source from an async iterator.
+
+    Items are read from `source` (for example, messages from a queue or a websocket) in
+    the background, and published in batches: when an item arrives, the items that
+    arrive within the next `window_secs` seconds (up to `max_batch` of them) are
+    collected, and then made available to reactive readers together, with a single
+    flush. This way, a fast stream doesn't cause a flush per item.
+
+    Each batch waits for the previous one's flush to finish. If the session can't keep
+    up, items are held in a buffer, and once `max_buffer` items are waiting, `source`
+    isn't read until there is room again, so that a fast producer can't use unbounded
+    memory (and, for sources that support it, is slowed down).
+
+    Parameters
+    ----------
+    source
+        An async iterable, such as an async generator.
+    window_secs
+        How long to wait for more items after the first item of a batch arrives.
+    max_batch
+        The maximum number of items in a batch. A batch is published as soon as it is
+        full, without waiting for the rest of the window.
+    max_buffer
+        The maximum number of items to hold while waiting for them to be published.
+        Defaults to ten times `max_batch`.
+    keep
+        If provided, the stream's value is the `keep` most recent items (from this and
+        earlier batches), rather than just the latest batch.
+    session
+        A :class:`~shiny.Session` instance. If not provided, it is inferred via
+        :func:`~shiny.session.get_current_session`. When the session ends, `source` is
+        no longer read, and is closed if it has an ``aclose()`` method (as async
+        generators do). If there is no session, the stream runs until `source` is
+        exhausted.
+
+    Returns
+    -------
+    A reactive function that returns the latest batch (or, with `keep`, the most recent
+    items) as a tuple. Reading it before the first batch raises a
+    :class:`~shiny.types.SilentException`. If `source` raises an error, the remaining
+    items are published and then reading the stream raises that error.
+
+    Note
+    ----
+    Reading from `source` starts when the stream is first read.
+
+    Example
+    -------
+    .. code-block:: python
+
+        async def messages():
+            async for msg in consumer:
+                yield json.loads(msg.value)
+
+        def server(input, output, session):
+            recent = reactive.stream(messages(), window_secs=0.25, keep=500)
+
+            @output
+            @render.table
+            def table():
+                return pd.DataFrame(recent())
+
+    See Also
+    --------
+    ~shiny.reactive.poll
+    ~shiny.reactive.reduce
+    """
+    return Stream_(
+        source,
+        window_secs=window_secs,
+        max_batch=max_batch,
+        max_buffer=max_buffer,
+        keep=keep,
+        session=session,
+    )
@@ -0,0 +1,161 @@
+"""A shared scheduler for invalidate_later()."""
+
+from __future__ import annotations
+
+__all__ = ("TimerScheduler", "get_timer_scheduler")
+
+import asyncio
+import heapq
+import math
+import time
+import traceback
+import weakref
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from .. import _utils
+from . import _trace
+
+if TYPE_CHECKING:
+    from ._core import Context, ReactiveDomain
+
+# Deadlines are rounded up to the next tick (1/100 of a second), so that timers that
+# are due at nearly the same time fire together. (The small epsilon keeps deadlines that
+# are already on a tick, give or take floating-point error, from being pushed to the
+# next one.)
+_TICKS_PER_SEC = 100
+_TICK_EPSILON = 1e-6
+
+# (deadline, sequence number, context, domain of the session that scheduled it)
+_Timer = Tuple[float, int, "Context", Optional["ReactiveDomain"]]
+
+
+class TimerScheduler:
+    """
+    Schedules the invalidation of reactive contexts at given times.
+
+    There is one scheduler per event loop. Rather than having a task per timer, it keeps
+    the timers in a heap and has a single task that sleeps until the earliest one is
+    due. Timers whose context has been invalidated (or whose session has ended) before
+    they're due are simply skipped when they come up. Timers that are due at the same
+    time are fired together: each affected reactive domain is locked, has all of its
+    due contexts invalidated, and is flushed, just once.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[_Timer] = []
+        self._seq: int = 0
+        self._task: Optional[asyncio.Task[None]] = None
+        # When the task will wake up, if it's sleeping.
+        self._wake_time: float = math.inf
+        # Whether the task is firing timers. Timers that are scheduled meanwhile (e.g.,
+        # by the effects that re-run) are picked up by the task when it's done.
+        self._firing: bool = False
+        # Size of the heap after stale timers were last removed from it.
+        self._compacted_size: int = 0
+
+    def schedule(
+        self, ctx: Context, delay: float, session_domain: Optional[ReactiveDomain]
+    ) -> None:
+        """Invalidate `ctx` in `delay` seconds, unless `session_domain` is closed by
+        then."""
+        deadline = time.monotonic() + max(0, delay)
+        deadline = math.ceil(deadline * _TICKS_PER_SEC - _TICK_EPSILON) / _TICKS_PER_SEC
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, ctx, session_domain))
+        self._maybe_compact()
+
+        if self._task is not None and not self._firing and deadline < self._wake_time:
+            # The new timer is due before the task wakes up; replace it with one that
+            # wakes up in time. (This is the only time that a task is cancelled, and
+            # it's rare, since timers are usually added in order of deadline.)
+            self._task.cancel()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    def active_count(self) -> int:
+        """Return the number of timers that are waiting to fire."""
+        return sum(1 for timer in self._heap if not _is_stale(timer))
+
+    def _maybe_compact(self) -> None:
+        # Stale timers are normally dropped when they come due, but if contexts are
+        # invalidated much more often than their timers expire, they could pile up.
+        if len(self._heap) > max(64, 2 * self._compacted_size):
+            self._heap = [timer for timer in self._heap if not _is_stale(timer)]
+            heapq.heapify(self._heap)
+            self._compacted_size = len(self._heap)
+
+    async def _run(self) -> None:
+        while self._heap:
+            heap = self._heap
+            now = time.monotonic()
+            if heap[0][0] > now:
+                self._wake_time = heap[0][0]
+                try:
+                    # asyncio.sleep() is looked up each time, so that it can be mocked.
+                    await asyncio.sleep(heap[0][0] - now)
+                finally:
+                    self._wake_time = math.inf
+                continue
+
+            due: Dict[int, Tuple[ReactiveDomain, List[Context]]] = {}
+            while heap and heap[0][0] <= now:
+                timer = heapq.heappop(heap)
+                if _is_stale(timer):
+                    continue
+                ctx = timer[2]
+                if id(ctx._domain) not in due:
+                    due[id(ctx._domain)] = (ctx._domain, [])
+                due[id(ctx._domain)][1].append(ctx)
+            self._compacted_size = min(self._compacted_size, len(heap))
+
+            # Each domain is fired separately, so that one that's busy (and locked)
+            # doesn't hold up the others. Firing starts right away, so that timers set
+            # by the effects that re-run are added before this loop continues.
+            self._firing = True
+            try:
+                for domain, contexts in due.values():
+                    _utils.run_coro_hybrid(_fire(domain, contexts))
+            finally:
+                self._firing = False
+
+
+def _is_stale(timer: _Timer) -> bool:
+    session_domain = timer[3]
+    return timer[2]._invalidated or (
+        session_domain is not None and session_domain.closed
+    )
+
+
+async def _fire(domain: ReactiveDomain, contexts: List[Context]) -> None:
+    try:
+        # Only the domain that owns the contexts needs to be locked and flushed; any
+        # other domains that are affected request their own flush.
+        async with domain.lock:
+            tracer = _trace._tracer
+            if tracer is not None:
+                tracer.push_source(None, "invalidate_later")
+            try:
+                for ctx in contexts:
+                    ctx.invalidate()
+            finally:
+                if tracer is not None:
+                    tracer.pop_source()
+            await domain.flush()
+    except Exception:
+        # Nothing awaits this, so the error is only logged.
+        traceback.print_exc()
+
+
+_schedulers: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, TimerScheduler
+] = weakref.WeakKeyDictionary()
+
+
+def get_timer_scheduler() -> TimerScheduler:
+    """Return the timer scheduler for the running event loop."""
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = _schedulers[loop] = TimerScheduler()
+    return scheduler
@@ -0,0 +1,413 @@
+"""Opt-in tracing of reactive execution."""
+
+__all__ = ("Tracer", "enable_tracing", "disable_tracing", "get_tracer")
+
+import collections
+import json
+import random
+import time
+import typing
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Deque,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from ._core import Context, ReactiveDomain
+
+T = TypeVar("T")
+
+# The active tracer, if any. The reactive core checks this (and does nothing else) when
+# tracing is disabled, so it must stay a plain module attribute.
+_tracer: Optional["Tracer"] = None
+
+# (node id, label, kind, session id)
+Node = Tuple[int, str, str, Optional[str]]
+
+
+class NodeStats:
+    """Aggregated execution statistics for one reactive node."""
+
+    def __init__(self, node_id: int, label: str, kind: str) -> None:
+        self.node_id: int = node_id
+        self.label: str = label
+        self.kind: str = kind
+        self.count: int = 0
+        self.total_secs: float = 0
+        self.max_secs: float = 0
+        self.await_secs: float = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "id": self.node_id,
+            "label": self.label,
+            "kind": self.kind,
+            "count": self.count,
+            "total_secs": self.total_secs,
+            "max_secs": self.max_secs,
+            "await_secs": self.await_secs,
+        }
+
+
+class Tracer:
+    """
+    Records reactive execution: invalidation edges, Calc and Effect executions (with
+    wall time and time spent awaiting), and flushes (with the nodes that triggered
+    them).
+
+    Events are kept in a bounded ring buffer, so a tracer can be left running in
+    production. Use :func:`enable_tracing` to create and install a tracer.
+
+    Parameters
+    ----------
+    max_events
+        The maximum number of events to keep; older events are discarded.
+    sample_rate
+        The fraction (between 0 and 1) of executions and invalidations to record.
+    """
+
+    def __init__(self, max_events: int = 100_000, sample_rate: float = 1.0) -> None:
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.max_events: int = max_events
+        self.sample_rate: float = sample_rate
+        self._events: Deque[Dict[str, Any]] = collections.deque(maxlen=max_events)
+        self._start: float = time.perf_counter()
+        # Nodes whose invalidation is currently being propagated, outermost first.
+        self._sources: List[Node] = []
+        # Root sources that scheduled work in each domain since its last flush.
+        self._flush_triggers: Dict[int, Dict[int, Node]] = {}
+        self._stats: Dict[Optional[str], Dict[int, NodeStats]] = {}
+
+    # ==========================================================================
+    # Recording (called from the reactive core)
+    # ==========================================================================
+    def _sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._start) * 1e6
+
+    def push_source(self, obj: object, label: Optional[str] = None) -> None:
+        """Mark `obj` as the node whose change is being propagated."""
+        self._sources.append(_node(obj, label))
+
+    def push_node(self, node: Node) -> None:
+        self._sources.append(node)
+
+    def pop_source(self) -> None:
+        self._sources.pop()
+
+    def has_source(self) -> bool:
+        return len(self._sources) > 0
+
+    def current_source(self) -> Optional[Node]:
+        return self._sources[-1] if self._sources else None
+
+    def record_invalidation(self, ctx: "Context") -> None:
+        if not self._sources or not self._sampled():
+            return
+        source = self._sources[-1]
+        target = _node(ctx._owner)
+        self._events.append(
+            {
+                "type": "invalidate",
+                "ts": self._now_us(),
+                "source": source[0],
+                "source_label": source[1],
+                "target": target[0],
+                "target_label": target[1],
+                "target_kind": target[2],
+                "session": target[3],
+            }
+        )
+
+    def record_schedule(self, domain: "ReactiveDomain") -> None:
+        if not self._sources:
+            return
+        root = self._sources[0]
+        self._flush_triggers.setdefault(id(domain), {})[root[0]] = root
+
+    def flush_started(self, domain: "ReactiveDomain") -> Tuple[float, List[Node]]:
+        triggers = self._flush_triggers.pop(id(domain), {})
+        return self._now_us(), list(triggers.values())
+
+    def flush_finished(
+        self, domain: "ReactiveDomain", started: Tuple[float, List[Node]]
+    ) -> None:
+        start_us, triggers = started
+        self._events.append(
+            {
+                "type": "flush",
+                "ts": start_us,
+                "dur": self._now_us() - start_us,
+                "session": domain.name,
+                "triggers": [{"id": n[0], "label": n[1]} for n in triggers],
+            }
+        )
+
+    async def time_execution(self, obj: object, awaitable: Awaitable[T]) -> T:
+        """Await `awaitable` (the body of a Calc or Effect), recording an execution
+        event for `obj` if this execution is sampled."""
+        if not self._sampled():
+            return await awaitable
+
+        node = _node(obj)
+        start = time.perf_counter()
+        timed = _TimedAwaitable(awaitable)
+        try:
+            return await timed
+        finally:
+            wall = time.perf_counter() - start
+            awaited = max(0.0, wall - timed.run_secs)
+            self._events.append(
+                {
+                    "type": "exec",
+                    "ts": (start - self._start) * 1e6,
+                    "dur": wall * 1e6,
+                    "await": awaited * 1e6,
+                    "node": node[0],
+                    "label": node[1],
+                    "kind": node[2],
+                    "session": node[3],
+                }
+            )
+            self._update_stats(obj, node, wall, awaited)
+
+    def _update_stats(self, obj: object, node: Node, wall: float, awaited: float):
+        session_id = node[3]
+        if session_id not in self._stats:
+            self._stats[session_id] = {}
+            session = getattr(obj, "_session", None)
+            if session is not None:
+                # Don't hold on to statistics for sessions that have gone away.
+                session.on_ended(lambda: self._stats.pop(session_id, None))
+        stats = self._stats[session_id].get(node[0])
+        if stats is None:
+            stats = self._stats[session_id][node[0]] = NodeStats(*node[:3])
+        stats.count += 1
+        stats.total_secs += wall
+        stats.await_secs += awaited
+        stats.max_secs = max(stats.max_secs, wall)
+
+    # ==========================================================================
+    # Querying and exporting
+    # ==========================================================================
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """The recorded events, oldest first."""
+        return list(self._events)
+
+    def clear(self) -> None:
+        """Discard all recorded events and statistics."""
+        self._events.clear()
+        self._stats.clear()
+        self._flush_triggers.clear()
+
+    def slowest(
+        self, n: int = 10, session: Optional[str] = None
+    ) -> Dict[Optional[str], List[NodeStats]]:
+        """
+        Return the `n` reactive nodes with the most total execution time, per session.
+
+        Parameters
+        ----------
+        n
+            The number of nodes to return for each session.
+        session
+            If provided, only return nodes for the session with this id.
+
+        Returns
+        -------
+        A dictionary mapping session ids (``None`` for nodes outside of any session) to
+        lists of :class:`NodeStats`, slowest first.
+        """
+        res: Dict[Optional[str], List[NodeStats]] = {}
+        for session_id, nodes in self._stats.items():
+            if session is not None and session_id != session:
+                continue
+            res[session_id] = sorted(
+                nodes.values(), key=lambda s: s.total_secs, reverse=True
+            )[:n]
+        return res
+
+    def to_json(self) -> str:
+        """Export the recorded events as a JSON string."""
+        return json.dumps({"events": self.events})
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Export the recorded events in the Chrome trace-event format, which can be
+        loaded into Perfetto (https://ui.perfetto.dev) or chrome://tracing. Each session
+        is shown as a separate thread.
+        """
+        tids: Dict[Optional[str], int] = {}
+        trace_events: List[Dict[str, Any]] = []
+
+        def tid(session: Optional[str]) -> int:
+            if session not in tids:
+                tids[session] = len(tids)
+                trace_events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 1,
+                        "tid": tids[session],
+                        "args": {"name": session or "app"},
+                    }
+                )
+            return tids[session]
+
+        for e in self._events:
+            if e["type"] == "exec":
+                trace_events.append(
+                    {
+                        "name": e["label"],
+                        "cat": e["kind"],
+                        "ph": "X",
+                        "ts": e["ts"],
+                        "dur": e["dur"],
+                        "pid": 1,
+                        "tid": tid(e["session"]),
+                        "args": {"node": e["node"], "await_us": e["await"]},
+                    }
+                )
+            elif e["type"] == "flush":
+                trace_events.append(
+                    {
+                        "name": "flush",
+                        "cat": "flush",
+                        "ph": "X",
+                        "ts": e["ts"],
+                        "dur": e["dur"],
+                        "pid": 1,
+                        "tid": tid(e["session"]),
+                        "args": {"triggers": [t["label"] for t in e["triggers"]]},
+                    }
+                )
+            else:
+                trace_events.append(
+                    {
+                        "name": f"invalidate {e['target_label']}",
+                        "cat": "invalidate",
+                        "ph": "i",
+                        "s": "t",
+                        "ts": e["ts"],
+                        "pid": 1,
+                        "tid": tid(e["session"]),
+                        "args": {"source": e["source_label"]},
+                    }
+                )
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+class _TimedAwaitable(typing.Generic[T]):
+    """Wraps an awaitable and measures the time spent actually running it (as opposed
+    to waiting for whatever it awaits)."""
+
+    def __init__(self, awaitable: Awaitable[T]) -> None:
+        self._awaitable = awaitable
+        self.run_secs: float = 0
+
+    def __await__(self) -> Generator[Any, Any, T]:
+        gen = self._awaitable.__await__()
+        send_value: Any = None
+        exc: Optional[BaseException] = None
+        while True:
+            start = time.perf_counter()
+            try:
+                if exc is None:
+                    yielded = gen.send(send_value)
+                else:
+                    yielded = gen.throw(exc)
+            except StopIteration as e:
+                self.run_secs += time.perf_counter() - start
+                return e.value
+            except BaseException:
+                self.run_secs += time.perf_counter() - start
+                raise
+            self.run_secs += time.perf_counter() - start
+            try:
+                send_value = yield yielded
+                exc = None
+            except BaseException as e:
+                send_value = None
+                exc = e
+
+
+def _node(obj: object, label: Optional[str] = None) -> Node:
+    from ._reactives import Calc_, Effect_
+
+    # Check the type, rather than narrowing `obj` to a Calc_ with an unknown type.
+    cls = type(obj)
+    if issubclass(cls, Calc_):
+        kind = "calc"
+    elif issubclass(cls, Effect_):
+        kind = "effect"
+    elif obj is None:
+        # A source that isn't a reactive object, like an input message or a timer
+        kind = "trigger" if label else "isolate"
+    else:
+        kind = cls.__name__.lower()
+    if label is None:
+        name: Optional[str] = getattr(obj, "__name__", None)
+        label = name or cls.__name__
+    session: object = getattr(obj, "_session", None)
+    session_id: Optional[str] = getattr(session, "id", None)
+    return (id(obj), label, kind, session_id)
+
+
+def enable_tracing(max_events: int = 100_000, sample_rate: float = 1.0) -> Tracer:
+    """
+    Start recording reactive execution.
+
+    Parameters
+    ----------
+    max_events
+        The maximum number of events to keep in the ring buffer.
+    sample_rate
+        The fraction (between 0 and 1) of executions and invalidations to record. Lower
+        values reduce overhead in production.
+
+    Returns
+    -------
+    The installed :class:`Tracer`, which can be used to query and export the trace.
+
+    See Also
+    --------
+    ~shiny.reactive.disable_tracing
+    ~shiny.reactive.get_tracer
+    """
+    global _tracer
+    _tracer = Tracer(max_events=max_events, sample_rate=sample_rate)
+    return _tracer
+
+
+def disable_tracing() -> Optional[Tracer]:
+    """
+    Stop recording reactive execution.
+
+    Returns
+    -------
+    The tracer that was installed (if any), so its trace can still be exported.
+    """
+    global _tracer
+    tracer = _tracer
+    _tracer = None
+    return tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """
+    Get the currently installed :class:`Tracer`, or ``None`` if tracing is disabled.
+    """
+    return _tracer
@@ -18,7 +18,6 @@ __all__ = (
     "ui",
 )
 
-import base64
 import os
 import sys
 import typing
@@ -27,8 +26,10 @@ from typing import (
     Any,
     Awaitable,
     Callable,
+    Dict,
     Generic,
     Optional,
+    Tuple,
     TypeVar,
     Union,
     overload,
@@ -53,7 +54,12 @@ if TYPE_CHECKING:
 from .. import _utils
 from .._namespaces import ResolvedId
 from ..types import ImgData
-from ._try_render_plot import try_render_matplotlib, try_render_pil, try_render_plotnine
+from ._try_render_plot import (
+    RenderedImage,
+    try_render_matplotlib,
+    try_render_pil,
+    try_render_plotnine,
+)
 
 # Input type for the user-spplied function that is passed to a render.xx
 IT = TypeVar("IT")
@@ -84,6 +90,20 @@ class RenderFunction(Generic[IT, OT]):
         self._session: Session = session
         self._name: str = name
 
+    def _cache_key_extra(self) -> object:
+        """Anything besides the user's key that the rendered output depends on, for
+        :func:`~shiny.reactive.cache`. This is called reactively."""
+        return None
+
+    def _img_data(self, img: Union[RenderedImage, None]) -> Union[ImgData, None]:
+        # This is done after _run() (rather than in it) so that a cached image gets a
+        # src for the session that's showing it.
+        if img is None:
+            return None
+        res = typing.cast(ImgData, dict(img.attrs))
+        res["src"] = self._session._image_src(self._name, img.data, img.content_type)
+        return res
+
 
 # The reason for having a separate RenderFunctionAsync class is because the __call__
 # method is marked here as async; you can't have a single class where one method could
@@ -204,10 +224,9 @@ class RenderPlot(RenderFunction[object, Union[ImgData, None]]):
         self._fn: RenderPlotFuncAsync = _utils.wrap_async(fn)
 
     def __call__(self) -> Union[ImgData, None]:
-        return _utils.run_coro_sync(self._run())
-
-    async def _run(self) -> Union[ImgData, None]:
+        return self._img_data(_utils.run_coro_sync(self._run()))
 
+    def _client_dims(self) -> Tuple[float, float, float]:
         inputs = self._session.root_scope().input
 
         # Reactively read some information about the plot.
@@ -220,6 +239,13 @@ class RenderPlot(RenderFunction[object, Union[ImgData, None]]):
         height: float = typing.cast(
             float, inputs[ResolvedId(f".clientdata_output_{self._name}_height")]()
         )
+        return width, height, pixelratio
+
+    def _cache_key_extra(self) -> object:
+        return self._client_dims()
+
+    async def _run(self) -> Union[RenderedImage, None]:
+        width, height, pixelratio = self._client_dims()
 
         x = await self._fn()
 
@@ -238,7 +264,7 @@ class RenderPlot(RenderFunction[object, Union[ImgData, None]]):
         # If a try_render function returns a tuple that starts with False, then the next
         # try_render function should be tried. If none succeed, an error is raised.
         ok: bool
-        result: Union[ImgData, None]
+        result: Union[RenderedImage, None]
 
         if "plotnine" in sys.modules:
             ok, result = try_render_plotnine(
@@ -291,7 +317,7 @@ class RenderPlotAsync(RenderPlot, RenderFunctionAsync[object, Union[ImgData, Non
         super().__init__(typing.cast(RenderPlotFunc, fn), alt=alt, **kwargs)
 
     async def __call__(self) -> Union[ImgData, None]:  # type: ignore
-        return await self._run()
+        return self._img_data(await self._run())
 
 
 @overload
@@ -394,9 +420,9 @@ class RenderImage(RenderFunction[Union[ImgData, None], Union[ImgData, None]]):
         self._fn: RenderImageFuncAsync = _utils.wrap_async(fn)
 
     def __call__(self) -> Union[ImgData, None]:
-        return _utils.run_coro_sync(self._run())
+        return self._img_data(_utils.run_coro_sync(self._run()))
 
-    async def _run(self) -> Union[ImgData, None]:
+    async def _run(self) -> Union[RenderedImage, None]:
         res: Union[ImgData, None] = await self._fn()
         if res is None:
             return None
@@ -404,11 +430,13 @@ class RenderImage(RenderFunction[Union[ImgData, None], Union[ImgData, None]]):
         src: str = res.get("src")
         try:
             with open(src, "rb") as f:
-                data = base64.b64encode(f.read())
-                data_str = data.decode("utf-8")
+                data = f.read()
             content_type = _utils.guess_mime_type(src)
-            res["src"] = f"data:{content_type};base64,{data_str}"
-            return res
+            attrs = typing.cast(
+                Dict[str, Union[str, float]],
+                {k: v for k, v in res.items() if k != "src"},
+            )
+            return RenderedImage(data, content_type, attrs)
         finally:
             if self._delete_file:
                 os.remove(src)
@@ -423,7 +451,7 @@ class RenderImageAsync(
         super().__init__(typing.cast(RenderImageFunc, fn), delete_file=delete_file)
 
     async def __call__(self) -> Union[ImgData, None]:  # type: ignore
-        return await self._run()
+        return self._img_data(await self._run())
 
 
 @overload
@@ -1,16 +1,24 @@
-import base64
 import io
 import os
 import sys
-from typing import Any, BinaryIO, List, Optional, TextIO, Tuple, Union, cast
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+    cast,
+)
 
 if sys.version_info >= (3, 8):
     from typing import Literal, Protocol
 else:
     from typing_extensions import Literal, Protocol
 
-from ..types import ImgData
-
 
 # Use this protocol to avoid needing to maintain working stubs for matplotlib. If
 # good stubs ever become available for matplotlib, use those instead.
@@ -71,12 +79,24 @@ class PlotnineFigure(Protocol):
         ...
 
 
-TryPlotResult = Tuple[bool, Union[ImgData, None]]
+class RenderedImage(NamedTuple):
+    """
+    An image, as rendered by @render.plot or @render.image. It's turned into an ImgData
+    object (with a data URI or URL for its src) when it's sent to the client.
+    """
+
+    data: bytes
+    content_type: str
+    # The attributes of the <img> tag, other than src
+    attrs: Dict[str, Union[str, float]]
+
+
+TryPlotResult = Tuple[bool, Union[RenderedImage, None]]
 
 
 # Try to render a matplotlib object (or the global figure, if it's been used). If `fig`
 # is not a matplotlib object, return (False, None). If there's an error in rendering,
-# return None. If successful in rendering, return an ImgData object.
+# return None. If successful in rendering, return a RenderedImage object.
 def try_render_matplotlib(
     x: object,
     width: float,
@@ -105,24 +125,21 @@ def try_render_matplotlib(
                 bbox_inches=bbox_inches,
                 **kwargs,
             )
-            buf.seek(0)
-            data = base64.b64encode(buf.read())
-            data_str = data.decode("utf-8")
+            data = buf.getvalue()
 
         # N.B. matplotlib.tight_layout() causes the intrinsic file size can be different
         # from the requested size (i.e., the container size). So, scale the image to fit
         # in the container while preserving the aspect ratio.
-        res: ImgData = {
-            "src": "data:image/png;base64," + data_str,
+        attrs: Dict[str, Union[str, float]] = {
             "width": "100%",
             "height": "100%",
             "style": "object-fit:contain",
         }
 
         if alt is not None:
-            res["alt"] = alt
+            attrs["alt"] = alt
 
-        return (True, res)
+        return (True, RenderedImage(data, "image/png", attrs))
 
     finally:
         import matplotlib.pyplot  # pyright: ignore[reportMissingTypeStubs]
@@ -209,21 +226,18 @@ def try_render_pil(
 
     with io.BytesIO() as buf:
         x.save(buf, format="PNG", **kwargs)
-        buf.seek(0)
-        data = base64.b64encode(buf.read())
-        data_str = data.decode("utf-8")
+        data = buf.getvalue()
 
-    res: ImgData = {
-        "src": "data:image/png;base64," + data_str,
+    attrs: Dict[str, Union[str, float]] = {
         "width": "100%",
         "height": "100%",
         "style": "object-fit:contain",
     }
 
     if alt is not None:
-        res["alt"] = alt
+        attrs["alt"] = alt
 
-    return (True, res)
+    return (True, RenderedImage(data, "image/png", attrs))
 
 
 def try_render_plotnine(
@@ -256,18 +270,15 @@ def try_render_plotnine(
             bbox_inches=bbox_inches,
             **kwargs,
         )
-        buf.seek(0)
-        data = base64.b64encode(buf.read())
-        data_str = data.decode("utf-8")
+        data = buf.getvalue()
 
-    res: ImgData = {
-        "src": "data:image/png;base64," + data_str,
+    attrs: Dict[str, Union[str, float]] = {
         "width": "100%",
         "height": "100%",
         "style": "object-fit:contain",
     }
 
     if alt is not None:
-        res["alt"] = alt
+        attrs["alt"] = alt
 
-    return (True, res)
+    return (True, RenderedImage(data, "image/png", attrs))
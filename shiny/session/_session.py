@@ -1,10 +1,14 @@
 __all__ = ("Session", "Inputs", "Outputs")
 
+import asyncio
+import base64
 import contextlib
 import dataclasses
 import enum
 import functools
+import hashlib
 import json
+import operator
 import os
 import re
 import sys
@@ -23,6 +27,7 @@ from typing import (
     Iterable,
     List,
     Optional,
+    Tuple,
     TypeVar,
     Union,
     cast,
@@ -30,7 +35,12 @@ from typing import (
 )
 
 from starlette.requests import HTTPConnection, Request
-from starlette.responses import HTMLResponse, PlainTextResponse, StreamingResponse
+from starlette.responses import (
+    HTMLResponse,
+    PlainTextResponse,
+    Response,
+    StreamingResponse,
+)
 from starlette.types import ASGIApp
 
 if sys.version_info >= (3, 8):
@@ -43,15 +53,16 @@ from htmltools import TagChildArg, TagList
 if TYPE_CHECKING:
     from .._app import App
 
-from .. import _utils, render
+from .. import _compression, _json, _utils, render
 from .._connection import Connection, ConnectionClosed
 from .._docstring import add_example
 from .._fileupload import FileInfo, FileUploadManager
 from .._namespaces import Id, ResolvedId, Root
 from ..http_staticfiles import FileResponse
 from ..input_handler import input_handlers
-from ..reactive import Effect, Effect_, Value, flush, isolate
-from ..reactive._core import lock, on_flushed
+from ..reactive import Effect, Effect_, Value, batch, isolate
+from ..reactive import _trace
+from ..reactive._core import ReactiveDomain
 from ..render import RenderFunction
 from ..types import SafeException, SilentCancelOutputException, SilentException
 from ._utils import RenderedDeps, read_thunk_opt, session_context
@@ -136,6 +147,54 @@ def empty_outbound_message_queues() -> OutBoundMessageQueues:
     return {"values": [], "input_messages": [], "errors": []}
 
 
+# The order in which the client handles the parts of a message (`messageHandlerOrder`
+# in shiny.js), regardless of their order in the message.
+_client_message_order: Dict[str, int] = {
+    k: i
+    for i, k in enumerate(
+        (
+            "values",
+            "errors",
+            "inputMessages",
+            "javascript",
+            "console",
+            "progress",
+            "notification",
+            "modal",
+            "response",
+            "allowReconnect",
+            "custom",
+            "config",
+            "busy",
+            "recalculating",
+            "reload",
+            "shiny-insert-ui",
+            "shiny-remove-ui",
+        )
+    )
+}
+
+
+def _can_combine(frame: Dict[str, object], message: Dict[str, object]) -> bool:
+    # A message can be added to a frame only if the client would handle it after
+    # everything that's already in the frame, as it would if it were sent separately.
+    # (A frame can't have two parts of the same type, so this also rules that out.)
+    try:
+        last = max(_client_message_order[k] for k in frame)
+        first = min(_client_message_order[k] for k in message)
+    except (KeyError, ValueError):
+        return False
+    return first > last
+
+
+def _value_digest(value: object) -> Optional[bytes]:
+    try:
+        value_str = _json.dumps(value)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.blake2b(value_str.encode("utf-8"), digest_size=16).digest()
+
+
 # Makes isinstance(x, Session) also return True when x is a SessionProxy (i.e., a module
 # session)
 class SessionMeta(type):
@@ -175,7 +234,7 @@ class Session(object, metaclass=SessionMeta):
         self.http_conn: HTTPConnection = conn.get_http_conn()
 
         self.input: Inputs = Inputs(dict())
-        self.output: Outputs = Outputs(self, self.ns, dict(), dict())
+        self.output: Outputs = Outputs(self, self.ns, dict(), dict(), dict())
 
         self.user: Union[str, None] = None
         self.groups: Union[List[str], None] = None
@@ -197,6 +256,22 @@ class Session(object, metaclass=SessionMeta):
                 print("Error parsing credentials header: " + str(e))
 
         self._outbound_message_queues = empty_outbound_message_queues()
+        # Messages sent with _send_message_sync() wait here until the end of the event
+        # loop tick, so that several of them can go out in one frame.
+        self._pending_frame: Optional[Dict[str, object]] = None
+        # The number of effects that are scheduled or running; the client is told when
+        # the session becomes busy and when it becomes idle again.
+        self._busy_count: int = 0
+
+        # Each session has its own reactive domain, with its own lock and flush queue,
+        # so that an `await` in one session's reactive code doesn't block the others.
+        self._reactive_domain: ReactiveDomain = ReactiveDomain(
+            request_flush=self._request_flush,
+            name=id,
+            concurrent=app._concurrent_flush,
+            max_concurrency=app._max_flush_concurrency,
+            time_slice=app._flush_time_slice,
+        )
 
         self._message_handlers: Dict[
             str, Callable[..., Awaitable[object]]
@@ -206,6 +281,10 @@ class Session(object, metaclass=SessionMeta):
         self._has_run_session_end_tasks: bool = False
         self._downloads: Dict[str, DownloadInfo] = {}
         self._dynamic_routes: Dict[str, DynamicRouteHandler] = {}
+        # With App(image_urls=True), the images of outputs, by output name and digest.
+        # The previous image of each output is kept as well, in case the client is
+        # still fetching it when a new one is rendered.
+        self._images: Dict[str, Dict[str, Tuple[bytes, str]]] = {}
 
         self._register_session_end_callbacks()
 
@@ -218,6 +297,8 @@ class Session(object, metaclass=SessionMeta):
 
         # Clear file upload directories, if present
         self.on_ended(self._file_upload_manager.rm_upload_dir)
+        # Drop any reactive work that is still pending for this session
+        self.on_ended(self._reactive_domain.close)
 
     def _run_session_end_tasks(self) -> None:
         if self._has_run_session_end_tasks:
@@ -261,9 +342,7 @@ class Session(object, metaclass=SessionMeta):
                         print("RECV: " + message, flush=True)
 
                     try:
-                        message_obj = json.loads(
-                            message, object_hook=_utils.lists_to_tuples
-                        )
+                        message_obj = _json.loads(message)
                     except json.JSONDecodeError:
                         warnings.warn("ERROR: Invalid JSON message", SessionWarning)
                         return
@@ -272,15 +351,16 @@ class Session(object, metaclass=SessionMeta):
                         self._send_error_response("Message does not contain 'method'.")
                         return
 
-                    async with lock():
+                    async with self._reactive_domain.lock:
 
                         if message_obj["method"] == "init":
                             verify_state(ConnectionState.Start)
 
-                            # When a reactive flush occurs, flush the session's outputs,
-                            # errors, etc. to the client. Note that this is
-                            # `reactive._core.on_flushed`, not `self.on_flushed`.
-                            unreg = on_flushed(self._flush)
+                            # When the session's reactive domain is flushed, flush the
+                            # session's outputs, errors, etc. to the client. Note that
+                            # this is `ReactiveDomain.on_flushed`, not
+                            # `self.on_flushed`.
+                            unreg = self._reactive_domain.on_flushed(self._flush)
                             # When the session ends, stop flushing outputs on reactive
                             # flush.
                             stack.callback(unreg)
@@ -311,7 +391,7 @@ class Session(object, metaclass=SessionMeta):
 
                         self._request_flush()
 
-                        await flush()
+                        await self._reactive_domain.flush()
 
             except ConnectionClosed:
                 ...
@@ -326,23 +406,35 @@ class Session(object, metaclass=SessionMeta):
                 self._run_session_end_tasks()
 
     def _manage_inputs(self, data: Dict[str, object]) -> None:
-        for (key, val) in data.items():
-            keys = key.split(":")
-            if len(keys) > 2:
-                raise ValueError(
-                    "Input name+type is not allowed to contain more than one ':' -- "
-                    + key
-                )
-            if len(keys) == 2:
-                val = input_handlers._process_value(keys[1], val, keys[0], self)
-
-            # The keys[0] value is already a fully namespaced id; make that explicit by
-            # wrapping it in ResolvedId, otherwise self.input will throw an id
-            # validation error.
-            self.input[ResolvedId(keys[0])]._set(val)
+        # Invalidate each dependent once, after all of the inputs have been set.
+        with batch():
+            for (key, val) in data.items():
+                self._manage_input(key, val)
 
         self.output._manage_hidden()
 
+    def _manage_input(self, key: str, val: object) -> None:
+        keys = key.split(":")
+        if len(keys) > 2:
+            raise ValueError(
+                "Input name+type is not allowed to contain more than one ':' -- " + key
+            )
+        if len(keys) == 2:
+            val = input_handlers._process_value(keys[1], val, keys[0], self)
+
+        # The keys[0] value is already a fully namespaced id; make that explicit by
+        # wrapping it in ResolvedId, otherwise self.input will throw an id
+        # validation error.
+        tracer = _trace._tracer
+        if tracer is None:
+            self.input[ResolvedId(keys[0])]._set(val)
+        else:
+            tracer.push_source(None, "input:" + keys[0])
+            try:
+                self.input[ResolvedId(keys[0])]._set(val)
+            finally:
+                tracer.pop_source()
+
     def _is_hidden(self, name: str) -> bool:
         with isolate():
             # The .clientdata_output_{name}_hidden string is already a fully namespaced
@@ -526,6 +618,18 @@ class Session(object, metaclass=SessionMeta):
                             media_type=content_type,  # type: ignore
                         )
 
+        elif action == "image" and request.method == "GET" and subpath:
+            image = self._images.get(subpath, {}).get(request.query_params.get("v", ""))
+            if image is None:
+                return HTMLResponse("<h1>Not Found</h1>", 404)
+            data, content_type = image
+            # The URL changes whenever the image does
+            return Response(
+                data,
+                media_type=content_type,
+                headers={"Cache-Control": "private, max-age=31536000, immutable"},
+            )
+
         elif action == "dynamic_route" and request.method == "GET" and subpath:
             name = subpath
             handler = self._dynamic_routes.get(name, None)
@@ -603,24 +707,66 @@ class Session(object, metaclass=SessionMeta):
         await self._send_message({"custom": {type: message}})
 
     async def _send_message(self, message: Dict[str, object]) -> None:
-        message_str: str = json.dumps(message) + "\n"
+        frame = self._pending_frame
+        self._pending_frame = None
+        if frame is not None:
+            if _can_combine(frame, message):
+                frame.update(message)
+                message = frame
+            else:
+                _utils.run_coro_hybrid(self._send_frame(frame))
+        await self._send_frame(message)
+
+    def _send_message_sync(self, message: Dict[str, object]) -> None:
+        """
+        Same as _send_message, except that the message isn't sent right away: it waits
+        until the end of the current event loop tick, and goes out in the same frame as
+        other messages sent in the meantime, where the client's handling of them allows
+        it.
+        """
+        frame = self._pending_frame
+        if frame is not None and _can_combine(frame, message):
+            frame.update(message)
+            return
+        self._send_pending_frame()
+        self._pending_frame = dict(message)
+        try:
+            asyncio.get_running_loop().call_soon(self._send_pending_frame)
+        except RuntimeError:
+            self._send_pending_frame()
+
+    def _send_pending_frame(self) -> None:
+        frame = self._pending_frame
+        self._pending_frame = None
+        if frame is not None:
+            # If the message isn't too large and the socket isn't too backed up, then
+            # it may be sent synchronously instead of having to wait until the current
+            # task yields.
+            _utils.run_coro_hybrid(self._send_frame(frame))
+
+    async def _send_frame(self, message: Dict[str, object]) -> None:
+        message_str: str = _json.dumps(message)
         if self._debug:
             print(
                 "SEND: "
                 + re.sub("(?m)base64,[a-zA-Z0-9+/=]+", "[base64 data]", message_str),
-                end="",
                 flush=True,
             )
-        await self._conn.send(json.dumps(message))
+        if _compression.is_precompressed(message_str):
+            with _compression.precompressed():
+                await self._conn.send(message_str)
+        else:
+            await self._conn.send(message_str)
 
-    def _send_message_sync(self, message: Dict[str, object]) -> None:
-        """
-        Same as _send_message, except that if the message isn't too large and the socket
-        isn't too backed up, then the message may be sent synchronously instead of
-        having to wait until the current task yields (and potentially much longer than
-        that, if there is a lot of contention for the main thread).
-        """
-        _utils.run_coro_hybrid(self._send_message(message))
+    def _increment_busy_count(self) -> None:
+        self._busy_count += 1
+        if self._busy_count == 1:
+            self._send_message_sync({"busy": "busy"})
+
+    def _decrement_busy_count(self) -> None:
+        self._busy_count -= 1
+        if self._busy_count == 0:
+            self._send_message_sync({"busy": "idle"})
 
     def _send_error_response(self, message_str: str) -> None:
         print("_send_error_response: " + message_str)
@@ -668,8 +814,18 @@ class Session(object, metaclass=SessionMeta):
         return self._flushed_callbacks.register(fn, once)
 
     def _request_flush(self) -> None:
+        # If the domain's lock is held, whoever holds it will flush before releasing
+        # it, so there's no need to schedule another flush.
+        if self._reactive_domain.is_locked():
+            return
         self.app._request_flush(self)
 
+    async def _flush_deferred(self) -> None:
+        """Flush this session's reactive domain on behalf of someone who didn't hold
+        its lock (e.g. another session, or an app-level effect)."""
+        async with self._reactive_domain.lock:
+            await self._reactive_domain.flush()
+
     async def _flush(self) -> None:
         with session_context(self):
             self._flush_callbacks.invoke()
@@ -799,6 +955,24 @@ class Session(object, metaclass=SessionMeta):
         nonce = _utils.rand_hex(8)
         return f"session/{urllib.parse.quote(self.id)}/dynamic_route/{urllib.parse.quote(name)}?nonce={urllib.parse.quote(nonce)}"
 
+    def _image_src(self, name: str, data: bytes, content_type: str) -> str:
+        """The src of an output's image: a data URI, or (with App(image_urls=True)) the
+        URL it's served from."""
+        if not self.app._image_urls:
+            data_str = base64.b64encode(data).decode("ascii")
+            return f"data:{content_type};base64,{data_str}"
+
+        digest = hashlib.blake2b(data, digest_size=8).hexdigest()
+        images = self._images.setdefault(name, {})
+        images.pop(digest, None)
+        images[digest] = (data, content_type)
+        while len(images) > 2:
+            del images[next(iter(images))]
+        return (
+            f"session/{urllib.parse.quote(self.id)}/image/{urllib.parse.quote(name)}"
+            f"?v={digest}"
+        )
+
     def _process_ui(self, ui: TagChildArg) -> RenderedDeps:
 
         res = TagList(ui).render()
@@ -831,6 +1005,7 @@ class SessionProxy:
             session=cast(Session, self),
             effects=self.output._effects,
             suspend_when_hidden=self.output._suspend_when_hidden,
+            value_digests=self.output._value_digests,
             ns=ns,
         )
 
@@ -890,8 +1065,12 @@ class Inputs:
         # Auto-populate key if accessed but not yet set. Needed to take reactive
         # dependencies on input values that haven't been received from client
         # yet.
+        #
+        # Input values compare by identity rather than by value: the client only
+        # resends an unchanged value for event-priority inputs (like clicks), and
+        # those must still invalidate dependents.
         if key not in self._map:
-            self._map[key] = Value[Any](read_only=True)
+            self._map[key] = Value[Any](read_only=True, equals=operator.is_)
 
         return self._map[key]
 
@@ -929,11 +1108,15 @@ class Outputs:
         ns: Callable[[str], str],
         effects: Dict[str, Effect_],
         suspend_when_hidden: Dict[str, bool],
+        value_digests: Dict[str, bytes],
     ) -> None:
         self._session = session
         self._ns = ns
         self._effects = effects
         self._suspend_when_hidden = suspend_when_hidden
+        # A digest of the last value sent for each output, so that a value the client
+        # already has isn't sent again.
+        self._value_digests = value_digests
 
     @overload
     def __call__(self, fn: RenderFunction[Any, Any]) -> None:
@@ -982,6 +1165,7 @@ class Outputs:
 
             if output_name in self._effects:
                 self._effects[output_name].destroy()
+            self._value_digests.pop(output_name, None)
 
             self._suspend_when_hidden[output_name] = suspend_when_hidden
 
@@ -990,14 +1174,18 @@ class Outputs:
                 priority=priority,
             )
             async def output_obs():
-                await self._session._send_message(
-                    {"recalculating": {"name": output_name, "status": "recalculating"}}
-                )
+                # A synchronous render function finishes before anything else can be
+                # sent, so there's no point in telling the client that it's
+                # recalculating until it's known that the value changed.
+                is_async = _utils.is_async_callable(fn)
+                if is_async:
+                    await self._send_recalculating(output_name, "recalculating")
 
                 message: Dict[str, Optional[OT]] = {}
                 try:
-                    if _utils.is_async_callable(fn):
-                        message[output_name] = await fn()
+                    if is_async:
+                        fn_async = typing.cast(Callable[[], Awaitable[OT]], fn)
+                        message[output_name] = await fn_async()
                     else:
                         message[output_name] = fn()
                 except SilentCancelOutputException:
@@ -1025,16 +1213,33 @@ class Outputs:
                         }
                     }
                     self._session._outbound_message_queues["errors"].append(err_message)
+                    # The client drops its value for the output when it gets an error
+                    self._value_digests.pop(output_name, None)
+
+                if output_name in message:
+                    digest = _value_digest(message[output_name])
+                    if digest is not None and digest == self._value_digests.get(
+                        output_name
+                    ):
+                        if is_async:
+                            await self._send_recalculating(output_name, "recalculated")
+                        return
+                    if digest is None:
+                        self._value_digests.pop(output_name, None)
+                    else:
+                        self._value_digests[output_name] = digest
 
                 self._session._outbound_message_queues["values"].append(message)
 
-                await self._session._send_message(
-                    {"recalculating": {"name": output_name, "status": "recalculated"}}
-                )
+                if not is_async:
+                    await self._send_recalculating(output_name, "recalculating")
+                await self._send_recalculating(output_name, "recalculated")
 
             output_obs.on_invalidate(
                 lambda: self._session._send_progress("binding", {"id": output_name})
             )
+            # Name the effect after its output, so it's identifiable (e.g. in traces).
+            output_obs.__name__ = "output:" + output_name
 
             self._effects[output_name] = output_obs
 
@@ -1045,10 +1250,19 @@ class Outputs:
         else:
             return set_fn(fn)
 
+    async def _send_recalculating(self, name: str, status: str) -> None:
+        await self._session._send_message(
+            {"recalculating": {"name": name, "status": status}}
+        )
+
     def _manage_hidden(self) -> None:
         "Suspends execution of hidden outputs and resumes execution of visible outputs."
         output_names = list(self._suspend_when_hidden.keys())
         for name in output_names:
+            if self._session._is_hidden(name):
+                # Send the value again once the output is shown, in case the client
+                # didn't keep it.
+                self._value_digests.pop(name, None)
             if self._should_suspend(name):
                 self._effects[name].suspend()
             else:
@@ -23,7 +23,7 @@ from datetime import date
 from typing import List, Mapping, Optional, Tuple, Union
 
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import Response
 
 if sys.version_info >= (3, 11):
     from typing import NotRequired
@@ -38,6 +38,7 @@ else:
 from htmltools import TagChildArg
 
 from .._docstring import add_example, doc_format
+from .._json import JSONResponse
 from .._namespaces import resolve_id
 from .._utils import drop_none
 from ..session import Session, require_active_session
@@ -0,0 +1,198 @@
+"""Tests for `shiny.reactive.cache`."""
+
+import asyncio
+from typing import List
+
+import pytest
+
+from shiny import render
+from shiny.reactive import *
+from shiny.reactive._cache import _LRUCache
+from shiny.types import MISSING
+
+from .mocktime import MockTime
+
+
+@pytest.mark.asyncio
+async def test_cache_calc():
+    x = Value(1)
+    other = Value(0)
+    runs: List[int] = []
+
+    @cache(key=lambda: x(), scope="session")
+    @Calc
+    def doubled() -> int:
+        other()
+        runs.append(x())
+        return x() * 2
+
+    vals: List[int] = []
+
+    @Effect()
+    def _():
+        vals.append(doubled())
+
+    await flush()
+    x.set(2)
+    await flush()
+    x.set(1)
+    await flush()
+    assert vals == [2, 4, 2]
+    # Going back to x == 1 was a cache hit
+    assert runs == [1, 2]
+
+    # On a cache hit, the calc doesn't depend on what the calculation read
+    other.set(1)
+    await flush()
+    assert runs == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_cache_app_scope_dedupes_concurrent_misses():
+    release = asyncio.Event()
+    runs: List[int] = []
+    x = Value(1)
+
+    def make_calc():
+        # Calcs with the same cache id share a cache when scope="app"
+        @cache(key=lambda: x(), scope="app", id="dedupe")
+        @Calc
+        async def slow() -> int:
+            runs.append(x())
+            await release.wait()
+            return x() * 10
+
+        return slow
+
+    calc_a = make_calc()
+    calc_b = make_calc()
+    vals: List[int] = []
+
+    @Effect()
+    async def _():
+        vals.append(await calc_a())
+
+    @Effect()
+    async def _():
+        vals.append(await calc_b())
+
+    flushed = asyncio.ensure_future(flush())
+    for _i in range(5):
+        await asyncio.sleep(0)
+    release.set()
+    await flushed
+    # The flush is sequential, so the second effect hits the cache; either way, the
+    # slow calculation only ran once.
+    assert vals == [10, 10]
+    assert runs == [1]
+
+
+@pytest.mark.asyncio
+async def test_cache_closures_dont_share_results():
+    # Calcs made from the same code, but capturing different values, don't share
+    # results by default.
+    x = Value(1)
+
+    def make_calc(scale: int):
+        @cache(key=lambda: x())
+        @Calc
+        def scaled() -> int:
+            return x() * scale
+
+        return scaled
+
+    calcs = [make_calc(1), make_calc(100)]
+    vals: List[int] = []
+
+    @Effect()
+    def _():
+        vals.extend(calc() for calc in calcs)
+
+    await flush()
+    assert vals == [1, 100]
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_pending_dedupe():
+    store = _LRUCache()
+    release = asyncio.Event()
+    runs: List[int] = []
+
+    async def compute() -> str:
+        runs.append(1)
+        await release.wait()
+        return "value"
+
+    a = asyncio.ensure_future(store.get_or_compute("k", compute))
+    b = asyncio.ensure_future(store.get_or_compute("k", compute))
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(a, b) == ["value", "value"]
+    assert runs == [1]
+
+
+@pytest.mark.asyncio
+async def test_lru_cache_eviction():
+    store = _LRUCache(max_items=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+    # "b" was least recently used
+    assert store.get("b") is MISSING
+    assert store.get("a") == 1 and store.get("c") == 3
+
+    store = _LRUCache(max_bytes=3000)
+    store.set("a", "x" * 1000)
+    store.set("b", "x" * 1000)
+    store.set("c", "x" * 1000)
+    assert len(store) == 2 and store.get("a") is MISSING
+    assert store.size_bytes <= 3000
+    # Too big to cache at all
+    store.set("d", "x" * 5000)
+    assert store.get("d") is MISSING and len(store) == 2
+
+    mock_time = MockTime()
+    with mock_time():
+        store = _LRUCache(ttl=10)
+        store.set("a", 1)
+        await mock_time.advance_time(5)
+        assert store.get("a") == 1
+        await mock_time.advance_time(6)
+        assert store.get("a") is MISSING
+
+
+@pytest.mark.asyncio
+async def test_cache_render_function():
+    x = Value("a")
+    runs: List[str] = []
+
+    @cache(key=lambda: x(), scope="session")
+    @render.text
+    def out():
+        runs.append(x())
+        return x().upper()
+
+    out._name = "out"
+
+    with isolate():
+        assert out() == "A"
+        x.set("b")
+        assert out() == "B"
+        x.set("a")
+        assert out() == "A"
+    assert runs == ["a", "b"]
+
+
+def test_cache_errors():
+    with pytest.raises(TypeError):
+
+        @cache(key=lambda: 1)  # type: ignore
+        def _():  # pyright: ignore[reportUnusedFunction]
+            return 1
+
+    with pytest.raises(ValueError):
+        cache(key=lambda: 1, scope="global")  # type: ignore
+
+    with pytest.raises(ValueError):
+        cache(key=lambda: 1, scope="app")
@@ -0,0 +1,50 @@
+"""Tests for `shiny._compression` and `shiny._ws_compression`."""
+
+import base64
+import os
+from typing import List
+
+from websockets.extensions.permessage_deflate import PerMessageDeflate
+from websockets.frames import Frame, Opcode
+
+from shiny import _compression, _ws_compression
+
+
+def test_threshold_and_precompressed():
+    factory = _ws_compression._PerMessageDeflateFactory(
+        level=6, threshold=100, skip_precompressed=True
+    )
+    _, server = factory.process_request_params([], [])
+    # The client's side of the connection, which decodes what the server sends
+    client = PerMessageDeflate(False, False, 12, 12)
+
+    png = '{"src":"data:image/png;base64,%s"}' % base64.b64encode(
+        os.urandom(3000)
+    ).decode("ascii")
+    html = "<tr><td>1</td><td>2</td></tr>" * 100
+    before = _compression.compression_stats()
+
+    sent: List[Frame] = []
+    for msg in ["small", html, png, html, "small"]:
+        if _compression.is_precompressed(msg):
+            with _compression.precompressed():
+                frame = server.encode(Frame(Opcode.TEXT, msg.encode()))
+        else:
+            frame = server.encode(Frame(Opcode.TEXT, msg.encode()))
+        sent.append(frame)
+        assert bytes(client.decode(frame).data).decode() == msg
+
+    # Only the HTML messages are compressed; the rest are sent as is
+    assert [f.rsv1 for f in sent] == [False, True, False, True, False]
+    assert len(sent[1].data) < len(html) / 10
+
+    after = _compression.compression_stats()
+    assert after.messages - before.messages == 5
+    assert after.compressed - before.compressed == 2
+    assert after.skipped_small - before.skipped_small == 2
+    assert after.skipped_precompressed - before.skipped_precompressed == 1
+    assert after.bytes_in - before.bytes_in == 2 * len(html)
+    assert after.ratio > 1
+
+    assert not _compression.is_precompressed(html)
+    assert not _compression.is_precompressed('{"src":"data:image/svg+xml;base64,AAAA"}')
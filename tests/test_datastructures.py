@@ -1,5 +1,7 @@
 """Tests for `shiny.datastructures`."""
 
+import pytest
+
 from shiny._datastructures import PriorityQueueFIFO
 
 
@@ -17,3 +19,63 @@ def test_priority_queue_fifo():
     assert q.get() == "7"
     assert q.get() == "9"
     assert q.get() == "8"
+
+
+def test_priority_queue_fifo_remove():
+    q: PriorityQueueFIFO[str] = PriorityQueueFIFO()
+    q.put(1, "a")
+    q.put(1, "b")
+    q.put(1, "c")
+    assert q.qsize() == 3
+
+    assert q.remove("b") is True
+    assert q.remove("b") is False
+    assert "b" not in q
+    assert len(q) == 2
+
+    assert q.get() == "a"
+    assert q.get() == "c"
+    assert q.empty()
+
+
+def test_priority_queue_fifo_set_priority():
+    q: PriorityQueueFIFO[str] = PriorityQueueFIFO()
+    q.put(1, "a")
+    q.put(1, "b")
+    q.put(2, "c")
+    q.put(2, "d")
+
+    # Moving an item to another priority level keeps its original insertion order
+    # relative to the items already at that level.
+    assert q.set_priority("a", 2) is True
+    assert q.set_priority("x", 2) is False
+    # Putting an item that's already queued changes its priority.
+    q.put(0, "c")
+    q.put(0, "c")
+    assert q.qsize() == 4
+
+    assert [q.get() for _ in range(4)] == ["a", "d", "b", "c"]
+    assert q.empty()
+
+
+def test_priority_queue_fifo_peek_priority():
+    q: PriorityQueueFIFO[str] = PriorityQueueFIFO()
+    q.put(1, "a")
+    q.put(3, "b")
+    assert q.peek_priority() == 3
+    q.remove("b")
+    assert q.peek_priority() == 1
+    assert q.get() == "a"
+    with pytest.raises(IndexError):
+        q.peek_priority()
+
+
+def test_priority_queue_fifo_compacts():
+    q: PriorityQueueFIFO[int] = PriorityQueueFIFO()
+    for i in range(1000):
+        q.put(0, i)
+    for i in range(999):
+        q.remove(i)
+    assert q.qsize() == 1
+    assert len(q._heap) < 100
+    assert q.get() == 999
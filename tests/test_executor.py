@@ -0,0 +1,139 @@
+"""Tests for running functions in executors with `reactive.run_in_executor()`."""
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import List
+
+import pytest
+
+from shiny import render
+from shiny.reactive import *
+
+
+def times_ten(x: int) -> int:
+    return x * 10
+
+
+def get_pid() -> int:
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_thread():
+    x = Value(1)
+    threads: List[int] = []
+
+    def in_thread(val: int) -> int:
+        threads.append(threading.get_ident())
+        return val * 2
+
+    @Calc()
+    async def doubled() -> int:
+        return await run_in_executor(in_thread, x())
+
+    def reads_value() -> int:
+        return x() * 2
+
+    vals: List[int] = []
+    errors: List[str] = []
+
+    @Effect()
+    async def _():
+        vals.append(await doubled())
+        try:
+            await run_in_executor(reads_value)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    await flush()
+    x.set(2)
+    await flush()
+    # The calculation depends on the values that were read before calling into the
+    # executor, so it re-runs when they change.
+    assert vals == [2, 4]
+    assert threading.get_ident() not in threads
+    # The reactive graph can't be used from the worker thread
+    assert len(errors) == 2 and "executor" in errors[0]
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_process():
+    x = Value(1)
+    vals: List[int] = []
+
+    @Effect()
+    async def _():
+        vals.append(await run_in_executor(get_pid, executor="process"))
+        vals.append(await run_in_executor(times_ten, x(), executor="process"))
+
+    await flush()
+    x.set(2)
+    await flush()
+    assert vals[0] != os.getpid()
+    assert vals[1:] == [10, vals[0], 20]
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_discards_stale_run():
+    x = Value(1)
+    started = threading.Event()
+    release = threading.Event()
+    runs: List[int] = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+
+        def slow_fn(val: int) -> int:
+            runs.append(val)
+            if val == 1:
+                started.set()
+                release.wait(5)
+            return val * 10
+
+        @Calc
+        async def slow() -> int:
+            return await run_in_executor(slow_fn, x(), executor=pool)
+
+        vals: List[int] = []
+
+        @Effect()
+        async def _():
+            vals.append(await slow())
+
+        flushed = asyncio.ensure_future(flush())
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+
+        # Invalidate the Calc while it's running; its result is thrown away, and the
+        # effect re-runs with the new value.
+        x.set(2)
+        release.set()
+        await flushed
+        await flush()
+
+    assert runs == [1, 2]
+    assert vals == [20]
+
+
+@pytest.mark.asyncio
+async def test_render_run_in_executor():
+    @render.text
+    async def out():
+        return str(await run_in_executor(threading.get_ident))
+
+    with isolate():
+        assert await out._run() != str(threading.get_ident())
+
+
+@pytest.mark.asyncio
+async def test_run_in_executor_errors():
+    async def async_fn() -> int:
+        return 1
+
+    with isolate():
+        with pytest.raises(TypeError):
+            await run_in_executor(async_fn)
+
+        with pytest.raises(ValueError):
+            await run_in_executor(times_ten, 1, executor="threads")  # type: ignore
@@ -0,0 +1,81 @@
+"""Tests for `shiny._json`."""
+
+import datetime
+import json
+
+import pytest
+
+from shiny import _json
+
+
+@pytest.fixture(params=["json", "orjson"])
+def backend(request: pytest.FixtureRequest):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    old = _json.get_backend()
+    _json.set_backend(request.param)
+    yield request.param
+    _json.set_backend(old)
+
+
+def test_roundtrip(backend: str):
+    msg = {
+        "values": {"x": [1, 2.5, "a", None, True], "y": {"z": (1, 2)}},
+        "when": datetime.datetime(2022, 1, 2, 3, 4, 5),
+        "day": datetime.date(2022, 1, 2),
+    }
+    s = _json.dumps(msg)
+    assert isinstance(s, str)
+    assert json.loads(s) == {
+        "values": {"x": [1, 2.5, "a", None, True], "y": {"z": [1, 2]}},
+        "when": "2022-01-02T03:04:05",
+        "day": "2022-01-02",
+    }
+    # Lists are decoded as tuples
+    assert _json.loads(s)["values"] == {
+        "x": (1, 2.5, "a", None, True),
+        "y": {"z": (1, 2)},
+    }
+
+    assert json.loads(_json.dumps({"big": 2**70})) == {"big": 2**70}
+    with pytest.raises(TypeError):
+        _json.dumps({"x": object()})
+    with pytest.raises(json.JSONDecodeError):
+        _json.loads("{")
+
+
+def test_numpy_pandas(backend: str):
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+
+    msg = {
+        "array": np.arange(3),
+        "matrix": np.array([[1.5, 2.5], [3.5, 4.5]]),
+        "scalar": np.float32(1.5),
+        "int": np.int64(7),
+        "bool": np.bool_(True),
+        "timestamp": pd.Timestamp("2022-01-02T03:04:05"),
+        "series": pd.Series([1, 2, 3]),
+        "frame": pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}),
+    }
+    assert json.loads(_json.dumps(msg)) == {
+        "array": [0, 1, 2],
+        "matrix": [[1.5, 2.5], [3.5, 4.5]],
+        "scalar": 1.5,
+        "int": 7,
+        "bool": True,
+        "timestamp": "2022-01-02T03:04:05",
+        "series": [1, 2, 3],
+        "frame": [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}],
+    }
+
+
+def test_json_response(backend: str):
+    res = _json.JSONResponse({"a": (1, 2), "t": datetime.date(2022, 1, 2)})
+    assert json.loads(bytes(res.body)) == {"a": [1, 2], "t": "2022-01-02"}
+    assert res.headers["content-type"] == "application/json"
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        _json.set_backend("simplejson")
@@ -1,11 +1,12 @@
 """Tests for polling-related functionality."""
 
+import asyncio
 import os
 import tempfile
 from enum import Enum
 from random import random
 from types import TracebackType
-from typing import Any, Callable, Dict, Optional, Type, cast
+from typing import Any, Callable, Dict, List, Optional, Type, cast
 
 import pytest
 
@@ -13,8 +14,9 @@ from shiny import *
 from shiny import _utils
 from shiny._namespaces import Root
 from shiny.reactive import *
+from shiny.reactive._core import ReactiveDomain, ReactiveWarning
 
-from .mocktime import MockTime
+from .mocktime import MockTime, yield_event_loop
 
 
 class OnEndedSessionCallbacks:
@@ -29,7 +31,9 @@ class OnEndedSessionCallbacks:
     ns = Root
 
     def __init__(self):
+        self.id = _utils.rand_hex(8)
         self._on_ended_callbacks = _utils.Callbacks()
+        self._reactive_domain = ReactiveDomain()
         # Unfortunately we have to lie here and say we're a session. Obvously, any
         # attempt to call anything but session.on_ended() will fail.
         self._session_context = session.session_context(cast(Session, self))
@@ -37,7 +41,10 @@ class OnEndedSessionCallbacks:
     def on_ended(self, fn: Callable[[], None]) -> Callable[[], None]:
         return self._on_ended_callbacks.register(fn)
 
-    def _send_message_sync(self, message: Dict[str, object]) -> None:
+    def _increment_busy_count(self) -> None:
+        pass
+
+    def _decrement_busy_count(self) -> None:
         pass
 
     async def __aenter__(self):
@@ -264,3 +271,375 @@ async def test_file_reader_error():
 
                 with pytest.raises(FileNotFoundError):
                     read_file()
+
+
+@pytest.mark.asyncio
+async def test_file_reader_dir_and_glob():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.mkdir(os.path.join(tmpdir, "sub"))
+        with open(os.path.join(tmpdir, "a.csv"), "w") as f:
+            f.write("a")
+
+        async with OnEndedSessionCallbacks():
+            reads: Dict[str, int] = {"dir": 0, "glob": 0}
+            mock_time = MockTime()
+            with mock_time():
+
+                @file_reader(tmpdir)
+                def read_dir():
+                    reads["dir"] += 1
+
+                @file_reader(os.path.join(tmpdir, "*.csv"))
+                def read_glob():
+                    reads["glob"] += 1
+
+                with isolate():
+                    await flush()
+                    read_dir()
+                    read_glob()
+                    assert reads == {"dir": 1, "glob": 1}
+
+                    # A new file in a subdirectory, not matching the glob
+                    with open(os.path.join(tmpdir, "sub", "b.txt"), "w") as f:
+                        f.write("b")
+                    await mock_time.advance_time(1.01)
+                    read_dir()
+                    read_glob()
+                    assert reads == {"dir": 2, "glob": 1}
+
+                    # Removing a file that matches the glob
+                    os.unlink(os.path.join(tmpdir, "a.csv"))
+                    await mock_time.advance_time(1.01)
+                    read_dir()
+                    read_glob()
+                    assert reads == {"dir": 3, "glob": 2}
+
+
+@pytest.mark.asyncio
+async def test_file_reader_watch():
+    pytest.importorskip("watchfiles")
+    from shiny.reactive._poll import _file_watchers
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.txt")
+        with open(path, "w") as f:
+            f.write("hello")
+
+        async with OnEndedSessionCallbacks():
+
+            @file_reader(path, watch=True)
+            def read_file():
+                with open(path) as f:
+                    return f.read()
+
+            vals: List[str] = []
+
+            @Effect()
+            def _():
+                vals.append(read_file())
+
+            await flush()
+            assert vals == ["hello"]
+            assert path in _file_watchers
+
+            with open(path, "w") as f:
+                f.write("goodbye")
+            for _i in range(100):
+                await asyncio.sleep(0.05)
+                await flush()
+                if len(vals) > 1:
+                    break
+            assert vals == ["hello", "goodbye"]
+
+
+@pytest.mark.asyncio
+async def test_file_reader_watch_fallback(monkeypatch: pytest.MonkeyPatch):
+    # Without watchfiles, the readers of a path still share one watcher, which checks
+    # the file every interval.
+    from shiny.reactive import _poll
+
+    monkeypatch.setattr(_poll, "_watchfiles", lambda: None)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "data.txt")
+        with open(path, "w") as f:
+            f.write("hello")
+
+        async with OnEndedSessionCallbacks():
+            mock_time = MockTime()
+            with mock_time():
+                readers: List[Callable[[], str]] = []
+                for _i in range(2):
+
+                    @file_reader(path, interval_secs=1, watch=True)
+                    def read_file():
+                        with open(path) as f:
+                            return f.read()
+
+                    readers.append(read_file)
+
+                assert len(_poll._file_watchers) == 1
+                vals: List[str] = []
+
+                @Effect()
+                def _():
+                    vals.extend(reader() for reader in readers)
+
+                with pytest.warns(ReactiveWarning, match="watchfiles"):
+                    await flush()
+                    await yield_event_loop()
+                assert vals == ["hello", "hello"]
+
+                with open(path, "w") as f:
+                    f.write("goodbye")
+                await mock_time.advance_time(1.01)
+                await flush()
+                assert vals[2:] == ["goodbye", "goodbye"]
+
+
+@pytest.mark.asyncio
+async def test_debounce():
+    async with OnEndedSessionCallbacks():
+        mock_time = MockTime()
+        with mock_time():
+            x = Value(0)
+            debounced = debounce(1)(x)
+            seen: List[int] = []
+
+            @Effect()
+            def _():
+                seen.append(debounced())
+
+            await flush()
+            assert seen == [0]
+
+            # Rapid changes only update the debounced value once they stop
+            for i in range(1, 6):
+                x.set(i)
+                await flush()
+                await mock_time.advance_time(0.5)
+            assert seen == [0]
+
+            await mock_time.advance_time(0.6)
+            assert seen == [0, 5]
+
+            await mock_time.advance_time(5)
+            assert seen == [0, 5]
+
+
+@pytest.mark.asyncio
+async def test_debounce_calc_runs_once_per_pause():
+    # A debounced Calc isn't run on every change, only once the changes stop.
+    async with OnEndedSessionCallbacks():
+        mock_time = MockTime()
+        with mock_time():
+            x = Value(0)
+            runs: List[int] = []
+
+            @debounce(1)
+            @Calc()
+            def expensive() -> int:
+                runs.append(x())
+                return x() * 10
+
+            seen: List[int] = []
+
+            @Effect()
+            def _():
+                seen.append(expensive())
+
+            await flush()
+            assert runs == [0]
+
+            for i in range(1, 6):
+                x.set(i)
+                await flush()
+                await mock_time.advance_time(0.5)
+            assert runs == [0]
+
+            await mock_time.advance_time(0.6)
+            assert runs == [0, 5]
+            assert seen == [0, 50]
+
+            # And again, after another pause
+            for i in range(6, 8):
+                x.set(i)
+                await flush()
+                await mock_time.advance_time(0.5)
+            await mock_time.advance_time(0.6)
+            assert runs == [0, 5, 7]
+            assert seen == [0, 50, 70]
+
+
+@pytest.mark.asyncio
+async def test_throttle():
+    async with OnEndedSessionCallbacks():
+        mock_time = MockTime()
+        with mock_time():
+            x = Value(0)
+
+            @throttle(1)
+            @Calc()
+            def throttled() -> int:
+                return x()
+
+            seen: List[int] = []
+
+            @Effect()
+            def _():
+                seen.append(throttled())
+
+            await flush()
+            assert seen == [0]
+
+            # While changes continue, the throttled value updates at most once a second
+            # (at t=1 and t=2, before x is set at those times), and the last change
+            # is delivered when the final blackout period ends.
+            for i in range(1, 9):
+                await mock_time.advance_time(0.25)
+                x.set(i)
+                await flush()
+            await mock_time.advance_time(2)
+            assert seen == [0, 3, 7, 8]
+
+
+@pytest.mark.asyncio
+async def test_poll_shared():
+    from shiny._connection import MockConnection
+    from shiny.reactive._poll import _shared_pollers
+
+    mock_time = MockTime()
+    with mock_time():
+        app = App(ui.TagList(), None)
+        sessions = [app._create_session(MockConnection()) for _ in range(3)]
+        poll_invocations = 0
+        source = 0
+
+        def poll_func() -> int:
+            nonlocal poll_invocations
+            poll_invocations += 1
+            return source
+
+        seen: Dict[str, List[int]] = {}
+        for sess in sessions:
+            with session.session_context(sess):
+
+                @poll(poll_func, 1, share_key="source")
+                def data() -> int:
+                    return source * 10
+
+                seen[sess.id] = []
+
+                @Effect()
+                def _(data: Callable[[], int] = data, sess_id: str = sess.id):
+                    seen[sess_id].append(data())
+
+        # poll_func is called once to seed the shared value, not once per session
+        assert poll_invocations == 1
+        await flush()
+        assert poll_invocations == 2
+        assert all(vals == [0] for vals in seen.values())
+
+        source = 1
+        await mock_time.advance_time(1)
+        await flush()
+        assert poll_invocations == 3
+        assert all(vals == [0, 10] for vals in seen.values())
+
+        # The poller keeps going until the last session that uses it ends
+        sessions[0]._run_session_end_tasks()
+        sessions[1]._run_session_end_tasks()
+        await mock_time.advance_time(1)
+        assert poll_invocations == 4
+        assert "source" in _shared_pollers
+
+        sessions[2]._run_session_end_tasks()
+        assert "source" not in _shared_pollers
+        await mock_time.advance_time(5)
+        assert poll_invocations == 4
+
+
+@pytest.mark.asyncio
+async def test_poll_executor_timeout():
+    import threading
+
+    release = threading.Event()
+    calls = 0
+
+    def slow_poll_func() -> int:
+        nonlocal calls
+        calls += 1
+        release.wait(5)
+        return calls
+
+    async with OnEndedSessionCallbacks():
+
+        @poll(slow_poll_func, 0.01, executor="thread", timeout_secs=0.01)
+        def data() -> int:
+            return calls
+
+        vals: List[int] = []
+
+        @Effect()
+        def _():
+            vals.append(data())
+
+        # The first poll times out (without blocking the loop), and there's no value
+        # yet; later polls wait for the same call instead of starting new ones.
+        await flush()
+        await asyncio.sleep(0.1)
+        await flush()
+        assert calls == 1
+        assert vals == []
+
+        release.set()
+        for _i in range(100):
+            await asyncio.sleep(0.01)
+            await flush()
+            if vals:
+                break
+        assert vals == [1]
+
+    with pytest.raises(ValueError):
+        poll(slow_poll_func, timeout_secs=1)
+
+
+@pytest.mark.asyncio
+async def test_poll_async_timeout():
+    release = asyncio.Event()
+    calls = 0
+
+    async def slow_poll_func() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    async with OnEndedSessionCallbacks():
+
+        @poll(slow_poll_func, 0.01, timeout_secs=0.01)
+        def data() -> int:
+            return calls
+
+        vals: List[int] = []
+
+        @Effect()
+        def _():
+            vals.append(data())
+
+        # As with an executor, the call that timed out isn't cancelled; later polls
+        # wait for it instead of starting new ones.
+        await flush()
+        await asyncio.sleep(0.1)
+        await flush()
+        assert calls == 1
+        assert vals == []
+
+        release.set()
+        for _i in range(100):
+            await asyncio.sleep(0.01)
+            await flush()
+            if vals:
+                break
+        assert vals == [1]
+        assert calls == 1
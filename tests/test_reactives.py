@@ -1,7 +1,10 @@
 """Tests for `shiny.reactive`."""
 
 import asyncio
-from typing import List
+import sys
+import time
+import warnings
+from typing import List, Optional
 
 import pytest
 
@@ -10,9 +13,15 @@ from shiny._connection import MockConnection
 from shiny._validation import SilentException, req
 from shiny.input_handler import ActionButtonValue
 from shiny.reactive import *
-from shiny.reactive._core import ReactiveWarning
+from shiny.reactive import Calc_, Effect_
+from shiny.reactive._core import (
+    ReactiveWarning,
+    _reactive_environment,
+    get_current_context,
+)
+from shiny.reactive._timers import get_timer_scheduler
 
-from .mocktime import MockTime
+from .mocktime import MockTime, yield_event_loop
 
 
 @pytest.mark.asyncio
@@ -92,6 +101,89 @@ async def test_reactive_value_same_no_invalidate():
     assert o._exec_count == 1
 
 
+@pytest.mark.asyncio
+async def test_reactive_value_equal_no_invalidate():
+    v = Value[object]([1, (2, float("nan")), {"a": [3]}])
+
+    @Effect()
+    def o():
+        v()
+
+    await flush()
+    assert o._exec_count == 1
+
+    # Equal (but not identical) values don't invalidate
+    assert v.set([1, (2, float("nan")), {"a": [3]}]) is False
+    await flush()
+    assert o._exec_count == 1
+
+    # Values of a different type do
+    assert v.set((1, (2, float("nan")), {"a": [3]})) is True
+    await flush()
+    assert o._exec_count == 2
+
+    assert v.set(1) is True
+    assert v.set(1.0) is True
+    assert v.set(True) is True
+
+
+@pytest.mark.asyncio
+async def test_reactive_value_custom_equals_and_hash():
+    # Compare by identity only
+    v = Value([1], equals=lambda x, y: x is y)
+
+    @Effect()
+    def o():
+        v()
+
+    await flush()
+    assert v.set([1]) is True
+    await flush()
+    assert o._exec_count == 2
+
+    hashed: List[object] = []
+
+    def key(x: List[int]) -> int:
+        hashed.append(x)
+        return sum(x)
+
+    v2 = Value([1, 2], hash=key)
+    assert v2.set([3]) is False
+    assert v2.set([4]) is True
+    # Each value is hashed once
+    assert len(hashed) == 3
+    v2.unset()
+    assert v2.set([4]) is True
+
+    with pytest.raises(ValueError):
+        Value(1, equals=lambda x, y: x == y, hash=lambda x: x)
+
+
+@pytest.mark.asyncio
+async def test_select():
+    settings = Value({"theme": "dark", "zoom": 1})
+    theme = select(settings, lambda s: str(s["theme"]))
+    runs: List[str] = []
+
+    @Effect()
+    def o():
+        runs.append(theme())
+
+    await flush()
+    assert runs == ["dark"]
+
+    settings.set({"theme": "dark", "zoom": 2})
+    await flush()
+    assert runs == ["dark"]
+
+    settings.set({"theme": "light", "zoom": 2})
+    await flush()
+    assert runs == ["dark", "light"]
+
+    with pytest.raises(RuntimeError):
+        theme.set("dark")
+
+
 # ======================================================================
 # Intializing reactive.Value to MISSING, and unsetting
 # ======================================================================
@@ -534,6 +626,53 @@ async def test_effect_destroy():
     assert results == []
 
 
+@pytest.mark.asyncio
+async def test_effect_destroy_removes_pending_flush():
+    domain = _reactive_environment.app_domain
+    v = Value(1)
+
+    @Effect()
+    def o():
+        v()
+
+    await flush()
+    assert domain.pending_flush_count() == 0
+
+    v.set(2)
+    assert domain.pending_flush_count() == 1
+    # The pending re-execution is dropped from the queue as soon as it's destroyed.
+    o.destroy()
+    assert domain.pending_flush_count() == 0
+    await flush()
+    assert o._exec_count == 1
+
+
+@pytest.mark.asyncio
+async def test_effect_set_priority_while_pending():
+    v = Value(1)
+    results: list[int] = []
+
+    @Effect(priority=1)
+    def o1():
+        v()
+        results.append(1)
+
+    @Effect(priority=1)
+    def o2():
+        v()
+        results.append(2)
+
+    await flush()
+    assert results == [1, 2]
+
+    # Changing the priority of an already-scheduled effect takes effect immediately.
+    results.clear()
+    v.set(2)
+    o2.set_priority(2)
+    await flush()
+    assert results == [2, 1]
+
+
 # ======================================================================
 # Error handling
 # ======================================================================
@@ -774,6 +913,73 @@ async def test_invalidate_later_invalidation():
         assert obs1._exec_count == 2
 
 
+@pytest.mark.asyncio
+async def test_invalidate_later_coalesced():
+    mock_time = MockTime()
+    domain = _reactive_environment.app_domain
+    flushes = 0
+
+    async def on_flushed():
+        nonlocal flushes
+        flushes += 1
+
+    with mock_time():
+        # Timers are kept by a single scheduler (not a task apiece), and ones that are
+        # due in the same tick (1/100 of a second) are fired by a single flush.
+        effects: List[Effect_] = []
+        for delay in (1.001, 1.001, 1.009, 2):
+
+            @Effect()
+            def _(delay: float = delay):
+                invalidate_later(delay)
+
+            effects.append(_)
+
+        await flush()
+        scheduler = get_timer_scheduler()
+        assert scheduler.active_count() == 4
+
+        task = scheduler._task
+
+        unsub = domain.on_flushed(on_flushed)
+        await mock_time.advance_time(1.01)
+        assert [e._exec_count for e in effects] == [2, 2, 2, 1]
+        assert flushes == 1
+        assert scheduler.active_count() == 4
+        # The effects that re-ran while the timers were firing scheduled new timers
+        # without replacing the scheduler's task
+        assert scheduler._task is task
+
+        for e in effects:
+            e.destroy()
+        assert scheduler.active_count() == 0
+        unsub()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_later_async_effect():
+    mock_time = MockTime()
+    with mock_time():
+        runs: List[int] = []
+
+        @Effect()
+        async def obs():
+            invalidate_later(1)
+            # Resuming after an await must happen in the same context that the effect
+            # started in, even when it was re-run by the timer scheduler.
+            await yield_event_loop()
+            runs.append(len(runs))
+
+        await flush()
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", ReactiveWarning)
+            await mock_time.advance_time(1)
+            for _ in range(5):
+                await yield_event_loop()
+        assert runs == [0, 1]
+        obs.destroy()
+
+
 @pytest.mark.asyncio
 async def test_mock_time():
 
@@ -1403,3 +1609,559 @@ async def test_observer_async_suspended_resumed_observers_run_at_most_once():
     a.set(4)
     await flush()
     assert obs._exec_count == 2
+
+
+# ======================================================================
+# batch()
+# ======================================================================
+@pytest.mark.asyncio
+async def test_dependents_cleanup():
+    # When a context is invalidated, it's removed from everything it depends on, not
+    # just the value that caused the invalidation.
+    a = Value(1)
+    b = Value(2)
+
+    @Calc()
+    def total() -> int:
+        return a() + b()
+
+    @Effect()
+    def _():
+        total()
+
+    await flush()
+    assert len(a._value_dependents._dependents) == 1
+    assert len(b._value_dependents._dependents) == 1
+    assert len(total._dependents._dependents) == 1
+
+    a.set(10)
+    assert len(a._value_dependents._dependents) == 0
+    assert len(b._value_dependents._dependents) == 0
+    assert len(total._dependents._dependents) == 0
+
+    await flush()
+    assert len(b._value_dependents._dependents) == 1
+    assert total._value == 12
+
+
+@pytest.mark.asyncio
+async def test_deep_invalidation():
+    # Invalidation of a long chain of Calcs doesn't recurse, so it doesn't hit the
+    # recursion limit.
+    depth = sys.getrecursionlimit() * 2
+    x = Value(0)
+
+    @Calc()
+    def first() -> int:
+        return x() + 1
+
+    chain: List[Calc_[int]] = [first]
+    for _i in range(depth - 1):
+        prev = chain[-1]
+
+        @Calc()
+        def next_calc(prev: Calc_[int] = prev) -> int:
+            return prev() + 1
+
+        chain.append(next_calc)
+
+    # Calculate the chain from the start, so that each Calc only has to read an
+    # already-calculated one.
+    with isolate():
+        for calc in chain:
+            calc()
+
+    vals: List[int] = []
+
+    @Effect()
+    def _():
+        vals.append(chain[-1]())
+
+    await flush()
+    assert vals == [depth]
+
+    x.set(1)
+    assert all(calc._invalidated for calc in chain)
+    with isolate():
+        for calc in chain[:-1]:
+            calc()
+    await flush()
+    assert vals == [depth, depth + 1]
+
+
+@pytest.mark.asyncio
+async def test_batch():
+    x = Value(1)
+    y = Value(1)
+    invalidations: List[int] = []
+
+    @Calc()
+    def total() -> int:
+        return x() + y()
+
+    @Effect()
+    def o():
+        total()
+        get_current_context().on_invalidate(lambda: invalidations.append(1))
+
+    await flush()
+    assert o._exec_count == 1
+
+    with batch():
+        x.set(2)
+        with batch():
+            y.set(2)
+        # Nothing is invalidated until the outermost batch ends, so the Calc still has
+        # its old value.
+        assert invalidations == []
+        with isolate():
+            assert total() == 2
+    assert invalidations == [1]
+
+    await flush()
+    assert o._exec_count == 2
+    with isolate():
+        assert total() == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_is_per_task():
+    # A batch that awaits (e.g. in one session) doesn't defer invalidations made by
+    # other tasks (e.g. other sessions) in the meantime.
+    x = Value(1)
+    y = Value(1)
+    invalidated: List[str] = []
+    release = asyncio.Event()
+
+    @Effect()
+    def _():
+        x()
+        get_current_context().on_invalidate(lambda: invalidated.append("x"))
+
+    @Effect()
+    def _():
+        y()
+        get_current_context().on_invalidate(lambda: invalidated.append("y"))
+
+    await flush()
+
+    async def batched():
+        with batch():
+            x.set(2)
+            await release.wait()
+
+    task = asyncio.ensure_future(batched())
+    await asyncio.sleep(0)
+    y.set(2)
+    assert invalidated == ["y"]
+    release.set()
+    await task
+    assert invalidated == ["y", "x"]
+
+
+# ======================================================================
+# Incremental calculations
+# ======================================================================
+@pytest.mark.asyncio
+async def test_reduce():
+    sample = Value(1)
+    scale = Value(1)
+    calls: List[int] = []
+
+    def empty() -> List[int]:
+        return []
+
+    @reduce(sample, init=empty)
+    def history(prev: List[int], x: int) -> List[int]:
+        calls.append(x)
+        prev.append(x * scale())
+        return prev
+
+    results: List[List[int]] = []
+
+    @Effect()
+    def _():
+        results.append(list(history()))
+
+    await flush()
+    assert results == [[1]]
+
+    # Each new sample is folded into the previous value, without redoing the old ones
+    sample.set(2)
+    await flush()
+    sample.set(3)
+    await flush()
+    assert results[-1] == [1, 2, 3]
+    assert calls == [1, 2, 3]
+
+    # A change to another dependency resets the value, starting over from the current
+    # sample
+    scale.set(10)
+    await flush()
+    assert results[-1] == [30]
+    sample.set(4)
+    await flush()
+    assert results[-1] == [30, 40]
+    assert calls == [1, 2, 3, 3, 4]
+
+    # The function still depends on the other dependency after a reset
+    scale.set(2)
+    await flush()
+    assert results[-1] == [8]
+
+    # When both change at once, the value is reset and then the new sample added
+    with batch():
+        scale.set(100)
+        sample.set(5)
+    await flush()
+    assert results[-1] == [500]
+
+    # Errors in the reducer are raised to readers; the previous value is kept
+    @reduce(sample, init=lambda: 0)
+    def total(prev: int, x: int) -> int:
+        if x < 0:
+            raise ValueError("negative")
+        return prev + x
+
+    with isolate():
+        assert total() == 5
+        sample.set(-1)
+        with pytest.raises(ValueError):
+            total()
+        sample.set(6)
+        assert total() == 11
+
+
+# ======================================================================
+# Reactive collections
+# ======================================================================
+@pytest.mark.asyncio
+async def test_reactive_dict():
+    from shiny import reactive
+
+    d = reactive.Dict({"a": 1, "b": 2})
+    runs = {"a": 0, "b": 0, "keys": 0, "all": 0}
+
+    @Effect()
+    def _():
+        runs["a"] += 1
+        d["a"]
+
+    @Effect()
+    def _():
+        runs["b"] += 1
+        d.get("b")
+
+    @Effect()
+    def _():
+        runs["keys"] += 1
+        len(d)
+
+    @Effect()
+    def _():
+        runs["all"] += 1
+        dict(d.items())
+
+    await flush()
+    assert runs == {"a": 1, "b": 1, "keys": 1, "all": 1}
+
+    # Only readers of the key that changed are invalidated
+    d["a"] = 10
+    await flush()
+    assert runs == {"a": 2, "b": 1, "keys": 1, "all": 2}
+
+    # Setting an equal value does nothing
+    d["a"] = 10
+    await flush()
+    assert runs == {"a": 2, "b": 1, "keys": 1, "all": 2}
+
+    # Adding a key invalidates readers of the keys, and of that key if it was read
+    d.update({"b": 2, "c": 3})
+    await flush()
+    assert runs == {"a": 2, "b": 1, "keys": 2, "all": 3}
+
+    del d["b"]
+    await flush()
+    assert runs == {"a": 2, "b": 2, "keys": 3, "all": 4}
+    with isolate():
+        assert d.get("b") is None
+
+    # set() only invalidates what it changes
+    d.set({"a": 10, "c": 4})
+    await flush()
+    assert runs == {"a": 2, "b": 2, "keys": 3, "all": 5}
+    with isolate():
+        assert dict(d) == {"a": 10, "c": 4}
+
+
+@pytest.mark.asyncio
+async def test_reactive_dict_missing_keys():
+    from shiny import reactive
+
+    d: reactive.Dict[str, int] = reactive.Dict()
+    n = Value(0)
+    seen: List[Optional[int]] = []
+
+    @Effect()
+    def _():
+        seen.append(d.get(f"k{n()}"))
+
+    await flush()
+    # Probing a different missing key each time doesn't leave entries behind
+    for i in range(1, 100):
+        n.set(i)
+        await flush()
+    assert len(d._item_dependents) == 1
+
+    # But adding the key that's being read invalidates the reader
+    d["k99"] = 1
+    await flush()
+    assert seen[-1] == 1
+
+
+@pytest.mark.asyncio
+async def test_reactive_list():
+    from shiny import reactive
+
+    lst = reactive.List([1, 2, 3])
+    runs = {"first": 0, "last": 0, "len": 0, "past_end": 0}
+
+    @Effect()
+    def _():
+        runs["first"] += 1
+        lst[0]
+
+    @Effect()
+    def _():
+        runs["last"] += 1
+        lst[-1]
+
+    @Effect()
+    def _():
+        runs["len"] += 1
+        len(lst)
+
+    @Effect()
+    def _():
+        runs["past_end"] += 1
+        try:
+            lst[4]
+        except IndexError:
+            pass
+
+    await flush()
+    assert runs == {"first": 1, "last": 1, "len": 1, "past_end": 1}
+
+    lst[1] = 20
+    await flush()
+    assert runs == {"first": 1, "last": 1, "len": 1, "past_end": 1}
+
+    lst[0] = 10
+    await flush()
+    assert runs == {"first": 2, "last": 1, "len": 1, "past_end": 1}
+
+    # Appending changes the length (and so which item is last), but not index 0
+    lst.append(4)
+    await flush()
+    assert runs == {"first": 2, "last": 2, "len": 2, "past_end": 1}
+
+    lst.extend([5, 6])
+    await flush()
+    assert runs == {"first": 2, "last": 3, "len": 3, "past_end": 2}
+
+    # Inserting at the front moves every item
+    lst.insert(0, 0)
+    await flush()
+    assert runs == {"first": 3, "last": 4, "len": 4, "past_end": 3}
+
+    # set() only invalidates the indices that change
+    with isolate():
+        new = list(lst)
+    new[4] = 40
+    lst.set(new)
+    await flush()
+    assert runs == {"first": 3, "last": 4, "len": 4, "past_end": 4}
+    with isolate():
+        assert list(lst) == [0, 10, 20, 3, 40, 5, 6]
+
+
+# ======================================================================
+# Concurrent flush
+# ======================================================================
+@pytest.mark.asyncio
+async def test_concurrent_flush():
+    domain = _reactive_environment.app_domain
+    domain.concurrent = True
+    domain.max_concurrency = None
+    mock_time = MockTime()
+    finished: List[float] = []
+    started_low: List[float] = []
+
+    async def run_flush():
+        flushed = asyncio.ensure_future(flush())
+        while not flushed.done():
+            await mock_time.advance_time(0.25)
+        await flushed
+
+    try:
+        with mock_time():
+
+            @Calc()
+            async def query() -> int:
+                await asyncio.sleep(1)
+                return 1
+
+            for _i in range(3):
+
+                @Effect()
+                async def _():
+                    await query()
+                    await asyncio.sleep(1)
+                    finished.append(time.monotonic())
+
+            @Effect()
+            async def _():
+                raise ValueError("boom")
+
+            @Effect(priority=-1)
+            def _():
+                started_low.append(time.monotonic())
+
+            with pytest.warns(ReactiveWarning):
+                await run_flush()
+
+            # The effects ran concurrently (sharing a single run of the Calc), despite
+            # the error in one of them, and the lower-priority effect waited for them.
+            assert query._exec_count == 1
+            assert len(finished) == 3
+            assert max(finished) < 3
+            assert started_low[0] >= max(finished)
+
+            finished.clear()
+            domain.max_concurrency = 2
+            for _i in range(3):
+
+                @Effect()
+                async def _():
+                    await asyncio.sleep(1)
+                    finished.append(time.monotonic())
+
+            start = time.monotonic()
+            await run_flush()
+            # Only two ran at a time
+            assert finished[1] - start < 1.5
+            assert finished[2] - start >= 2
+    finally:
+        domain.concurrent = False
+        domain.max_concurrency = None
+
+
+@pytest.mark.asyncio
+async def test_async_calc_invalidated_before_reader_resumes():
+    # If the calculation finishes, and is then invalidated before its reader resumes,
+    # the reader still gets the value that was calculated (not a missing value).
+    x = Value(1)
+
+    @Calc()
+    async def doubled() -> int:
+        val = x()
+        if val == 1:
+            # Runs after the calculation finishes, but before the reader resumes
+            asyncio.get_running_loop().call_soon(x.set, 2)
+        return val * 10
+
+    seen: List[object] = []
+
+    @Effect()
+    async def _():
+        seen.append(await doubled())
+
+    await flush()
+    await flush()
+    assert seen == [10, 20]
+
+
+@pytest.mark.asyncio
+async def test_async_calc_shared_run():
+    x = Value(1)
+    started: List[int] = []
+    finished: List[int] = []
+    release = asyncio.Event()
+
+    @Calc()
+    async def query() -> int:
+        val = x()
+        started.append(val)
+        await release.wait()
+        finished.append(val)
+        return val * 10
+
+    async def read() -> int:
+        with isolate():
+            return await query()
+
+    # Many readers at once share a single run
+    readers = [asyncio.ensure_future(read()) for _ in range(20)]
+    await yield_event_loop()
+    release.set()
+    assert await asyncio.gather(*readers) == [10] * 20
+    assert started == [1]
+    assert query._exec_count == 1
+
+    # If it's invalidated while running, the run is cancelled, and the readers get the
+    # result of a new one
+    release.clear()
+    x.set(2)
+    readers = [asyncio.ensure_future(read()) for _ in range(5)]
+    await yield_event_loop()
+    x.set(3)
+    await yield_event_loop()
+    release.set()
+    assert await asyncio.gather(*readers) == [30] * 5
+    assert started == [1, 2, 3]
+    assert finished == [1, 3]
+
+    # A reader that is cancelled doesn't cancel the run for the others
+    release.clear()
+    x.set(4)
+    readers = [asyncio.ensure_future(read()) for _ in range(3)]
+    await yield_event_loop()
+    readers[0].cancel()
+    await yield_event_loop()
+    release.set()
+    assert await asyncio.gather(*readers[1:]) == [40, 40]
+    assert readers[0].cancelled()
+    assert finished == [1, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_time_sliced_flush():
+    domain = _reactive_environment.app_domain
+    events: List[str] = []
+
+    async def other_task():
+        events.append("other")
+
+    try:
+        for time_slice in (None, 0):
+            domain.time_slice = time_slice
+            events.clear()
+            for i in range(3):
+
+                @Effect()
+                def _(i: int = i):
+                    events.append(f"effect {i}")
+
+            # A task that's scheduled at the same time as the flush only gets to run
+            # during the flush if the flush yields.
+            flushed = asyncio.ensure_future(flush())
+            other = asyncio.ensure_future(other_task())
+            await flushed
+            await other
+            if time_slice is None:
+                assert events == ["effect 0", "effect 1", "effect 2", "other"]
+            else:
+                assert events.index("other") < events.index("effect 2")
+                assert sorted(events) == ["effect 0", "effect 1", "effect 2", "other"]
+    finally:
+        domain.time_slice = None
@@ -1,8 +1,17 @@
 """Tests for `shiny.Session`."""
 
+import asyncio
+import base64
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple, cast
+
 import pytest
+from starlette.responses import Response
 
 from shiny import *
+from shiny._connection import MockConnection
+from shiny.types import MISSING_TYPE, ImgData
 
 
 def test_require_active_session_error_messages():
@@ -12,3 +21,415 @@ def test_require_active_session_error_messages():
 
     with pytest.raises(RuntimeError, match=r"notification.remove\(\) must be called.*"):
         ui.notification_remove("abc")
+
+
+@pytest.mark.asyncio
+async def test_sessions_flush_independently():
+    # An effect that awaits in one session must not block input handling (and
+    # flushing) in other sessions, since each session has its own reactive domain.
+    blocker = asyncio.Event()
+    seen: List[int] = []
+
+    def server(input: Inputs, output: Outputs, session: Session):
+        @reactive.Effect
+        async def _():
+            if input.slow():
+                await blocker.wait()
+
+        @reactive.Effect
+        def _():
+            seen.append(input.x())
+
+    app = App(ui.TagList(), server)
+    conn_a = MockConnection()
+    conn_b = MockConnection()
+    sess_a = app._create_session(conn_a)
+    sess_b = app._create_session(conn_b)
+
+    async def mock_clients():
+        conn_a.cause_receive('{"method":"init","data":{"slow":true,"x":0}}')
+        conn_b.cause_receive('{"method":"init","data":{"slow":false,"x":1}}')
+        conn_b.cause_receive('{"method":"update","data":{"x":2}}')
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # Session A is still blocked in its first effect, but session B has handled
+        # both of its messages
+        assert seen == [1, 2]
+        blocker.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert seen == [1, 2, 0]
+        conn_a.cause_disconnect()
+        conn_b.cause_disconnect()
+
+    await asyncio.gather(mock_clients(), sess_a._run(), sess_b._run())
+
+
+@pytest.mark.asyncio
+async def test_app_level_value_flushes_sessions():
+    # Invalidations that cross from the app-level domain into a session's domain
+    # schedule a flush of that session.
+    shared = reactive.Value(0)
+    seen: List[int] = []
+
+    def server(input: Inputs, output: Outputs, session: Session):
+        @reactive.Effect
+        def _():
+            seen.append(shared())
+
+    conn = MockConnection()
+    sess = App(ui.TagList(), server)._create_session(conn)
+
+    async def mock_client():
+        conn.cause_receive('{"method":"init","data":{}}')
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert seen == [0]
+        shared.set(1)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert seen == [0, 1]
+        conn.cause_disconnect()
+
+    await asyncio.gather(mock_client(), sess._run())
+
+
+@pytest.mark.asyncio
+async def test_work_added_while_sending_is_flushed():
+    # Work that's added to a session's domain while the session is sending the
+    # results of a flush (and so still holds its lock) is flushed without waiting for
+    # another message from the client.
+    shared = reactive.Value(0)
+    seen: List[int] = []
+    sending = asyncio.Event()
+    release = asyncio.Event()
+
+    def server(input: Inputs, output: Outputs, session: Session):
+        @reactive.Effect
+        def _():
+            seen.append(shared())
+
+    class SlowConnection(MockConnection):
+        async def send(self, message: str) -> None:
+            if "values" in message and not release.is_set():
+                sending.set()
+                await release.wait()
+
+    conn = SlowConnection()
+    sess = App(ui.TagList(), server)._create_session(conn)
+
+    async def mock_client():
+        conn.cause_receive('{"method":"init","data":{}}')
+        await sending.wait()
+        assert seen == [0]
+        shared.set(1)
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert seen == [0, 1]
+        conn.cause_disconnect()
+
+    await asyncio.gather(mock_client(), sess._run())
+
+
+@pytest.mark.asyncio
+async def test_shared_calc():
+    # A SharedCalc is calculated once per invalidation for all sessions, even when
+    # they read it concurrently, and is released when the sessions end.
+    source = reactive.Value(1)
+    release = asyncio.Event()
+    runs: List[int] = []
+
+    @reactive.SharedCalc
+    async def shared() -> int:
+        runs.append(source())
+        await release.wait()
+        return source() * 10
+
+    seen: List[int] = []
+
+    def server(input: Inputs, output: Outputs, session: Session):
+        @reactive.Effect
+        async def _():
+            seen.append(await shared())
+
+    app = App(ui.TagList(), server)
+    conn_a = MockConnection()
+    conn_b = MockConnection()
+    sess_a = app._create_session(conn_a)
+    sess_b = app._create_session(conn_b)
+
+    async def mock_clients():
+        conn_a.cause_receive('{"method":"init","data":{}}')
+        conn_b.cause_receive('{"method":"init","data":{}}')
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # Both sessions are waiting on the same calculation
+        assert runs == [1]
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert seen == [10, 10]
+
+        source.set(2)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert runs == [1, 2]
+        assert seen == [10, 10, 20, 20]
+
+        conn_a.cause_disconnect()
+        conn_b.cause_disconnect()
+
+    await asyncio.gather(mock_clients(), sess_a._run(), sess_b._run())
+    assert isinstance(shared._value, MISSING_TYPE)
+
+
+@pytest.mark.asyncio
+async def test_shared_calc_released_after_run_when_readers_end():
+    # If the last session reading a SharedCalc ends while it is running, its result is
+    # released once the run finishes.
+    release = asyncio.Event()
+
+    @reactive.SharedCalc
+    async def shared() -> int:
+        await release.wait()
+        return 1
+
+    def server(input: Inputs, output: Outputs, session: Session):
+        @reactive.Effect
+        async def _():
+            await shared()
+
+    conn = MockConnection()
+    sess = App(ui.TagList(), server)._create_session(conn)
+
+    async def mock_client():
+        conn.cause_receive('{"method":"init","data":{}}')
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert shared._running
+        await sess.close()
+        release.set()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert not shared._running
+        assert isinstance(shared._value, MISSING_TYPE)
+        conn.cause_disconnect()
+
+    await asyncio.gather(mock_client(), sess._run())
+
+
+@pytest.mark.asyncio
+async def test_status_messages_coalesced():
+    # busy/idle is sent once per flush, and status messages share frames where the
+    # client handles them in the same order as it would if they were sent separately.
+    from shiny.session._session import _client_message_order
+
+    def server(input: Inputs, output: Outputs, session: Session):
+        @output
+        @render.text
+        def a():
+            return str(input.x())
+
+        @output
+        @render.text
+        async def b():
+            await asyncio.sleep(0)
+            return str(input.x())
+
+    conn = MockConnection()
+    sess = App(ui.TagList(), server)._create_session(conn)
+    sent: List[str] = []
+
+    async def mock_client():
+        conn.cause_receive(
+            '{"method":"init","data":{"x":0,'
+            '".clientdata_output_a_hidden":false,".clientdata_output_b_hidden":false}}'
+        )
+        for _ in range(10):
+            await asyncio.sleep(0)
+        conn.sent.clear()
+        conn.cause_receive('{"method":"update","data":{"x":1}}')
+        for _ in range(10):
+            await asyncio.sleep(0)
+        sent.extend(conn.sent)
+        conn.cause_disconnect()
+
+    await asyncio.gather(mock_client(), sess._run())
+
+    # Each frame's parts, in the order the client handles them
+    handled: List[object] = []
+    for frame in sent:
+        msg = json.loads(frame)
+        for k in sorted(msg, key=lambda k: _client_message_order[k]):
+            if k == "values":
+                handled.append(("values", msg[k]))
+            elif k == "recalculating":
+                handled.append((k, msg[k]["name"], msg[k]["status"]))
+            elif k == "progress":
+                handled.append((k, msg[k]["message"]["id"]))
+            elif k not in ("errors", "inputMessages"):
+                handled.append((k, msg[k]))
+    assert handled == [
+        ("progress", "a"),
+        ("busy", "busy"),
+        ("progress", "b"),
+        ("recalculating", "a", "recalculating"),
+        ("recalculating", "a", "recalculated"),
+        ("recalculating", "b", "recalculating"),
+        ("recalculating", "b", "recalculated"),
+        ("busy", "idle"),
+        ("values", {"a": "1", "b": "1"}),
+    ]
+    assert len(sent) < len(handled)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_output_values_not_resent():
+    def server(input: Inputs, output: Outputs, session: Session):
+        @output
+        @render.text
+        def a():
+            return str(input.x() // 2)
+
+        @output
+        @render.text
+        async def b():
+            return str(input.x() // 2)
+
+        @reactive.Effect
+        @reactive.event(input.rebind)
+        def _():
+            @output(id="a")
+            @render.text
+            def _():
+                return str(input.x() // 2)
+
+    conn = MockConnection()
+    sess = App(ui.TagList(), server)._create_session(conn)
+    values: List[Dict[str, Any]] = []
+    recalculating: List[Tuple[str, str]] = []
+
+    async def update(data: Dict[str, Any]) -> None:
+        conn.sent.clear()
+        conn.cause_receive(json.dumps({"method": "update", "data": data}))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        sent: List[Dict[str, Any]] = [json.loads(m) for m in conn.sent]
+        values.clear()
+        values.extend(m["values"] for m in sent if "values" in m)
+        recalculating.clear()
+        recalculating.extend(
+            (m["recalculating"]["name"], m["recalculating"]["status"])
+            for m in sent
+            if "recalculating" in m
+        )
+
+    async def mock_client():
+        conn.cause_receive(
+            '{"method":"init","data":{"x":0,"rebind":0,'
+            '".clientdata_output_a_hidden":false,".clientdata_output_b_hidden":false}}'
+        )
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # Unchanged values aren't sent; a synchronous output doesn't report that it's
+        # recalculating, but an async one has already done so by the time it's known.
+        await update({"x": 1})
+        assert values == [{}]
+        assert recalculating == [("b", "recalculating"), ("b", "recalculated")]
+
+        await update({"x": 2})
+        assert values == [{"a": "1", "b": "1"}]
+        for name in ("a", "b"):
+            assert [s for n, s in recalculating if n == name] == [
+                "recalculating",
+                "recalculated",
+            ]
+
+        # A re-bound output sends its value again
+        await update({"rebind": 1})
+        assert values == [{"a": "1"}]
+
+        # So does one that has been hidden (and is re-run once it's shown again)
+        await update({".clientdata_output_b_hidden": True})
+        await update({"x": 3})
+        await update({".clientdata_output_b_hidden": False})
+        assert values == [{"b": "1"}]
+
+        conn.cause_disconnect()
+
+    await asyncio.gather(mock_client(), sess._run())
+
+
+@pytest.mark.asyncio
+async def test_image_urls(tmp_path: Path):
+    from starlette.requests import Request
+
+    images = {"a.png": b"\x89PNG a", "b.png": b"\x89PNG b", "c.png": b"\x89PNG c"}
+    for name, data in images.items():
+        (tmp_path / name).write_bytes(data)
+
+    def server(input: Inputs, output: Outputs, session: Session):
+        @output
+        @render.image
+        def img() -> ImgData:
+            return {"src": str(tmp_path / input.file()), "width": "100px"}
+
+    async def run(image_urls: bool, files: List[str]) -> Tuple[Session, List[str]]:
+        conn = MockConnection()
+        sess = App(ui.TagList(), server, image_urls=image_urls)._create_session(conn)
+
+        async def mock_client():
+            conn.cause_receive(
+                json.dumps(
+                    {
+                        "method": "init",
+                        "data": {
+                            "file": files[0],
+                            ".clientdata_output_img_hidden": False,
+                        },
+                    }
+                )
+            )
+            for file in files[1:]:
+                for _ in range(10):
+                    await asyncio.sleep(0)
+                conn.cause_receive(
+                    json.dumps({"method": "update", "data": {"file": file}})
+                )
+            for _ in range(10):
+                await asyncio.sleep(0)
+            conn.cause_disconnect()
+
+        await asyncio.gather(mock_client(), sess._run())
+        srcs: List[str] = []
+        for message in conn.sent:
+            img = json.loads(message).get("values", {}).get("img")
+            if img is not None:
+                assert img["width"] == "100px"
+                srcs.append(img["src"])
+        return sess, srcs
+
+    async def get(sess: Session, src: str) -> Response:
+        path, query = src.split("?")
+        assert path == f"session/{sess.id}/image/img"
+        request = Request(
+            {"type": "http", "method": "GET", "query_string": query.encode()}
+        )
+        return cast(Response, await sess._handle_request(request, "image", "img"))
+
+    _, srcs = await run(False, ["a.png"])
+    data = base64.b64encode(images["a.png"]).decode()
+    assert srcs == ["data:image/png;base64," + data]
+
+    sess, srcs = await run(True, ["a.png", "b.png", "a.png", "c.png"])
+    # The URL changes with the image
+    assert len(set(srcs)) == 3 and srcs[0] == srcs[2]
+    res = await get(sess, srcs[3])
+    assert res.status_code == 200
+    assert res.body == images["c.png"]
+    assert res.media_type == "image/png"
+    # The previous image can still be fetched, but not older ones
+    assert (await get(sess, srcs[2])).body == images["a.png"]
+    assert (await get(sess, srcs[1])).status_code == 404
@@ -0,0 +1,123 @@
+"""Tests for `shiny.reactive.stream()`."""
+
+import asyncio
+from typing import AsyncIterator, List, Tuple
+
+import pytest
+
+from shiny import App, reactive, ui
+from shiny._connection import MockConnection
+from shiny.session import session_context
+
+from .mocktime import MockTime, yield_event_loop
+
+
+async def settle() -> None:
+    # Let the stream's tasks (and the flushes they start) run.
+    for _ in range(20):
+        await yield_event_loop()
+
+
+@pytest.mark.asyncio
+async def test_stream_windows_and_batches():
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    pulled = 0
+
+    async def source() -> AsyncIterator[int]:
+        nonlocal pulled
+        while True:
+            item = await queue.get()
+            if item < 0:
+                return
+            pulled += 1
+            yield item
+
+    app = App(ui.TagList(), None)
+    session = app._create_session(MockConnection())
+    batches: List[Tuple[int, ...]] = []
+    mock_time = MockTime()
+    with mock_time(), session_context(session):
+        s = reactive.stream(source(), window_secs=0.05, max_batch=4, max_buffer=4)
+
+        @reactive.Effect
+        def _():
+            batches.append(s())
+
+        await session._reactive_domain.flush()
+        assert batches == []
+
+        # Items that arrive within a window are published together
+        for i in range(3):
+            queue.put_nowait(i)
+        await settle()
+        assert batches == []
+        await mock_time.advance_time(0.05)
+        await settle()
+        assert batches == [(0, 1, 2)]
+
+        # A full batch is published right away; the rest wait for the window
+        for i in range(3, 9):
+            queue.put_nowait(i)
+        await settle()
+        assert batches[1:] == [(3, 4, 5, 6)]
+        await mock_time.advance_time(0.05)
+        await settle()
+        assert batches[1:] == [(3, 4, 5, 6), (7, 8)]
+
+        # While the session is busy, the buffer fills up, and then the source isn't
+        # read
+        async with session._reactive_domain.lock:
+            for i in range(9, 30):
+                queue.put_nowait(i)
+            await settle()
+            await mock_time.advance_time(0.2)
+            # A batch waiting to be published, a full buffer, and an item waiting for
+            # room
+            assert pulled == 9 + 4 + 4 + 1
+        for _i in range(10):
+            await mock_time.advance_time(0.05)
+            await settle()
+        assert pulled == 30
+        assert [x for b in batches for x in b] == list(range(30))
+        assert all(len(b) <= 4 for b in batches)
+
+        # When the session ends, the source is closed
+        session._run_session_end_tasks()
+        await settle()
+        queue.put_nowait(100)
+        await settle()
+        assert pulled == 30
+
+
+@pytest.mark.asyncio
+async def test_stream_keep_and_error():
+    async def source() -> AsyncIterator[int]:
+        for i in range(5):
+            yield i
+            await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    seen: List[Tuple[int, ...]] = []
+    errors: List[Exception] = []
+    mock_time = MockTime()
+    with mock_time():
+        s = reactive.stream(source(), window_secs=0, max_batch=2, keep=3, session=None)
+
+        @reactive.Effect
+        def _():
+            try:
+                seen.append(s())
+            except ValueError as e:
+                errors.append(e)
+
+        await reactive.flush()
+        for _i in range(10):
+            await mock_time.advance_time(0.01)
+            await settle()
+    # Each value is the three most recent items
+    assert seen[-1] == (2, 3, 4)
+    assert all(len(v) <= 3 for v in seen)
+    assert len(errors) == 1 and str(errors[0]) == "boom"
+
+    with pytest.raises(ValueError):
+        reactive.stream(source(), max_batch=0)
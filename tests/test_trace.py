@@ -0,0 +1,129 @@
+"""Tests for `shiny.reactive` tracing."""
+
+import asyncio
+import json
+
+import pytest
+
+from shiny.reactive import *
+
+
+@pytest.fixture
+def tracer():
+    t = enable_tracing()
+    try:
+        yield t
+    finally:
+        disable_tracing()
+
+
+@pytest.mark.asyncio
+async def test_trace_executions_and_invalidations(tracer: Tracer):
+    v = Value(1)
+
+    @Calc()
+    def c():
+        return v() * 2
+
+    @Effect()
+    def e():
+        c()
+
+    await flush()
+    execs = [ev for ev in tracer.events if ev["type"] == "exec"]
+    assert [ev["label"] for ev in execs] == ["c", "e"]
+    assert [ev["kind"] for ev in execs] == ["calc", "effect"]
+    assert all(ev["session"] is None for ev in execs)
+
+    tracer.clear()
+    v.set(2)
+    edges = [
+        (ev["source_label"], ev["target_label"])
+        for ev in tracer.events
+        if ev["type"] == "invalidate"
+    ]
+    assert edges == [("Value", "c"), ("c", "e")]
+
+    await flush()
+    flushes = [ev for ev in tracer.events if ev["type"] == "flush"]
+    assert len(flushes) == 1
+    # The flush was triggered by setting the value
+    assert [t["label"] for t in flushes[0]["triggers"]] == ["Value"]
+
+
+@pytest.mark.asyncio
+async def test_trace_await_time(tracer: Tracer):
+    @Effect()
+    async def e():
+        await asyncio.sleep(0.05)
+
+    await flush()
+    (ev,) = [ev for ev in tracer.events if ev["type"] == "exec"]
+    assert ev["dur"] >= 50_000
+    assert ev["await"] >= 45_000
+    assert ev["await"] <= ev["dur"]
+
+
+@pytest.mark.asyncio
+async def test_trace_slowest_and_export(tracer: Tracer):
+    v = Value(0)
+
+    @Effect()
+    async def slow():
+        v()
+        await asyncio.sleep(0.02)
+
+    @Effect()
+    def fast():
+        v()
+
+    await flush()
+    v.set(1)
+    await flush()
+
+    slowest = tracer.slowest(n=1)
+    assert list(slowest.keys()) == [None]
+    (top,) = slowest[None]
+    assert top.label == "slow"
+    assert top.count == 2
+
+    assert json.loads(tracer.to_json())["events"] == tracer.events
+
+    chrome = tracer.to_chrome_trace()
+    names = [ev["name"] for ev in chrome["traceEvents"] if ev["ph"] == "X"]
+    assert names.count("slow") == 2
+    assert "flush" in names
+    json.dumps(chrome)
+
+
+@pytest.mark.asyncio
+async def test_trace_ring_buffer_and_sampling():
+    tracer = enable_tracing(max_events=5)
+    try:
+        v = Value(0)
+
+        @Effect()
+        def e():
+            v()
+
+        for i in range(10):
+            v.set(i + 1)
+            await flush()
+        assert len(tracer.events) == 5
+    finally:
+        disable_tracing()
+
+    tracer = enable_tracing(sample_rate=0)
+    try:
+
+        @Effect()
+        def e2():
+            pass
+
+        await flush()
+        assert [ev for ev in tracer.events if ev["type"] == "exec"] == []
+    finally:
+        disable_tracing()
+
+    with pytest.raises(ValueError):
+        enable_tracing(sample_rate=2)